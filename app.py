@@ -3,19 +3,23 @@ import streamlit as st
 from src.auth_system.auth_core import init_app_state, validate_login
 from src.auth_system.auth_ui import login_view, menu
 
-from src.db_records import get_records_wellness_db, load_jugadoras_db
+from src.page_data import load_page_data, show_page_timings
+from src.db_records import get_squad_load_state_db
+from src.reports.baselines import get_wellness_baselines
 
 from src.util import clean_df, data_format
 from src.ui_app import (
     get_default_period,
-    filter_df_by_period,
-    calc_metric_block,
-    calc_alertas,
+    get_day_index,
+    get_period_snapshots,
     render_metric_cards,
-    generar_resumen_periodo,
+    render_resumen_periodo,
     show_interpretation,
     mostrar_resumen_tecnico,
-    get_pendientes_check
+    get_pendientes_check,
+    render_acwr_plantilla,
+    render_desviaciones_baseline,
+    render_adherencia
 )
 
 from src.i18n.i18n import t
@@ -38,21 +42,23 @@ st.header(t("Resumen de :red[Wellness] (1er Equipo)"), divider="red")
 # ============================================================
 # 📦 CARGA DE DATOS
 # ============================================================
-df = get_records_wellness_db()
+page_data = load_page_data(competiciones=False)
+show_page_timings(page_data)
+df = page_data.wellness
 
 if df.empty:
     st.warning(t("No hay registros de Wellness o RPE disponibles."))
     st.stop()
 
 df = data_format(df)
-jug_df = load_jugadoras_db()
+jug_df = page_data.jugadoras
 jug_df = jug_df[jug_df["plantel"] == "1FF"]
 
 # ============================================================
 # INTERFAZ PRINCIPAL
 # ============================================================
 
-default_period = get_default_period(df)
+default_period = get_default_period(df, get_day_index(df))
 
 # Diccionario clave interna → texto traducido
 OPCIONES_PERIODO = {
@@ -68,13 +74,15 @@ periodo_traducido = st.radio(
     index=list(OPCIONES_PERIODO.keys()).index(default_period))
 
 periodo = next(k for k, v in OPCIONES_PERIODO.items() if v == periodo_traducido)
-df_periodo, articulo = filter_df_by_period(df, periodo)
 
-# Cálculos principales
-wellness_prom, chart_wellness, delta_wellness = calc_metric_block(df_periodo, periodo, "wellness_score", "mean")
-rpe_prom, chart_rpe, delta_rpe = calc_metric_block(df_periodo, periodo, "rpe", "mean")
-ua_total, chart_ua, delta_ua = calc_metric_block(df_periodo, periodo, "ua", "sum")
-alertas_count, total_jugadoras, alertas_pct, chart_alertas, delta_alertas = calc_alertas(df_periodo, df, periodo)
+# Cálculos principales: los cuatro periodos se calculan una vez por versión de datos
+snapshot = get_period_snapshots(df)[periodo]
+df_periodo, articulo = snapshot.df, t(snapshot.texto)
+
+wellness_prom, chart_wellness, delta_wellness = snapshot.wellness
+rpe_prom, chart_rpe, delta_rpe = snapshot.rpe
+ua_total, chart_ua, delta_ua = snapshot.ua
+alertas_count, total_jugadoras, alertas_pct, chart_alertas, delta_alertas = snapshot.alertas
 
 # ============================================================
 # 💠 TARJETAS DE MÉTRICAS
@@ -97,7 +105,10 @@ st.markdown(t("**Registros del periodo seleccionado**") + f"(:blue-background[{p
 tabs = st.tabs([
         t(":material/physical_therapy: Indicadores de bienestar y carga"),
         t(":material/description: Registros detallados"),
-        t(":material/report_problem: Pendientes de registro")
+        t(":material/report_problem: Pendientes de registro"),
+        t(":material/trending_up: ACWR actual"),
+        t(":material/person_alert: Línea base individual"),
+        t(":material/fact_check: Adherencia al registro")
     ])
 
 if df_periodo.empty:
@@ -105,7 +116,7 @@ if df_periodo.empty:
     st.stop()
 
 with tabs[0]: 
-    generar_resumen_periodo(df_periodo)
+    render_resumen_periodo(snapshot.resumen)
 with tabs[1]: 
     st.dataframe(clean_df(df_periodo), hide_index=True)
 with tabs[2]:
@@ -125,4 +136,13 @@ with tabs[2]:
         if pendientes_out.empty:
             st.success(t(":material/check_circle: Todas las jugadoras han realizado el check-out."))
         else:
-            st.dataframe(pendientes_out, hide_index=True)
\ No newline at end of file
+            st.dataframe(pendientes_out, hide_index=True)
+
+with tabs[3]:
+    render_acwr_plantilla(get_squad_load_state_db(), jug_df)
+
+with tabs[4]:
+    render_desviaciones_baseline(get_wellness_baselines(), df_periodo, jug_df)
+
+with tabs[5]:
+    render_adherencia(df, jug_df)
@@ -0,0 +1,117 @@
+"""
+Benchmark de la etapa de filtros de métricas (RPEFilters) sobre un dataset sintético
+de varias temporadas.
+
+- máscara: filtrado con máscaras booleanas sobre el frame completo (como hacían los
+           llamadores antes de _apply_filters).
+- índice:  RPEIndex construido una vez y selección por MultiIndex ordenado
+           (id_jugadora, fecha_sesion) con slice_locs, O(log n + k).
+
+Mide el coste por consulta del filtro y de compute_rpe_metrics completo, y comprueba
+que ambos caminos devuelven las mismas filas.
+
+Uso:
+    python benchmarks/bench_filters.py --temporadas 4 --jugadoras 30 --consultas 500
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.schema import apply_wellness_schema  # noqa: E402
+from src.reports.metrics import RPEFilters, RPEIndex, compute_rpe_metrics  # noqa: E402
+
+TURNOS = ["Turno 1", "Turno 2"]
+
+def build_dataset(temporadas: int, jugadoras: int, seed: int) -> pd.DataFrame:
+    """Check-ins y check-outs diarios (dos turnos, ~80% de asistencia) durante N temporadas de 300 días."""
+    rng = np.random.default_rng(seed)
+    dias = pd.date_range("2021-07-01", periods=365 * temporadas, freq="D")
+    dias = dias[(dias.month >= 7) | (dias.month <= 4)]  # temporada de julio a abril
+    ids = [f"J{i:03d}" for i in range(jugadoras)]
+
+    idx = pd.MultiIndex.from_product([ids, dias, TURNOS, ["checkIn", "checkOut"]],
+                                     names=["id_jugadora", "fecha_sesion", "turno", "tipo"])
+    df = idx.to_frame(index=False)
+    df = df[rng.random(len(df)) < 0.8].reset_index(drop=True)
+
+    checkout = df["tipo"] == "checkOut"
+    df["rpe"] = np.where(checkout, rng.integers(1, 11, len(df)), np.nan)
+    df["minutos_sesion"] = np.where(checkout, rng.choice([45, 60, 75, 90], len(df)), np.nan)
+    df["ua"] = df["rpe"] * df["minutos_sesion"]
+    df["id"] = np.arange(1, len(df) + 1)
+    return apply_wellness_schema(df)
+
+def filter_mask(df: pd.DataFrame, flt: RPEFilters) -> pd.DataFrame:
+    mask = pd.Series(True, index=df.index)
+    if flt.jugadores:
+        mask &= df["id_jugadora"].isin(flt.jugadores)
+    if flt.turnos:
+        mask &= df["turno"].isin(flt.turnos)
+    if flt.start:
+        mask &= df["fecha_sesion"] >= pd.Timestamp(flt.start)
+    if flt.end:
+        mask &= df["fecha_sesion"] <= pd.Timestamp(flt.end)
+    return df[mask]
+
+def random_filters(df: pd.DataFrame, n: int, seed: int) -> list[RPEFilters]:
+    rng = random.Random(seed)
+    ids = sorted(df["id_jugadora"].astype(str).unique())
+    first, last = df["fecha_sesion"].min(), df["fecha_sesion"].max()
+    span = (last - first).days - 28
+    filtros = []
+    for _ in range(n):
+        end = first + pd.Timedelta(days=28 + rng.randrange(span))
+        filtros.append(RPEFilters(
+            jugadores=[rng.choice(ids)],
+            turnos=[rng.choice(TURNOS)] if rng.random() < 0.3 else None,
+            start=(end - pd.Timedelta(days=rng.choice([7, 28, 90]))).date(),
+            end=end.date(),
+        ))
+    return filtros
+
+def timed(fn, filtros) -> float:
+    start = time.perf_counter()
+    for flt in filtros:
+        fn(flt)
+    return 1e6 * (time.perf_counter() - start) / len(filtros)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--temporadas", type=int, default=4)
+    parser.add_argument("--jugadoras", type=int, default=30)
+    parser.add_argument("--consultas", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    df = build_dataset(args.temporadas, args.jugadoras, args.seed)
+    filtros = random_filters(df, args.consultas, args.seed)
+
+    start = time.perf_counter()
+    index = RPEIndex(df)
+    build_ms = 1000 * (time.perf_counter() - start)
+
+    # Mismas filas por los dos caminos
+    for flt in filtros[:50]:
+        a = filter_mask(df, flt).sort_values(["fecha_sesion", "turno", "tipo"])["id"].tolist()
+        b = index.select(flt).sort_values(["fecha_sesion", "turno", "tipo"])["id"].tolist()
+        assert a == b, "las selecciones no coinciden"
+
+    mask_us = timed(lambda flt: filter_mask(df, flt), filtros)
+    index_us = timed(index.select, filtros)
+    metrics_mask_us = timed(lambda flt: compute_rpe_metrics(filter_mask(df, flt), RPEFilters(end=flt.end)), filtros)
+    metrics_index_us = timed(lambda flt: compute_rpe_metrics(index, flt), filtros)
+
+    print(f"filas: {len(df):,}  jugadoras: {args.jugadoras}  temporadas: {args.temporadas}  consultas: {args.consultas}")
+    print(f"construcción del índice: {build_ms:8.1f} ms (una vez)")
+    print(f"filtro   máscara: {mask_us:10.1f} µs/consulta   índice: {index_us:10.1f} µs/consulta   x{mask_us / index_us:.1f}")
+    print(f"métricas máscara: {metrics_mask_us:10.1f} µs/consulta   índice: {metrics_index_us:10.1f} µs/consulta   x{metrics_mask_us / metrics_index_us:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark de guardados/segundo de upsert_wellness_record_db (antes vs después).
+
+Usa SQLite en memoria como sustituto de MySQL. Los dos escenarios tienen el mismo
+índice sobre (id_jugadora, fecha_sesion, turno, ambito), así que solo se compara el
+número de sentencias:
+- antes:   índice no único; SELECT id por la clave + UPDATE/INSERT (2 sentencias)
+- después: índice único; INSERT ... ON CONFLICT DO UPDATE (1 sentencia),
+           equivalente en SQLite a INSERT ... ON DUPLICATE KEY UPDATE.
+
+Como SQLite no tiene red, --latency-ms simula el tiempo de ida y vuelta (RTT)
+de cada sentencia contra el servidor MySQL.
+
+Uso:
+    python benchmarks/bench_upsert.py --saves 2000 --latency-ms 2
+"""
+import argparse
+import datetime
+import json
+import random
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE wellness (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_jugadora TEXT NOT NULL,
+    fecha_sesion TEXT NOT NULL,
+    tipo TEXT,
+    turno TEXT NOT NULL,
+    periodizacion_tactica TEXT,
+    id_tipo_estimulo INTEGER,
+    id_tipo_readaptacion INTEGER,
+    recuperacion INTEGER,
+    fatiga INTEGER,
+    sueno INTEGER,
+    stress INTEGER,
+    dolor INTEGER,
+    partes_cuerpo_dolor TEXT,
+    minutos_sesion INTEGER,
+    rpe INTEGER,
+    ua INTEGER,
+    en_periodo INTEGER,
+    observacion TEXT,
+    usuario TEXT,
+    fecha_hora_registro TEXT DEFAULT CURRENT_TIMESTAMP,
+    ambito TEXT GENERATED ALWAYS AS (CASE WHEN usuario IS 'developer' THEN 'developer' ELSE 'general' END) STORED
+);
+"""
+
+KEY_COLUMNS = "id_jugadora, fecha_sesion, turno, ambito"
+INDEX = f"CREATE INDEX ix_wellness_jugadora_fecha_turno_ambito ON wellness ({KEY_COLUMNS});"
+UNIQUE_KEY = f"CREATE UNIQUE INDEX uq_wellness_jugadora_fecha_turno_ambito ON wellness ({KEY_COLUMNS});"
+
+COLUMNS = [
+    "id_jugadora", "fecha_sesion", "tipo", "turno", "periodizacion_tactica",
+    "id_tipo_estimulo", "id_tipo_readaptacion", "recuperacion", "fatiga", "sueno",
+    "stress", "dolor", "partes_cuerpo_dolor", "minutos_sesion", "rpe", "ua",
+    "en_periodo", "observacion", "usuario",
+]
+INSERT_SQL = f"INSERT INTO wellness ({', '.join(COLUMNS)}) VALUES ({', '.join(':' + c for c in COLUMNS)})"
+UPDATE_FIELDS = [c for c in COLUMNS if c not in ("id_jugadora", "fecha_sesion", "turno")]
+
+def _record(rng: random.Random, n_jugadoras: int, n_dias: int) -> dict:
+    fecha = datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(n_dias))
+    minutos, rpe = rng.randint(30, 120), rng.randint(1, 10)
+    return {
+        "id_jugadora": f"J{rng.randrange(n_jugadoras):03d}",
+        "fecha_sesion": fecha.isoformat(),
+        "tipo": "checkin",
+        "turno": rng.choice(["Turno 1", "Turno 2"]),
+        "periodizacion_tactica": "MD+1 / MD-6",
+        "id_tipo_estimulo": 1,
+        "id_tipo_readaptacion": None,
+        "recuperacion": rng.randint(1, 5),
+        "fatiga": rng.randint(1, 5),
+        "sueno": rng.randint(1, 5),
+        "stress": rng.randint(1, 5),
+        "dolor": 1,
+        "partes_cuerpo_dolor": json.dumps([]),
+        "minutos_sesion": minutos,
+        "rpe": rpe,
+        "ua": minutos * rpe,
+        "en_periodo": 0,
+        "observacion": "",
+        "usuario": "bench",
+    }
+
+def _rtt(latency: float) -> None:
+    if latency:
+        time.sleep(latency)
+
+def save_before(conn: sqlite3.Connection, record: dict, latency: float) -> None:
+    """Flujo anterior: SELECT de existencia y luego UPDATE o INSERT."""
+    cur = conn.execute(
+        "SELECT id FROM wellness WHERE id_jugadora = :id_jugadora AND fecha_sesion = :fecha_sesion AND turno = :turno"
+        " AND ambito = CASE WHEN :usuario IS 'developer' THEN 'developer' ELSE 'general' END LIMIT 1",
+        record,
+    )
+    existing = cur.fetchone()
+    _rtt(latency)
+    if existing:
+        sets = ", ".join(f"{c} = :{c}" for c in UPDATE_FIELDS)
+        conn.execute(f"UPDATE wellness SET {sets}, fecha_hora_registro = CURRENT_TIMESTAMP WHERE id = :id", {**record, "id": existing[0]})
+    else:
+        conn.execute(INSERT_SQL, record)
+    _rtt(latency)
+    conn.commit()
+
+def save_after(conn: sqlite3.Connection, record: dict, latency: float) -> None:
+    """Flujo nuevo: una sola sentencia de upsert sobre la clave única."""
+    sets = ", ".join(f"{c} = excluded.{c}" for c in UPDATE_FIELDS)
+    conn.execute(
+        f"{INSERT_SQL} ON CONFLICT ({KEY_COLUMNS}) DO UPDATE SET {sets}, fecha_hora_registro = CURRENT_TIMESTAMP",
+        record,
+    )
+    _rtt(latency)
+    conn.commit()
+
+def run(save_fn, unique: bool, records: list[dict], latency: float) -> float:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(SCHEMA)
+    conn.execute(UNIQUE_KEY if unique else INDEX)
+    start = time.perf_counter()
+    for record in records:
+        save_fn(conn, record, latency)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return len(records) / elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--saves", type=int, default=2000, help="número de guardados por escenario")
+    parser.add_argument("--jugadoras", type=int, default=25)
+    parser.add_argument("--dias", type=int, default=60)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="RTT simulado por sentencia (ms)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = [_record(rng, args.jugadoras, args.dias) for _ in range(args.saves)]
+    latency = args.latency_ms / 1000.0
+
+    # Mismo índice en los dos escenarios (no único en el flujo anterior)
+    before = run(save_before, unique=False, records=records, latency=latency)
+    after = run(save_after, unique=True, records=records, latency=latency)
+
+    print(f"guardados: {args.saves}  jugadoras: {args.jugadoras}  días: {args.dias}  RTT: {args.latency_ms} ms")
+    print(f"antes   (SELECT + UPDATE/INSERT): {before:10.1f} guardados/s")
+    print(f"después (upsert 1 sentencia)    : {after:10.1f} guardados/s")
+    print(f"mejora: x{after / before:.2f}")
+
+if __name__ == "__main__":
+    main()
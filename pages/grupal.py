@@ -11,7 +11,7 @@ validate_login()
 
 from src.ui_components import selection_header
 from src.reports.ui_grupal import group_dashboard
-from src.db_records import get_records_wellness_db, load_jugadoras_db, load_competiciones_db
+from src.page_data import load_page_data, show_page_timings
 
 # Authentication gate
 if not st.session_state["auth"]["is_logged_in"]:
@@ -23,11 +23,14 @@ menu()
 st.header(t("Análisis :red[grupal]"), divider="red")
 
 # Load reference data
-jug_df = load_jugadoras_db()
-comp_df = load_competiciones_db()
-wellness_df = get_records_wellness_db()
+page_data = load_page_data(wellness=False)
+show_page_timings(page_data)
+jug_df, comp_df = page_data.jugadoras, page_data.competiciones
 
-#st.dataframe(wellness_df, hide_index=True)    
+@st.fragment
+def reporte_grupal(jug_df, comp_df):
+    """Filtros y panel grupal en un fragmento: un cambio de filtro no recarga la página entera."""
+    df, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, modo="reporte_grupal")
+    group_dashboard(df, end=end)
 
-df, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, wellness_df, modo="reporte_grupal")
-group_dashboard(df)
+reporte_grupal(jug_df, comp_df)
@@ -6,8 +6,9 @@ from src.auth_system.auth_core import init_app_state, validate_login
 from src.auth_system.auth_ui import login_view, menu
 from src.i18n.i18n import t
 from src.ui_components import selection_header
-from src.reports.ui_individual import metricas, graficos_individuales, calcular_semaforo_riesgo, player_block_dux
-from src.db_records import get_records_wellness_db, load_jugadoras_db, load_competiciones_db
+from src.reports.ui_individual import (metricas, graficos_individuales, calcular_semaforo_riesgo, player_block_dux,
+                                      calcular_metricas_individuales, show_memo_stats)
+from src.page_data import load_page_data, show_page_timings
 
 config.init_config()
 init_app_state()
@@ -23,26 +24,37 @@ menu()
 st.header(t("Análisis :red[individual]"), divider="red")
 
 # Load reference data
-jug_df = load_jugadoras_db()
-comp_df = load_competiciones_db()
-df = get_records_wellness_db()
+page_data = load_page_data(wellness=False)
+show_page_timings(page_data)
+jug_df, comp_df = page_data.jugadoras, page_data.competiciones
 
-df_filtrado, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, df, modo="reporte")
+@st.fragment
+def reporte_individual(jug_df, comp_df):
+    """
+    Filtros y reporte de la jugadora. Es un fragmento: cambiar un filtro solo vuelve a
+    ejecutar esta función con los datos de referencia ya cargados, no la página entera.
+    """
+    df_filtrado, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, modo="reporte")
 
-if not jugadora:
-    st.info(t("Selecciona una jugadora para continuar."))
-    st.stop()
+    if not jugadora:
+        st.info(t("Selecciona una jugadora para continuar."))
+        return
 
-    #st.subheader("RPE / Cargas")
-if df_filtrado is None or df_filtrado.empty:
-    st.info(t("No hay registros aún (se requieren Check-out con UA calculado)."))
-    st.stop()
+    if df_filtrado is None or df_filtrado.empty:
+        st.info(t("No hay registros aún (se requieren Check-out con UA calculado)."))
+        return
+
+    player_block_dux(jugadora)
+
+    # Métricas, ventanas de carga e historial: una vez por (jugadora, rango, turno, versión de datos)
+    calculo = calcular_metricas_individuales(df_filtrado, jugadora["id_jugadora"], start, end, turno)
+    metricas(df_filtrado, jugadora, turno, start, end, calculo.metrics)
 
-player_block_dux(jugadora)
-metricas(df_filtrado, jugadora, turno, start, end)
+    icon, desc, acwr, fatiga = calcular_semaforo_riesgo(df_filtrado, calculo.ventanas)
 
-icon, desc, acwr, fatiga = calcular_semaforo_riesgo(df_filtrado)
+    st.markdown(f"{t('**Riesgo actual:**')} {icon} {desc}")
+    #st.dataframe(df_filtrado)
+    graficos_individuales(df_filtrado, calculo.ventanas, calculo.historial)
+    show_memo_stats()
 
-st.markdown(f"{t('**Riesgo actual:**')} {icon} {desc}")
-#st.dataframe(df_filtrado)
-graficos_individuales(df_filtrado)
\ No newline at end of file
+reporte_individual(jug_df, comp_df)
@@ -1,5 +1,4 @@
 import streamlit as st
-import time
 import src.config as config
 
 config.init_config()
@@ -8,8 +7,10 @@ from src.auth_system.auth_core import init_app_state, validate_login
 from src.auth_system.auth_ui import login_view, menu
 from src.i18n.i18n import t
 from src.checkin_ui import checkin_form
-from src.db_records import load_jugadoras_db, load_competiciones_db, upsert_wellness_record_db, get_record_for_player_day_turno_db, get_records_wellness_db
+from src.db_records import upsert_wellness_record_db, upsert_wellness_records_db, get_record_for_player_day_turno_db
+from src.page_data import load_page_data, show_page_timings
 from src.check_out import checkout_form
+from src.batch_ui import batch_checkin_form, batch_checkout_form
 
 init_app_state()
 validate_login()
@@ -26,9 +27,49 @@ menu()
 st.header(t("Registro :red[:material/check_in_out:]"), divider="red")
 
 # Load reference data
-df = get_records_wellness_db()
-jug_df = load_jugadoras_db()
-comp_df = load_competiciones_db()
+page_data = load_page_data()
+show_page_timings(page_data)
+df, jug_df, comp_df = page_data.wellness, page_data.jugadoras, page_data.competiciones
+
+OPCIONES_MODO = {
+    "Individual": t("Individual"),
+    "Plantel completo": t("Plantel completo")
+}
+modo_traducido = st.radio(t("Modo de registro"), list(OPCIONES_MODO.values()), horizontal=True, index=0)
+modo_registro = next(k for k, v in OPCIONES_MODO.items() if v == modo_traducido)
+
+if st.session_state.get("flash"):
+    st.success(st.session_state["flash"])
+    st.session_state["flash"] = None
+
+# ============================================================
+# 📋 REGISTRO POR LOTE (todo el plantel en una tabla)
+# ============================================================
+if modo_registro == "Plantel completo":
+    jug_lote, tipo, turno = selection_header_registro(jug_df, comp_df, df, lote=True)
+    st.divider()
+
+    username = st.session_state['auth']['username']
+    if tipo == "Check-in":
+        records, errores, submitted = batch_checkin_form(jug_lote, df, turno, username)
+    else:
+        records, errores, submitted = batch_checkout_form(jug_lote, df, turno, username)
+
+    if submitted:
+        if errores:
+            st.error(t("Corrige los siguientes registros antes de guardar:") + "\n\n" + "\n".join(f"- {e}" for e in errores))
+        elif not records:
+            st.warning(t("No hay registros completados para guardar."))
+        else:
+            with st.spinner(t("Guardando registros...")):
+                modo = "checkin" if tipo == "Check-in" else "checkout"
+                success, mensaje = upsert_wellness_records_db(records, modo)
+            if success:
+                st.session_state["flash"] = mensaje
+                st.rerun()
+            else:
+                st.error(mensaje)
+    st.stop()
 
 jugadora, tipo, turno = selection_header_registro(jug_df, comp_df, df)
 
@@ -85,8 +126,7 @@ if submitted:
             # Upsert: si ya existe un registro para la misma jugadora y día, se actualiza.
             success = upsert_wellness_record_db(record, modo)
             if success:
-                st.success(t(":material/done_all: Registro guardado/actualizado correctamente."))
-                time.sleep(4)
+                st.session_state["flash"] = t(":material/done_all: Registro guardado/actualizado correctamente.")
                 st.rerun()
             else:
                 st.error(t(":material/warning: Error al guardar el registro."))
@@ -0,0 +1,95 @@
+-- ============================================================
+-- 001 · Clave única (id_jugadora, fecha_sesion, turno, ambito) en wellness
+-- ============================================================
+-- Permite que upsert_wellness_record_db guarde con una sola sentencia
+-- (INSERT ... ON DUPLICATE KEY UPDATE) y evita duplicados cuando dos
+-- dispositivos guardan a la vez el mismo registro.
+--
+-- 'ambito' separa los registros del rol developer (usuario = 'developer') del
+-- resto, igual que _scope_condition en src/db_records.py: un registro de prueba
+-- nunca colisiona con (ni sobrescribe) el registro real del mismo día y turno.
+--
+-- Ejecutar primero el paso 0 (solo lectura) y revisar el resultado antes de
+-- aplicar los pasos 1–4.
+
+-- 0) Simulación: grupos duplicados por clave y ámbito, y fila que se conservará
+--    (la que tiene el check-out; si hay varias o ninguna, la más reciente)
+SELECT
+    id_jugadora, fecha_sesion, turno, ambito,
+    COUNT(*) AS filas,
+    SUM(tipo = 'checkOut') AS checkouts,
+    GROUP_CONCAT(id ORDER BY id) AS ids,
+    MAX(CASE WHEN orden = 1 THEN id END) AS id_conservado
+FROM (
+    SELECT
+        id, id_jugadora, fecha_sesion, turno, tipo,
+        IF(usuario <=> 'developer', 'developer', 'general') AS ambito,
+        ROW_NUMBER() OVER (
+            PARTITION BY id_jugadora, fecha_sesion, turno, IF(usuario <=> 'developer', 'developer', 'general')
+            ORDER BY (tipo = 'checkOut') DESC, fecha_hora_registro DESC, id DESC
+        ) AS orden
+    FROM wellness
+) AS d
+GROUP BY id_jugadora, fecha_sesion, turno, ambito
+HAVING COUNT(*) > 1
+ORDER BY fecha_sesion, id_jugadora, turno;
+
+START TRANSACTION;
+
+-- 1) Filas a eliminar y la fila de su grupo que se conserva
+CREATE TEMPORARY TABLE wellness_duplicados AS
+SELECT id, id_conservado
+FROM (
+    SELECT
+        id,
+        FIRST_VALUE(id) OVER (
+            PARTITION BY id_jugadora, fecha_sesion, turno, IF(usuario <=> 'developer', 'developer', 'general')
+            ORDER BY (tipo = 'checkOut') DESC, fecha_hora_registro DESC, id DESC
+        ) AS id_conservado
+    FROM wellness
+) AS d
+WHERE id <> id_conservado;
+
+-- 2) Fusión: los campos del check-in que falten en la fila conservada se toman
+--    del duplicado más reciente que los tenga
+CREATE TEMPORARY TABLE wellness_fusion AS
+SELECT id_conservado, id AS id_origen
+FROM (
+    SELECT
+        d.id_conservado, w.id,
+        ROW_NUMBER() OVER (PARTITION BY d.id_conservado ORDER BY w.fecha_hora_registro DESC, w.id DESC) AS orden
+    FROM wellness_duplicados AS d
+    JOIN wellness AS w ON w.id = d.id
+    WHERE w.recuperacion IS NOT NULL
+) AS o
+WHERE orden = 1;
+
+UPDATE wellness AS c
+JOIN wellness_fusion AS f ON f.id_conservado = c.id
+JOIN wellness AS o ON o.id = f.id_origen
+SET
+    c.periodizacion_tactica = COALESCE(c.periodizacion_tactica, o.periodizacion_tactica),
+    c.id_tipo_estimulo = COALESCE(c.id_tipo_estimulo, o.id_tipo_estimulo),
+    c.id_tipo_readaptacion = COALESCE(c.id_tipo_readaptacion, o.id_tipo_readaptacion),
+    c.recuperacion = COALESCE(c.recuperacion, o.recuperacion),
+    c.fatiga = COALESCE(c.fatiga, o.fatiga),
+    c.sueno = COALESCE(c.sueno, o.sueno),
+    c.stress = COALESCE(c.stress, o.stress),
+    c.dolor = COALESCE(c.dolor, o.dolor),
+    c.partes_cuerpo_dolor = COALESCE(c.partes_cuerpo_dolor, o.partes_cuerpo_dolor);
+
+-- 3) Eliminar los duplicados ya fusionados
+DELETE w
+FROM wellness AS w
+JOIN wellness_duplicados AS d ON d.id = w.id;
+
+COMMIT;
+
+DROP TEMPORARY TABLE wellness_fusion;
+DROP TEMPORARY TABLE wellness_duplicados;
+
+-- 4) Ámbito calculado e índice único sobre la clave de negocio
+ALTER TABLE wellness
+  ADD COLUMN ambito VARCHAR(10)
+      AS (IF(usuario <=> 'developer', 'developer', 'general')) STORED,
+  ADD UNIQUE KEY uq_wellness_jugadora_fecha_turno_ambito (id_jugadora, fecha_sesion, turno, ambito);
@@ -0,0 +1,173 @@
+import streamlit as st
+import datetime
+import pandas as pd
+
+from src.i18n.i18n import t
+from src.schema import new_base_record
+from src.db_catalogs import load_form_catalogs
+from src.checkin_ui import validate_checkin
+from src.check_out import validate_checkout
+
+W_SCALES = ["recuperacion", "fatiga", "sueno", "stress", "dolor"]
+
+def _to_int(value):
+    """Convierte el valor de una celda del editor a int (None si está vacía)."""
+    if value is None or pd.isna(value):
+        return None
+    return int(value)
+
+def _to_list(value) -> list:
+    """Convierte la celda de una columna multiselect a lista (vacía si no hay selección)."""
+    if value is None or isinstance(value, float):
+        return []
+    return list(value)
+
+def _records_for_day_turno(records_df: pd.DataFrame, turno: str) -> pd.DataFrame:
+    """Registros de hoy para el turno indicado (tipo/turno pueden venir en minúsculas)."""
+    if records_df is None or records_df.empty:
+        return pd.DataFrame(columns=["id_jugadora", "tipo"])
+    hoy = pd.Timestamp(datetime.date.today())
+    mask = (records_df["fecha_sesion"] == hoy) & (records_df["turno"].astype(str).str.lower() == turno.lower())
+    return records_df[mask]
+
+def batch_checkin_form(jug_df: pd.DataFrame, records_df: pd.DataFrame, turno: str, username: str) -> tuple[list[dict], list[str], bool]:
+    """
+    Check-in por lote: una fila por jugadora del plantel en una tabla editable.
+
+    Las filas sin ninguna escala completada se ignoran; el resto se valida con
+    validate_checkin(). La periodización táctica y el tipo de estímulo son comunes.
+
+    Retorna:
+        (registros válidos, errores de validación, enviado)
+    """
+    catalogos = load_form_catalogs()
+    zonas_anatomicas = list(catalogos["zonas_anatomicas"].nombres)
+    estimulos_campo_list = list(catalogos["estimulos_campo"].nombres)
+    map_estimulos_campo_nombre_a_id = catalogos["estimulos_campo"].nombre_a_id
+    estimulos_readaptacion_list = list(catalogos["estimulos_readaptacion"].nombres)
+    map_estimulos_readaptacion_nombre_a_id = catalogos["estimulos_readaptacion"].nombre_a_id
+
+    con_registro = set(_records_for_day_turno(records_df, turno)["id_jugadora"])
+
+    grid = jug_df[["id_jugadora", "nombre_jugadora"]].copy().reset_index(drop=True)
+    grid.insert(2, "registrado", grid["id_jugadora"].isin(con_registro))
+    for col in W_SCALES:
+        grid[col] = pd.Series([None] * len(grid), dtype="Int64")
+    grid["partes_cuerpo_dolor"] = [[] for _ in range(len(grid))]
+    grid["tipo_readaptacion"] = None
+    grid["en_periodo"] = False
+    grid["observacion"] = ""
+
+    opciones_minor = [f"MD-{i}" for i in range(14, 0, -1)] + ["MD0"]
+    opciones_plus = ["MD0"] + [f"MD+{i}" for i in range(1, 15)]
+
+    with st.form("batch_checkin_form", border=False):
+        colA, colB, colC = st.columns([1, 1, 2])
+        with colA:
+            dia_plus = st.selectbox(t("MD+"), options=opciones_plus, index=opciones_plus.index(st.session_state.get("dia_plus", "MD+1")))
+        with colB:
+            dia_minor = st.selectbox("MD-", options=opciones_minor, index=opciones_minor.index(st.session_state.get("dia_minor", "MD-6")))
+        with colC:
+            tipo_estimulo = st.selectbox(t("Tipos de estímulo"), estimulos_campo_list, index=0)
+
+        edited = st.data_editor(
+            grid,
+            column_config={
+                "id_jugadora": None,
+                "nombre_jugadora": st.column_config.TextColumn(t("Jugadora"), disabled=True),
+                "registrado": st.column_config.CheckboxColumn(t("Registrado hoy"), disabled=True),
+                "recuperacion": st.column_config.NumberColumn(t("Recuperación"), min_value=1, max_value=5, step=1),
+                "fatiga": st.column_config.NumberColumn(t("Energía"), min_value=1, max_value=5, step=1),
+                "sueno": st.column_config.NumberColumn(t("Sueño"), min_value=1, max_value=5, step=1),
+                "stress": st.column_config.NumberColumn(t("Estrés"), min_value=1, max_value=5, step=1),
+                "dolor": st.column_config.NumberColumn(t("Dolor"), min_value=1, max_value=5, step=1),
+                "partes_cuerpo_dolor": st.column_config.MultiselectColumn(t("Partes del cuerpo con dolor"), options=zonas_anatomicas),
+                "tipo_readaptacion": st.column_config.SelectboxColumn(t("Readaptación en campo"), options=estimulos_readaptacion_list),
+                "en_periodo": st.column_config.CheckboxColumn(t("Periodo")),
+                "observacion": st.column_config.TextColumn(t("Observaciones")),
+            },
+            num_rows="fixed", hide_index=True, key="batch_checkin_editor",
+        )
+        submitted = st.form_submit_button(t("Validar y guardar plantel"), type="primary")
+
+    st.session_state["dia_plus"] = dia_plus
+    st.session_state["dia_minor"] = dia_minor
+
+    records, errores = [], []
+    for row in edited.to_dict("records"):
+        valores = {col: _to_int(row[col]) for col in W_SCALES}
+        if all(v is None for v in valores.values()):
+            continue
+
+        record = new_base_record(id_jugadora=str(row["id_jugadora"]), username=username, tipo="checkin")
+        record["turno"] = turno
+        record.update(valores)
+        record["partes_cuerpo_dolor"] = _to_list(row["partes_cuerpo_dolor"]) if (valores["dolor"] or 0) > 1 else []
+        record["periodizacion_tactica"] = dia_plus + " / " + dia_minor
+        record["id_tipo_estimulo"] = map_estimulos_campo_nombre_a_id.get(tipo_estimulo)
+        record["id_tipo_readaptacion"] = (
+            map_estimulos_readaptacion_nombre_a_id.get(row["tipo_readaptacion"]) if tipo_estimulo == "Readaptación" else None
+        )
+        record["en_periodo"] = bool(row["en_periodo"])
+        record["observacion"] = row["observacion"] or ""
+
+        is_valid, msg = validate_checkin(record)
+        if is_valid:
+            records.append(record)
+        else:
+            errores.append(f"{row['nombre_jugadora']}: {msg}")
+
+    return records, errores, submitted
+
+def batch_checkout_form(jug_df: pd.DataFrame, records_df: pd.DataFrame, turno: str, username: str) -> tuple[list[dict], list[str], bool]:
+    """
+    Check-out por lote: una fila por jugadora con check-in hoy en el turno.
+
+    Las filas sin minutos ni RPE se ignoran; el resto se valida con validate_checkout()
+    y la UA se calcula como RPE x minutos.
+
+    Retorna:
+        (registros válidos, errores de validación, enviado)
+    """
+    con_checkin = set(_records_for_day_turno(records_df, turno)["id_jugadora"])
+    grid = jug_df[jug_df["id_jugadora"].isin(con_checkin)][["id_jugadora", "nombre_jugadora"]].copy().reset_index(drop=True)
+
+    if grid.empty:
+        st.info(t("Ninguna jugadora de este plantel tiene check-in hoy en este turno."))
+        return [], [], False
+
+    grid["minutos_sesion"] = pd.Series([None] * len(grid), dtype="Int64")
+    grid["rpe"] = pd.Series([None] * len(grid), dtype="Int64")
+
+    with st.form("batch_checkout_form", border=False):
+        edited = st.data_editor(
+            grid,
+            column_config={
+                "id_jugadora": None,
+                "nombre_jugadora": st.column_config.TextColumn(t("Jugadora"), disabled=True),
+                "minutos_sesion": st.column_config.NumberColumn(t("Minutos de la sesión"), min_value=1, step=1),
+                "rpe": st.column_config.NumberColumn("RPE (1-10)", min_value=1, max_value=10, step=1),
+            },
+            num_rows="fixed", hide_index=True, key="batch_checkout_editor",
+        )
+        submitted = st.form_submit_button(t("Validar y guardar plantel"), type="primary")
+
+    records, errores = [], []
+    for row in edited.to_dict("records"):
+        minutos, rpe = _to_int(row["minutos_sesion"]), _to_int(row["rpe"])
+        if minutos is None and rpe is None:
+            continue
+
+        record = new_base_record(id_jugadora=str(row["id_jugadora"]), username=username, tipo="checkout")
+        record["turno"] = turno
+        record["minutos_sesion"] = minutos
+        record["rpe"] = rpe
+        record["ua"] = int(rpe * minutos) if minutos and rpe else None
+
+        is_valid, msg = validate_checkout(record)
+        if is_valid:
+            records.append(record)
+        else:
+            errores.append(f"{row['nombre_jugadora']}: {msg}")
+
+    return records, errores, submitted
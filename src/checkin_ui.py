@@ -1,7 +1,7 @@
 import streamlit as st
 import datetime
 import pandas as pd
-from .db_catalogs import load_catalog_list_db
+from .db_catalogs import load_form_catalogs
 from .schema import DIAS_SEMANA
 from src.i18n.i18n import t
 
@@ -17,17 +17,14 @@ def checkin_form(record: dict, genero: str) -> tuple[dict, bool, str]:
     if "dia_minor" not in st.session_state:
         st.session_state["dia_minor"] = "MD-6"  # valor por defecto
 
-    zonas_anatomicas_df = load_catalog_list_db("zonas_anatomicas", as_df=True)
-    map_zonas_anatomicas_nombre_a_id = dict(zip(zonas_anatomicas_df["nombre"], zonas_anatomicas_df["id"]))
-    zonas_anatomicas_list = zonas_anatomicas_df["nombre"].tolist()
+    catalogos = load_form_catalogs()
+    zonas_anatomicas_list = list(catalogos["zonas_anatomicas"].nombres)
 
-    estimulos_campo_df = load_catalog_list_db("estimulos_campo", as_df=True)
-    map_estimulos_campo_nombre_a_id = dict(zip(estimulos_campo_df["nombre"], estimulos_campo_df["id"]))
-    estimulos_campo_list = estimulos_campo_df["nombre"].tolist()
+    estimulos_campo_list = list(catalogos["estimulos_campo"].nombres)
+    map_estimulos_campo_nombre_a_id = catalogos["estimulos_campo"].nombre_a_id
 
-    estimulos_readaptacion_df = load_catalog_list_db("estimulos_readaptacion", as_df=True)
-    map_estimulos_readaptacion_nombre_a_id = dict(zip(estimulos_readaptacion_df["nombre"], estimulos_readaptacion_df["id"]))
-    estimulos_readaptacion_list = estimulos_readaptacion_df["nombre"].tolist()
+    estimulos_readaptacion_list = list(catalogos["estimulos_readaptacion"].nombres)
+    map_estimulos_readaptacion_nombre_a_id = catalogos["estimulos_readaptacion"].nombre_a_id
 
     with st.container():
         st.markdown(t("**Check-in diario (pre-entrenamiento)**"))
@@ -1,3 +1,9 @@
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
 import pandas as pd
 from src.db_connection import get_connection
 import streamlit as st
@@ -32,3 +38,100 @@ def load_catalog_list_db(table_name, as_df=False):
         return pd.DataFrame() if as_df else []
     finally:
         conn.close()
+
+# ============================================================
+# 📚 Registro de catálogos del formulario de check-in
+# ============================================================
+
+# Catálogos que usa el formulario (todos con columnas id y nombre)
+FORM_CATALOGS = ("zonas_anatomicas", "estimulos_campo", "estimulos_readaptacion")
+
+# Segundos entre comprobaciones de versión de los catálogos
+CATALOG_VERSION_TTL = 300
+
+@dataclass(frozen=True)
+class Catalog:
+    """Catálogo inmutable con sus mapas nombre ↔ id construidos una sola vez."""
+    tabla: str
+    nombres: tuple[str, ...]
+    nombre_a_id: Mapping[str, int]
+    id_a_nombre: Mapping[int, str]
+
+    @classmethod
+    def from_rows(cls, tabla: str, rows: list[dict]) -> "Catalog":
+        return cls(
+            tabla=tabla,
+            nombres=tuple(row["nombre"] for row in rows),
+            nombre_a_id=MappingProxyType({row["nombre"]: row["id"] for row in rows}),
+            id_a_nombre=MappingProxyType({row["id"]: row["nombre"] for row in rows}),
+        )
+
+class CatalogRegistry:
+    """
+    Catálogos del formulario compartidos por todo el proceso.
+
+    - La versión de cada catálogo es (COUNT(*), MAX(id), SUM(CRC32(nombre))), obtenida
+      para todos en una sola consulta UNION ALL (solo columnas numéricas) y como mucho
+      cada CATALOG_VERSION_TTL s: sin cambios, un único viaje a la BD por TTL.
+    - Solo los catálogos cuya versión cambió se recargan, cada uno con su propia consulta.
+    """
+
+    def __init__(self, tablas: tuple[str, ...] = FORM_CATALOGS):
+        self.tablas = tablas
+        self.lock = threading.Lock()
+        self.catalogs: dict[str, Catalog] = {}
+        self.versions: dict[str, tuple] = {}
+        self.checked_at = None
+
+    def get(self) -> dict[str, Catalog]:
+        with self.lock:
+            if self.checked_at is None or (time.monotonic() - self.checked_at) >= CATALOG_VERSION_TTL:
+                self._refresh()
+            return dict(self.catalogs)
+
+    def _refresh(self) -> None:
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No se pudo establecer conexión con la base de datos.")
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(" UNION ALL ".join(
+                f"SELECT '{tabla}' AS catalogo, COUNT(*) AS total, MAX(id) AS max_id, "
+                f"SUM(CRC32(nombre)) AS checksum FROM {tabla}"
+                for tabla in self.tablas
+            ) + ";")
+            versions = {row["catalogo"]: (row["total"], row["max_id"], row["checksum"]) for row in cursor.fetchall()}
+
+            # Cada catálogo cambiado se recarga con su propia consulta: un UNION de las
+            # columnas 'nombre' falla si las tablas tienen colaciones distintas
+            for tabla in self.tablas:
+                if versions.get(tabla) == self.versions.get(tabla):
+                    continue
+                cursor.execute(f"SELECT id, nombre FROM {tabla} ORDER BY id;")
+                self.catalogs[tabla] = Catalog.from_rows(tabla, cursor.fetchall())
+                self.versions[tabla] = versions.get(tabla)
+            cursor.close()
+            self.checked_at = time.monotonic()
+        finally:
+            conn.close()
+
+@st.cache_resource
+def get_catalog_registry() -> CatalogRegistry:
+    """Instancia única por proceso del registro de catálogos."""
+    return CatalogRegistry()
+
+def load_form_catalogs() -> dict[str, Catalog]:
+    """
+    Devuelve los catálogos del formulario de check-in {tabla: Catalog}.
+    Sin consultas mientras la versión no caduque; si la BD falla se muestran
+    los últimos catálogos cargados (o vacíos si nunca se cargaron).
+    """
+    registry = get_catalog_registry()
+    try:
+        return registry.get()
+    except Exception as e:
+        st.error(f":material/warning: Error al cargar los catálogos del formulario: {e}")
+        catalogs = dict(registry.catalogs)
+        for tabla in registry.tablas:
+            catalogs.setdefault(tabla, Catalog.from_rows(tabla, []))
+        return catalogs
@@ -1,32 +1,206 @@
+import threading
+import time
 import streamlit as st
 import mysql.connector
 from mysql.connector import pooling
+from mysql.connector.constants import ClientFlag
+
+# Valores por defecto si no se definen en st.secrets["connections"]["mysql"]
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 5
+DEFAULT_POOL_TIMEOUT = 10
+
+class PoolTimeoutError(mysql.connector.errors.PoolError):
+    """No se liberó ninguna conexión dentro del tiempo de espera configurado."""
+
+class _TrackedConnection:
+    """
+    Envoltorio de una conexión prestada por InstrumentedPool.
+
+    Delega todo en la conexión real; close() la devuelve al pool (o la cierra si
+    era de desbordamiento) y libera el hueco para la siguiente sesión en espera.
+    """
+
+    def __init__(self, cnx, owner, overflow: bool):
+        self._cnx = cnx
+        self._owner = owner
+        self._overflow = overflow
+        self._released = False
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        try:
+            self._cnx.close()
+        finally:
+            self._owner._release(self._overflow)
+
+    def __getattr__(self, attr):
+        return getattr(self._cnx, attr)
+
+    def __del__(self):
+        # Red de seguridad para rutas que no cierran la conexión ante un error
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class InstrumentedPool:
+    """
+    Pool de conexiones MySQL con espera bloqueante, desbordamiento y métricas.
+
+    - pool_size conexiones persistentes (MySQLConnectionPool).
+    - max_overflow conexiones adicionales abiertas bajo demanda y cerradas al liberarse.
+    - Si todas están en uso, get_connection() espera hasta pool_timeout segundos
+      en lugar de fallar de inmediato.
+    - Antes de entregar una conexión se comprueba con ping(reconnect=True).
+    """
+
+    def __init__(self, db_config: dict, pool_size: int, max_overflow: int, timeout: float):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self._config = db_config
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name="main_pool",
+            pool_size=pool_size,
+            pool_reset_session=True,
+            **db_config,
+        )
+        self._slots = threading.BoundedSemaphore(pool_size + max_overflow)
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "in_use": 0,
+            "overflow_in_use": 0,
+            "max_in_use": 0,
+            "waiting": 0,
+            "max_waiting": 0,
+            "waits": 0,
+            "wait_total_s": 0.0,
+            "wait_max_s": 0.0,
+            "timeouts": 0,
+            "failures": 0,
+            "reconnects": 0,
+        }
+
+    def get_connection(self) -> _TrackedConnection:
+        with self._lock:
+            self._stats["waiting"] += 1
+            self._stats["max_waiting"] = max(self._stats["max_waiting"], self._stats["waiting"])
+
+        start = time.perf_counter()
+        acquired = self._slots.acquire(timeout=self.timeout)
+        waited = time.perf_counter() - start
+
+        with self._lock:
+            self._stats["waiting"] -= 1
+            if waited > 0.001:
+                self._stats["waits"] += 1
+            self._stats["wait_total_s"] += waited
+            self._stats["wait_max_s"] = max(self._stats["wait_max_s"], waited)
+            if not acquired:
+                self._stats["timeouts"] += 1
+                self._stats["failures"] += 1
+
+        if not acquired:
+            raise PoolTimeoutError(
+                f"Sin conexiones libres tras {self.timeout:g} s "
+                f"({self.pool_size} + {self.max_overflow} en uso)."
+            )
+
+        overflow = False
+        try:
+            try:
+                cnx = self._pool.get_connection()
+            except mysql.connector.errors.PoolError:
+                # Pool agotado pero con hueco de desbordamiento disponible
+                cnx = mysql.connector.connect(**self._config)
+                overflow = True
+            self._pre_ping(cnx)
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                self._stats["failures"] += 1
+            raise
+
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            self._stats["overflow_in_use"] += int(overflow)
+            self._stats["max_in_use"] = max(self._stats["max_in_use"], self._stats["in_use"])
+
+        return _TrackedConnection(cnx, self, overflow)
+
+    def _pre_ping(self, cnx) -> None:
+        """Verifica que la conexión siga viva; si el servidor la cerró, reconecta."""
+        if cnx.is_connected():
+            return
+        cnx.ping(reconnect=True, attempts=2, delay=0)
+        with self._lock:
+            self._stats["reconnects"] += 1
+
+    def _release(self, overflow: bool) -> None:
+        with self._lock:
+            self._stats["in_use"] -= 1
+            self._stats["overflow_in_use"] -= int(overflow)
+        self._slots.release()
+
+    def stats(self) -> dict:
+        """Copia de los contadores del pool."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pool_size"] = self.pool_size
+        stats["max_overflow"] = self.max_overflow
+        stats["timeout_s"] = self.timeout
+        intentos = stats["checkouts"] + stats["timeouts"]
+        stats["wait_avg_ms"] = round(1000 * stats["wait_total_s"] / intentos, 2) if intentos else 0.0
+        stats["wait_max_ms"] = round(1000 * stats.pop("wait_max_s"), 2)
+        stats.pop("wait_total_s")
+        return stats
 
 @st.cache_resource
 def init_connection():
-    """Inicializa un pool de conexiones MySQL usando st.secrets."""
+    """
+    Inicializa un pool de conexiones MySQL usando st.secrets.
+
+    Parámetros opcionales en [connections.mysql]:
+        pool_size (int): conexiones persistentes (por defecto 5).
+        max_overflow (int): conexiones extra bajo demanda (por defecto 5).
+        pool_timeout (float): segundos de espera por una conexión libre (por defecto 10).
+    """
     db_config = st.secrets["connections"]["mysql"]
 
-    pool = pooling.MySQLConnectionPool(
-        pool_name="main_pool",
-        pool_size=5,
-        pool_reset_session=True,
-        host=db_config["host"],
-        user=db_config["username"],
-        password=db_config["password"],
-        database=db_config["database"],
-        port=db_config["port"],
-        auth_plugin="mysql_native_password"
+    pool = InstrumentedPool(
+        {
+            "host": db_config["host"],
+            "user": db_config["username"],
+            "password": db_config["password"],
+            "database": db_config["database"],
+            "port": db_config["port"],
+            "auth_plugin": "mysql_native_password",
+            # rowcount = filas encontradas (no solo modificadas) en los UPDATE por clave
+            "client_flags": [ClientFlag.FOUND_ROWS],
+        },
+        pool_size=int(db_config.get("pool_size", DEFAULT_POOL_SIZE)),
+        max_overflow=int(db_config.get("max_overflow", DEFAULT_MAX_OVERFLOW)),
+        timeout=float(db_config.get("pool_timeout", DEFAULT_POOL_TIMEOUT)),
     )
     return pool
 
 def get_connection():
-    """Obtiene una conexión activa desde el pool."""
+    """
+    Obtiene una conexión activa desde el pool.
+    Espera hasta pool_timeout segundos si todas están ocupadas; devuelve None si falla.
+    """
     pool = init_connection()
     try:
-        connection = pool.get_connection()
-        if connection.is_connected():
-            return connection
+        return pool.get_connection()
     except mysql.connector.Error as e:
         st.error(f":material/warning: Error al conectar con MySQL: {e}")
         return None
+
+def get_pool_stats() -> dict:
+    """Métricas del pool (esperas, conexiones en uso, fallos) para el rol developer."""
+    return init_connection().stats()
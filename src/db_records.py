@@ -3,121 +3,385 @@ import pandas as pd
 import json
 import datetime
 
-from src.schema import MAP_POSICIONES
+from src.schema import MAP_POSICIONES, apply_wellness_schema
+from src.partes_cuerpo import decode_partes, decode_parte, ZonaIndex
 from src.db_connection import get_connection
+from src.wellness_cache import get_wellness_cache, get_data_version
+from src.load_state import get_load_state
+
+_WELLNESS_SELECT = """
+    SELECT 
+        w.id,
+        w.id_jugadora,
+        f.nombre,
+        f.apellido,
+        f.competicion as plantel,
+        w.fecha_sesion,
+        w.tipo,
+        w.turno,
+        w.recuperacion,
+        w.fatiga as energia,
+        w.sueno,
+        w.stress,
+        w.dolor,
+        w.partes_cuerpo_dolor,
+        w.periodizacion_tactica,
+        ec.nombre AS tipo_estimulo,
+        er.nombre AS tipo_readaptacion,
+        w.minutos_sesion,
+        w.rpe,
+        w.ua,
+        w.en_periodo,
+        w.observacion,
+        w.fecha_hora_registro,
+        w.usuario
+    FROM wellness AS w
+    LEFT JOIN futbolistas f ON w.id_jugadora = f.identificacion
+    LEFT JOIN estimulos_campo AS ec 
+        ON w.id_tipo_estimulo = ec.id
+    LEFT JOIN estimulos_readaptacion AS er 
+        ON w.id_tipo_readaptacion = er.id
+    WHERE f.genero = 'F'
+"""
+
+# Ámbitos de datos por rol: el developer solo ve sus registros de prueba y el
+# resto de roles todo lo demás (incluidos los registros sin usuario)
+SCOPE_DEVELOPER = "developer"
+SCOPE_GENERAL = "general"
+
+def _role_scope() -> str:
+    """Ámbito de datos de la sesión actual según su rol."""
+    return SCOPE_DEVELOPER if st.session_state["auth"]["rol"].lower() == "developer" else SCOPE_GENERAL
+
+def _scope_condition(scope: str, alias: str = "w") -> tuple[str, tuple]:
+    """Condición SQL (para añadir con AND) y parámetros que limitan la consulta al ámbito."""
+    if scope == SCOPE_DEVELOPER:
+        return f"{alias}.usuario = %s", ("developer",)
+    return f"({alias}.usuario IS NULL OR {alias}.usuario <> %s)", ("developer",)
+
+def _in_scope(df: pd.DataFrame, scope: str) -> pd.Series:
+    """Equivalente en pandas de _scope_condition (para repartir filas ya leídas)."""
+    es_developer = df["usuario"].astype("string").eq("developer").fillna(False).astype(bool)
+    return es_developer if scope == SCOPE_DEVELOPER else ~es_developer
+
+def _build_wellness_df(rows: list[dict]) -> pd.DataFrame:
+    """
+    Convierte las filas de la consulta de wellness en DataFrame:
+    - partes_cuerpo_dolor (list Python)
+    - nombre_jugadora en la segunda posición
+    - tipos compactos de src.schema.apply_wellness_schema (category, Int8/Int16/Int32, datetime64)
+    """
+    if not rows:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(rows)
 
-def get_records_wellness_db(as_df: bool = True):
+    # --- Procesar JSON (partes_cuerpo_dolor) en una sola llamada ---
+    if "partes_cuerpo_dolor" in df.columns:
+        df["partes_cuerpo_dolor"] = decode_partes(df["partes_cuerpo_dolor"])
+
+    # Crear columna nombre_jugadora y colocarla en la segunda posición
+    nombre_jugadora = (df["nombre"].fillna("") + " " + df["apellido"].fillna("")).str.strip()
+    df.insert(2, "nombre_jugadora", nombre_jugadora)
+    df = df.drop(columns=["nombre", "apellido"], errors="ignore")
+
+    # --- Tipos compactos (fechas, categorías y enteros con nulos) ---
+    return apply_wellness_schema(df)
+
+def _sync_wellness_cache(conn, scope: str, full_reload: bool = False) -> pd.DataFrame:
+    """
+    Sincroniza la caché de proceso con la tabla 'wellness' usando una marca de agua.
+
+    - Primera carga (o full_reload): consulta completa.
+    - Siguientes: solo filas con fecha_hora_registro >= marca de agua (altas y
+      modificaciones, que actualizan esa columna) y se fusionan por 'id'.
+    - Integridad: se compara COUNT(*) y SUM(CRC32(id)) de la BD con los de la caché.
+      Si difieren, se piden solo los ids: se eliminan los que ya no existen y se leen
+      completos los que faltan (filas que se confirmaron tarde con una marca anterior
+      a la de agua, o un alta y un borrado en la misma ventana, que dejan el recuento igual).
+
+    Todas las consultas se limitan al ámbito (scope) del rol en el WHERE, y cada
+    ámbito tiene su propia caché.
+    """
+    cache = get_wellness_cache(scope)
+    condicion, scope_params = _scope_condition(scope)
+    with cache.lock:
+        cursor = conn.cursor(dictionary=True)
+        try:
+            if full_reload or not cache.loaded or cache.watermark is None:
+                cursor.execute(
+                    _WELLNESS_SELECT + f" AND {condicion} ORDER BY w.fecha_hora_registro DESC;",
+                    scope_params,
+                )
+                cache.replace(_build_wellness_df(cursor.fetchall()))
+                cache.mark_synced()
+                return cache.df
+
+            cursor.execute(
+                _WELLNESS_SELECT + f" AND {condicion} AND w.fecha_hora_registro >= %s ORDER BY w.fecha_hora_registro DESC;",
+                scope_params + (cache.watermark,),
+            )
+            cache.upsert(_build_wellness_df(cursor.fetchall()))
+
+            cursor.execute(
+                f"""
+                SELECT COUNT(*) AS total, COALESCE(SUM(CRC32(w.id)), 0) AS checksum
+                FROM wellness AS w
+                LEFT JOIN futbolistas f ON w.id_jugadora = f.identificacion
+                WHERE f.genero = 'F' AND {condicion};
+                """,
+                scope_params,
+            )
+            row = cursor.fetchone()
+            if (row["total"], int(row["checksum"])) != cache.checksum():
+                cursor.execute(
+                    f"""
+                    SELECT w.id
+                    FROM wellness AS w
+                    LEFT JOIN futbolistas f ON w.id_jugadora = f.identificacion
+                    WHERE f.genero = 'F' AND {condicion};
+                    """,
+                    scope_params,
+                )
+                ids_db = {row["id"] for row in cursor.fetchall()}
+                ids_cache = cache.ids()
+                cache.drop(ids_cache - ids_db)
+                faltantes = sorted(ids_db - ids_cache)
+                if faltantes:
+                    cursor.execute(
+                        _WELLNESS_SELECT + f" AND w.id IN ({', '.join(['%s'] * len(faltantes))});",
+                        tuple(faltantes),
+                    )
+                    cache.upsert(_build_wellness_df(cursor.fetchall()), force=True)
+
+            cache.mark_synced()
+            return cache.df
+        finally:
+            cursor.close()
+
+def _refresh_cached_rows(conn, keys: list[tuple]) -> None:
+    """
+    Write-through tras un guardado: relee por clave (id_jugadora, fecha_sesion, turno)
+    las filas escritas y las reemplaza en las cachés de cada ámbito, incrementando su
+    versión. Una fila que cambió de ámbito se elimina de la caché que ya no le corresponde.
+    Las cachés sin cargar (o todas, si algo falla) se invalidan: cambian de versión y se
+    sincronizan en la próxima lectura.
+    """
+    if not keys:
+        return
+    caches = {scope: get_wellness_cache(scope) for scope in (SCOPE_DEVELOPER, SCOPE_GENERAL)}
+    for cache in caches.values():
+        if not cache.loaded:
+            with cache.lock:
+                cache.invalidate()
+    caches = {scope: cache for scope, cache in caches.items() if cache.loaded}
+    if not caches:
+        return
+
+    cursor = None
+    try:
+        placeholders = ", ".join(["(%s, %s, %s)"] * len(keys))
+        params = tuple(value for key in keys for value in key)
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            _WELLNESS_SELECT + f" AND (w.id_jugadora, w.fecha_sesion, w.turno) IN ({placeholders});",
+            params,
+        )
+        delta = _build_wellness_df(cursor.fetchall())
+        for scope, cache in caches.items():
+            propias = delta[_in_scope(delta, scope)] if not delta.empty else delta
+            with cache.lock:
+                version_previa = cache.version
+                antes = cache.df[cache.df["id"].isin(delta["id"])] if not cache.df.empty and not delta.empty else None
+                cache.upsert(propias, force=True)
+                if not delta.empty:
+                    cache.drop(set(delta["id"]) - set(propias["id"]))
+                # Estado de carga por jugadora: O(1) para el día actual, reconstrucción si es un día pasado
+                get_load_state(scope).apply_write(antes, propias, version_previa, cache.version, cache.df)
+    except Exception:
+        for cache in caches.values():
+            with cache.lock:
+                cache.invalidate()
+    finally:
+        if cursor:
+            cursor.close()
+
+def _ensure_wellness_cache(scope: str, full_reload: bool = False) -> bool:
+    """Sincroniza la caché del ámbito si toca (o si se pide recarga). False si no hay conexión."""
+    if not (full_reload or get_wellness_cache(scope).needs_sync()):
+        return True
+    conn = get_connection()
+    if not conn:
+        st.error(":material/warning: No se pudo establecer conexión con la base de datos.")
+        return False
+    try:
+        _sync_wellness_cache(conn, scope, full_reload=full_reload)
+    finally:
+        conn.close()
+    return True
+
+def get_records_wellness_db(as_df: bool = True, full_reload: bool = False):
     """
     Carga todos los registros de la tabla 'wellness' desde la base de datos MySQL,
     uniendo los nombres descriptivos de los catálogos de estímulos.
 
     - as_df=True  → devuelve un DataFrame (por defecto)
     - as_df=False → devuelve lista de diccionarios
+    - full_reload=True → ignora la caché incremental y relee la tabla completa
 
     Joins:
     - wellness.id_tipo_estimulo → estimulos_campo.id
     - wellness.id_tipo_readaptacion → estimulos_readaptacion.id
 
+    Solo se leen las filas del ámbito del rol (developer / resto) y se mantienen
+    en una caché de proceso por ámbito (ver src.wellness_cache): los guardados y
+    borrados de la app la actualizan al momento, y la BD solo se consulta (de forma
+    incremental) cada SYNC_INTERVAL_SECONDS para recoger cambios externos.
+
     Añade columnas procesadas:
     - partes_cuerpo_dolor (list Python)
-    - fecha_sesion (datetime)
+    - fecha_sesion (datetime64) y tipos compactos (ver src.schema.apply_wellness_schema)
     """
 
-    conn = get_connection()
-    if not conn:
-        st.error(":material/warning: No se pudo establecer conexión con la base de datos.")
-        return pd.DataFrame() if as_df else []
+    scope = _role_scope()
+    cache = get_wellness_cache(scope)
 
     try:
-        query = """
-            SELECT 
-                w.id,
-                w.id_jugadora,
-                f.nombre,
-                f.apellido,
-                f.competicion as plantel,
-                w.fecha_sesion,
-                w.tipo,
-                w.turno,
-                w.recuperacion,
-                w.fatiga as energia,
-                w.sueno,
-                w.stress,
-                w.dolor,
-                w.partes_cuerpo_dolor,
-                w.periodizacion_tactica,
-                ec.nombre AS tipo_estimulo,
-                er.nombre AS tipo_readaptacion,
-                w.minutos_sesion,
-                w.rpe,
-                w.ua,
-                w.en_periodo,
-                w.observacion,
-                w.fecha_hora_registro,
-                w.usuario
-            FROM wellness AS w
-            LEFT JOIN futbolistas f ON w.id_jugadora = f.identificacion
-            LEFT JOIN estimulos_campo AS ec 
-                ON w.id_tipo_estimulo = ec.id
-            LEFT JOIN estimulos_readaptacion AS er 
-                ON w.id_tipo_readaptacion = er.id
-            WHERE f.genero = 'F'
-            ORDER BY w.fecha_hora_registro DESC;
-        """
+        if not _ensure_wellness_cache(scope, full_reload=full_reload):
+            return pd.DataFrame() if as_df else []
 
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        cursor.close()
+        with cache.lock:
+            df = cache.df
 
-        if not rows:
+        if df.empty:
             return pd.DataFrame() if as_df else []
 
-        # --- Crear DataFrame ---
-        df = pd.DataFrame(rows)
+        # --- Retornar según formato deseado ---
+        return df.copy() if as_df else df.to_dict(orient="records")
 
-        # --- Procesar JSON (partes_cuerpo_dolor) ---
-        if "partes_cuerpo_dolor" in df.columns:
-            df["partes_cuerpo_dolor"] = df["partes_cuerpo_dolor"].apply(
-                lambda x: json.loads(x) if isinstance(x, str) and x.strip().startswith("[") else []
-            )
+    except Exception as e:
+        st.error(f":material/warning: Error al cargar los registros de wellness: {e}")
+        return pd.DataFrame() if as_df else []
 
-        # --- Procesar fechas ---
-        if "fecha_sesion" in df.columns:
-            df["fecha_sesion"] = (
-                pd.to_datetime(df["fecha_sesion"], errors="coerce")
-                .apply(lambda x: x.date() if pd.notnull(x) else None)
-            )
+def get_role_data_version() -> tuple[str, int]:
+    """(ámbito del rol, versión de datos de wellness): clave para memos de cálculos derivados."""
+    scope = _role_scope()
+    return scope, get_data_version(scope)
 
-        if "fecha_hora_registro" in df.columns:
-            df["fecha_hora_registro"] = pd.to_datetime(df["fecha_hora_registro"], errors="coerce")
+def get_synced_data_version() -> tuple[str, int]:
+    """
+    Como get_role_data_version, pero sincronizando antes la caché del ámbito (si toca):
+    para cachés derivadas que cargan ellas mismas el wellness, de modo que la clave
+    no sea la versión anterior a la sincronización.
+    """
+    scope = _role_scope()
+    try:
+        _ensure_wellness_cache(scope)
+    except Exception as e:
+        st.error(f":material/warning: Error al cargar los registros de wellness: {e}")
+    return scope, get_data_version(scope)
 
-        # --- Ordenar de forma más reciente a más antigua ---
-        df = df.sort_values(by="fecha_hora_registro", ascending=False)
+def get_squad_load_state_db(dia: datetime.date | None = None) -> pd.DataFrame:
+    """
+    ACWR actual (móvil y EWMA) de cada jugadora del ámbito del rol a fecha 'dia' (por defecto hoy).
 
-        if st.session_state["auth"]["rol"].lower() == "developer":
-            df = df[df["usuario"]=="developer"]
-        else:
-            df = df[df["usuario"]!="developer"]
+    Se lee del estado incremental por jugadora (src.load_state), que los guardados y
+    borrados mantienen al día, sin recorrer el historial de wellness.
+    """
+    scope = _role_scope()
+    cache = get_wellness_cache(scope)
+    if not cache.loaded:
+        get_records_wellness_db()
+    return get_load_state(scope).snapshot(cache, dia)
+
+def get_zona_index_db() -> ZonaIndex:
+    """
+    Tabla larga de zonas con dolor e índice zona → registros del ámbito del rol.
+    Se construye una vez por versión de datos junto a la caché de wellness (ver
+    WellnessCache.zonas); los informes la restringen a los ids de su frame filtrado.
+    """
+    scope = _role_scope()
+    try:
+        _ensure_wellness_cache(scope)
+    except Exception as e:
+        st.error(f":material/warning: Error al cargar los registros de wellness: {e}")
+    return get_wellness_cache(scope).zonas()
 
-        # Crear columna nombre_jugadora y colocarla en la segunda posición
-        nombre_jugadora = (df["nombre"].fillna("") + " " + df["apellido"].fillna("")).str.strip()
-        df.insert(2, "nombre_jugadora", nombre_jugadora)
+@st.cache_data(ttl=600, show_spinner=False)
+def _query_wellness_filtered(scope: str, plantel, start, end, id_jugadora, turno, data_version: int) -> pd.DataFrame:
+    """
+    Consulta filtrada cacheada por (ámbito del rol, filtros, versión de datos).
+    Lanza la excepción en caso de error para no cachear resultados vacíos.
+    """
+    condicion, scope_params = _scope_condition(scope)
+    conditions, params = [condicion], list(scope_params)
+    if plantel:
+        conditions.append("f.competicion = %s")
+        params.append(plantel)
+    if start:
+        conditions.append("w.fecha_sesion >= %s")
+        params.append(start)
+    if end:
+        conditions.append("w.fecha_sesion <= %s")
+        params.append(end)
+    if id_jugadora:
+        conditions.append("w.id_jugadora = %s")
+        params.append(id_jugadora)
+    if turno:
+        conditions.append("w.turno = %s")
+        params.append(turno)
+
+    query = _WELLNESS_SELECT
+    for condition in conditions:
+        query += f" AND {condition}"
+    query += " ORDER BY w.fecha_hora_registro DESC;"
 
-        df = df.drop(columns=["nombre", "apellido"], errors="ignore")
+    conn = get_connection()
+    if not conn:
+        raise ConnectionError("No se pudo establecer conexión con la base de datos.")
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
 
-        # print(df["fecha_sesion"].head())
-        # print(df["fecha_sesion"].dtype)
-        # print(type(df["fecha_sesion"].iloc[0]))
+    return _build_wellness_df(rows)
 
-        # --- Retornar según formato deseado ---
-        return df if as_df else df.to_dict(orient="records")
+def get_records_wellness_filtered_db(
+    plantel: str | None = None,
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    id_jugadora: str | None = None,
+    turno: str | None = None,
+    as_df: bool = True,
+):
+    """
+    Carga registros de 'wellness' aplicando los filtros en la consulta SQL,
+    de modo que solo se transfiere la ventana que se va a analizar.
+
+    Parámetros (todos opcionales, se ignoran si son None/vacíos):
+        plantel (str): código de competición (futbolistas.competicion).
+        start, end (date): rango de fecha_sesion (inclusive).
+        id_jugadora (str): identificación de la jugadora.
+        turno (str): turno del entrenamiento.
+
+    El resultado se cachea por ámbito del rol, filtros y versión de datos leída tras
+    sincronizar la caché del ámbito (get_synced_data_version), así que un guardado o
+    borrado, propio o de otro proceso, invalida la consulta en el siguiente rerun.
+
+    Devuelve el mismo formato que get_records_wellness_db().
+    """
+    try:
+        scope, data_version = get_synced_data_version()
+        df = _query_wellness_filtered(scope, plantel, start, end, id_jugadora, turno, data_version)
+        return df.copy() if as_df else df.to_dict(orient="records")
 
     except Exception as e:
         st.error(f":material/warning: Error al cargar los registros de wellness: {e}")
         return pd.DataFrame() if as_df else []
-    finally:
-        conn.close()
 
 def get_record_for_player_day_turno_db(id_jugadora: str, fecha_sesion: str, turno: str):
     """
@@ -150,35 +414,18 @@ def get_record_for_player_day_turno_db(id_jugadora: str, fecha_sesion: str, turn
                 st.error(f":material/warning: Formato de fecha inválido: {fecha_sesion}")
                 return None
 
-        # --- Logging modo developer ---
-        rol_actual = st.session_state["auth"]["rol"].lower().strip()
-
-        if rol_actual == "developer":
-            # --- Buscar el registro en la BD ---
-            query = """
-                SELECT *
-                FROM wellness
-                WHERE id_jugadora = %s
-                AND fecha_sesion = %s
-                AND turno = %s
-                AND usuario = %s
-                LIMIT 1;
-            """
-            usuario = rol_actual
-        else:
-            query = """
-                SELECT *
-                FROM wellness
-                WHERE id_jugadora = %s
-                AND fecha_sesion = %s
-                AND turno = %s
-                AND usuario != %s
-                LIMIT 1;
-            """
-
-            usuario = "developer"
-
-        cursor.execute(query, (id_jugadora, fecha_sesion, turno, usuario))
+        # --- Buscar el registro en la BD, dentro del ámbito del rol ---
+        condicion, scope_params = _scope_condition(_role_scope())
+        query = f"""
+            SELECT *
+            FROM wellness AS w
+            WHERE w.id_jugadora = %s
+            AND w.fecha_sesion = %s
+            AND w.turno = %s
+            AND {condicion}
+            LIMIT 1;
+        """
+        cursor.execute(query, (id_jugadora, fecha_sesion, turno) + scope_params)
         record = cursor.fetchone()
 
         # if rol_actual == "developer":
@@ -188,10 +435,7 @@ def get_record_for_player_day_turno_db(id_jugadora: str, fecha_sesion: str, turn
 
         # --- Convertir JSON a lista Python ---
         if record and record.get("partes_cuerpo_dolor"):
-            try:
-                record["partes_cuerpo_dolor"] = json.loads(record["partes_cuerpo_dolor"])
-            except Exception:
-                record["partes_cuerpo_dolor"] = []
+            record["partes_cuerpo_dolor"] = decode_parte(record["partes_cuerpo_dolor"])
 
         return record
 
@@ -205,14 +449,88 @@ def get_record_for_player_day_turno_db(id_jugadora: str, fecha_sesion: str, turn
         if conn:
             conn.close()
 
+_UPSERT_CHECKIN_QUERY = """
+    INSERT INTO wellness (
+        id_jugadora, fecha_sesion, tipo, turno, periodizacion_tactica,
+        id_tipo_estimulo, id_tipo_readaptacion, recuperacion, fatiga, sueno,
+        stress, dolor, partes_cuerpo_dolor, minutos_sesion, rpe, ua,
+        en_periodo, observacion, usuario
+    ) VALUES (
+        %(id_jugadora)s, %(fecha_sesion)s, %(tipo)s, %(turno)s, %(periodizacion_tactica)s,
+        %(id_tipo_estimulo)s, %(id_tipo_readaptacion)s, %(recuperacion)s, %(fatiga)s, %(sueno)s,
+        %(stress)s, %(dolor)s, %(partes_cuerpo_dolor)s, %(minutos_sesion)s, %(rpe)s, %(ua)s,
+        %(en_periodo)s, %(observacion)s, %(usuario)s
+    )
+    ON DUPLICATE KEY UPDATE
+        tipo = VALUES(tipo),
+        periodizacion_tactica = VALUES(periodizacion_tactica),
+        id_tipo_estimulo = VALUES(id_tipo_estimulo),
+        id_tipo_readaptacion = VALUES(id_tipo_readaptacion),
+        recuperacion = VALUES(recuperacion),
+        fatiga = VALUES(fatiga),
+        sueno = VALUES(sueno),
+        stress = VALUES(stress),
+        dolor = VALUES(dolor),
+        partes_cuerpo_dolor = VALUES(partes_cuerpo_dolor),
+        minutos_sesion = VALUES(minutos_sesion),
+        rpe = VALUES(rpe),
+        ua = VALUES(ua),
+        en_periodo = VALUES(en_periodo),
+        observacion = VALUES(observacion),
+        usuario = VALUES(usuario),
+        fecha_hora_registro = CURRENT_TIMESTAMP;
+"""
+
+# Check-out: solo los campos de carga post-sesión, sobre el check-in existente.
+_UPDATE_CHECKOUT_QUERY = """
+    UPDATE wellness
+    SET 
+        tipo = 'checkOut',
+        minutos_sesion = %(minutos_sesion)s,
+        rpe = %(rpe)s,
+        ua = %(ua)s,
+        fecha_hora_registro = CURRENT_TIMESTAMP,
+        usuario = %(usuario)s
+    WHERE id_jugadora = %(id_jugadora)s
+      AND fecha_sesion = %(fecha_sesion)s
+      AND turno = %(turno)s
+      AND ambito = IF(%(usuario)s <=> 'developer', 'developer', 'general');
+"""
+
+def _upsert_params(record: dict, modo: str) -> dict:
+    """Normaliza un registro a los parámetros de la sentencia de guardado según el modo."""
+    fecha_sesion = record.get("fecha_sesion")
+    if isinstance(fecha_sesion, str):
+        fecha_sesion = datetime.date.fromisoformat(fecha_sesion)
+
+    if modo.lower() == "checkout":
+        return {
+            "minutos_sesion": record.get("minutos_sesion"),
+            "rpe": record.get("rpe"),
+            "ua": record.get("ua"),
+            "usuario": record.get("usuario"),
+            "id_jugadora": record.get("id_jugadora"),
+            "fecha_sesion": fecha_sesion,
+            "turno": record.get("turno"),
+        }
+
+    params = dict(record)
+    params["fecha_sesion"] = fecha_sesion
+    params["partes_cuerpo_dolor"] = json.dumps(record.get("partes_cuerpo_dolor", []), ensure_ascii=False)
+    return params
+
 def upsert_wellness_record_db(record: dict, modo: str = "checkin") -> bool:
     """
     Inserta o actualiza un registro de wellness en la base de datos MySQL.
-    Criterio de unicidad: (id_jugadora, fecha_sesion, turno)
-
-    - Si modo == "checkin": inserta o actualiza todos los campos del registro.
-    - Si modo == "checkout": solo actualiza los campos del post-entrenamiento
-      (minutos_sesion, rpe, ua y tipo).
+    Criterio de unicidad: (id_jugadora, fecha_sesion, turno) dentro del ámbito del usuario
+    (developer / resto), respaldado por el índice único uq_wellness_jugadora_fecha_turno_ambito
+    (sql/migrations/001_wellness_unique_key.sql).
+
+    - Si modo == "checkin": INSERT ... ON DUPLICATE KEY UPDATE con todos los campos
+      del registro (una sola sentencia, sin SELECT previo).
+    - Si modo == "checkout": UPDATE por la clave única que solo modifica los campos
+      del post-entrenamiento (minutos_sesion, rpe, ua y tipo). Si no existe un
+      check-in previo no se modifica ninguna fila y se devuelve False.
     """
 
     conn = get_connection()
@@ -220,135 +538,30 @@ def upsert_wellness_record_db(record: dict, modo: str = "checkin") -> bool:
         st.error(":material/warning: No se pudo establecer conexión con la base de datos.")
         return False
 
+    cursor = None
     try:
         cursor = conn.cursor(dictionary=True)
 
-        # ============================================================
-        # 🔹 Normalización de datos
-        # ============================================================
-        fecha_sesion = record.get("fecha_sesion")
-        if isinstance(fecha_sesion, str):
-            fecha_sesion = datetime.date.fromisoformat(fecha_sesion)
-
-        partes_json = json.dumps(record.get("partes_cuerpo_dolor", []), ensure_ascii=False)
-
-        # ============================================================
-        # 🔹 Verificar si ya existe el registro
-        # ============================================================
-        check_query = """
-            SELECT id FROM wellness
-            WHERE id_jugadora = %s
-              AND fecha_sesion = %s
-              AND turno = %s
-            LIMIT 1;
-        """
-        cursor.execute(
-            check_query,
-            (
-                record.get("id_jugadora"),
-                fecha_sesion,
-                record.get("turno"),
-            ),
-        )
-        existing = cursor.fetchone()
-
-        # ============================================================
-        # 🟡 Si existe → UPDATE
-        # ============================================================
-        if existing:
-            if modo.lower() == "checkout":
-                # --- Solo actualizar los campos de carga post-sesión ---
-                update_query = """
-                    UPDATE wellness
-                    SET 
-                        tipo = 'checkOut',
-                        minutos_sesion = %(minutos_sesion)s,
-                        rpe = %(rpe)s,
-                        ua = %(ua)s,
-                        fecha_hora_registro = CURRENT_TIMESTAMP,
-                        usuario = %(usuario)s
-                    WHERE id = %(id)s;
-                """
-                params = {
-                    "minutos_sesion": record.get("minutos_sesion"),
-                    "rpe": record.get("rpe"),
-                    "ua": record.get("ua"),
-                    "usuario": record.get("usuario"),
-                    "id": existing["id"],
-                }
-
-            else:
-                # --- Actualización completa (check-in o edición general) ---
-                update_query = """
-                    UPDATE wellness
-                    SET 
-                        tipo = %(tipo)s,
-                        periodizacion_tactica = %(periodizacion_tactica)s,
-                        id_tipo_estimulo = %(id_tipo_estimulo)s,
-                        id_tipo_readaptacion = %(id_tipo_readaptacion)s,
-                        recuperacion = %(recuperacion)s,
-                        fatiga = %(fatiga)s,
-                        sueno = %(sueno)s,
-                        stress = %(stress)s,
-                        dolor = %(dolor)s,
-                        partes_cuerpo_dolor = %(partes_cuerpo_dolor)s,
-                        minutos_sesion = %(minutos_sesion)s,
-                        rpe = %(rpe)s,
-                        ua = %(ua)s,
-                        en_periodo = %(en_periodo)s,
-                        observacion = %(observacion)s,
-                        usuario = %(usuario)s,
-                        fecha_hora_registro = CURRENT_TIMESTAMP
-                    WHERE id = %(id)s;
-                """
-                params = dict(record)
-                params["partes_cuerpo_dolor"] = partes_json
-                params["id"] = existing["id"]
-
-            # --- Logging modo developer ---
-            if st.session_state["auth"]["rol"].lower() == "developer":
-                st.write(f"🟡 Query UPDATE ejecutada (modo={modo.upper()}):")
-                st.code(update_query, language="sql")
-                st.json(params)
-
-            cursor.execute(update_query, params)
-            conn.commit()
-            return True
-
-        # ============================================================
-        # 🟢 Si no existe → INSERT (solo modo checkin)
-        # ============================================================
-        else:
-            if modo.lower() == "checkout":
-                st.warning(":material/warning: No existe un check-in previo para este jugador, fecha y turno.")
-                return False
-
-            insert_query = """
-                INSERT INTO wellness (
-                    id_jugadora, fecha_sesion, tipo, turno, periodizacion_tactica,
-                    id_tipo_estimulo, id_tipo_readaptacion, recuperacion, fatiga, sueno,
-                    stress, dolor, partes_cuerpo_dolor, minutos_sesion, rpe, ua,
-                    en_periodo, observacion, usuario
-                ) VALUES (
-                    %(id_jugadora)s, %(fecha_sesion)s, %(tipo)s, %(turno)s, %(periodizacion_tactica)s,
-                    %(id_tipo_estimulo)s, %(id_tipo_readaptacion)s, %(recuperacion)s, %(fatiga)s, %(sueno)s,
-                    %(stress)s, %(dolor)s, %(partes_cuerpo_dolor)s, %(minutos_sesion)s, %(rpe)s, %(ua)s,
-                    %(en_periodo)s, %(observacion)s, %(usuario)s
-                );
-            """
-
-            params = dict(record)
-            params["fecha_sesion"] = fecha_sesion
-            params["partes_cuerpo_dolor"] = partes_json
-
-            if st.session_state["auth"]["rol"].lower() == "developer":
-                st.write("🟢 Query INSERT ejecutada:")
-                st.code(insert_query, language="sql")
-                st.json(params)
-
-            cursor.execute(insert_query, params)
-            conn.commit()
-            return True
+        query = _UPDATE_CHECKOUT_QUERY if modo.lower() == "checkout" else _UPSERT_CHECKIN_QUERY
+        params = _upsert_params(record, modo)
+
+        # --- Logging modo developer ---
+        if st.session_state["auth"]["rol"].lower() == "developer":
+            st.write(f"🟡 Query UPSERT ejecutada (modo={modo.upper()}):")
+            st.code(query, language="sql")
+            st.json(params)
+
+        cursor.execute(query, params)
+
+        # El pool usa CLIENT_FOUND_ROWS: rowcount == 0 solo si no hay check-in previo
+        if modo.lower() == "checkout" and cursor.rowcount == 0:
+            conn.rollback()
+            st.warning(":material/warning: No existe un check-in previo para este jugador, fecha y turno.")
+            return False
+
+        conn.commit()
+        _refresh_cached_rows(conn, [(params["id_jugadora"], params["fecha_sesion"], params["turno"])])
+        return True
 
     except Exception as e:
         conn.rollback()
@@ -365,6 +578,58 @@ def upsert_wellness_record_db(record: dict, modo: str = "checkin") -> bool:
         if conn:
             conn.close()
             
+def upsert_wellness_records_db(records: list[dict], modo: str = "checkin") -> tuple[bool, str]:
+    """
+    Guarda en bloque los registros de wellness de un plantel (entrada por lote).
+
+    Usa la misma sentencia que upsert_wellness_record_db() con executemany
+    dentro de una única transacción: o se guardan todos o ninguno.
+
+    Parámetros:
+        records (list[dict]): registros ya validados (misma estructura que new_base_record).
+        modo (str): "checkin" o "checkout".
+
+    Retorna:
+        (bool, str): (éxito, mensaje)
+    """
+    if not records:
+        return False, "No se proporcionaron registros para guardar."
+
+    conn = get_connection()
+    if not conn:
+        st.error(":material/warning: No se pudo establecer conexión con la base de datos.")
+        return False, ":material/warning: No se pudo establecer conexión con la base de datos."
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+
+        # executemany agrupa los INSERT en una sola sentencia multi-VALUES (sin ';' final)
+        query = _UPDATE_CHECKOUT_QUERY if modo.lower() == "checkout" else _UPSERT_CHECKIN_QUERY
+        query = query.strip().rstrip(";")
+        params = [_upsert_params(record, modo) for record in records]
+
+        cursor.executemany(query, params)
+
+        if modo.lower() == "checkout" and cursor.rowcount < len(records):
+            conn.rollback()
+            return False, ":material/warning: Alguna jugadora no tiene check-in previo para esta fecha y turno. No se guardó ningún registro."
+
+        conn.commit()
+        _refresh_cached_rows(conn, [(p["id_jugadora"], p["fecha_sesion"], p["turno"]) for p in params])
+        return True, f"✅ Se guardaron {len(records)} registro(s) correctamente."
+
+    except Exception as e:
+        conn.rollback()
+        st.error(f":material/warning: Error al guardar los registros por lote: {e}")
+        return False, f":material/warning: Error al guardar los registros por lote: {e}"
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
 def get_ultima_lesion_id_por_jugadora(id_jugadora: str) -> str | None:
     """
     Devuelve el ID de la última lesión registrada de una jugadora.
@@ -416,7 +681,10 @@ def get_records_plus_players_db(plantel: str = None) -> pd.DataFrame:
         return pd.DataFrame()
 
     try:
-        query = """
+        # Solo las filas del ámbito del rol (developer / resto)
+        condicion, scope_params = _scope_condition(_role_scope(), alias="l")
+
+        query = f"""
         SELECT 
             l.id AS id_registro,
             l.id_lesion,
@@ -464,12 +732,12 @@ def get_records_plus_players_db(plantel: str = None) -> pd.DataFrame:
         LEFT JOIN segmentos_corporales s ON l.segmento_id = s.id
         LEFT JOIN zonas_segmento z ON l.zona_cuerpo_id = z.id
         LEFT JOIN zonas_anatomicas za ON l.zona_especifica_id = za.id
-        WHERE f.genero = 'F'
+        WHERE f.genero = 'F' AND {condicion}
         ORDER BY l.fecha_hora_registro DESC;
         """
 
         cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
+        cursor.execute(query, scope_params)
         rows = cursor.fetchall()
         df = pd.DataFrame(rows)
         cursor.close()
@@ -502,11 +770,6 @@ def get_records_plus_players_db(plantel: str = None) -> pd.DataFrame:
         if plantel:
             df = df[df["plantel"] == plantel]
 
-        if st.session_state["auth"]["rol"].lower() == "developer":
-            df = df[df["usuario"]=="developer"]
-        else:
-            df = df[df["usuario"]!="developer"]
-        
         return df
 
     except Exception as e:
@@ -653,6 +916,18 @@ def delete_wellness(ids: list[int]) -> tuple[bool, str]:
         cursor.execute(query, tuple(ids))
         conn.commit()
 
+        # Write-through: aplicar el borrado también en las cachés (incrementa su versión)
+        for scope in (SCOPE_DEVELOPER, SCOPE_GENERAL):
+            cache = get_wellness_cache(scope)
+            with cache.lock:
+                if not cache.loaded:
+                    cache.invalidate()
+                    continue
+                version_previa = cache.version
+                antes = cache.df[cache.df["id"].isin(ids)] if not cache.df.empty else None
+                if cache.drop(ids):
+                    get_load_state(scope).apply_write(antes, None, version_previa, cache.version, cache.df, borrado=True)
+
         cursor.close()
         conn.close()
 
@@ -0,0 +1,195 @@
+import copy
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.reports.load_engine import (
+    VENTANA_AGUDA, VENTANA_CRONICA, MIN_DIAS_ACWR, LAMBDA_AGUDA, LAMBDA_CRONICA,
+)
+
+COLUMNAS_ESTADO = [
+    "id_jugadora", "ultimo_registro", "dias", "carga_aguda", "acute7", "chronic28",
+    "acwr", "ewma_aguda", "ewma_cronica", "acwr_ewma",
+]
+
+class PlayerLoadState:
+    """
+    Estado de carga de una jugadora por día natural (misma definición que
+    src.reports.load_engine.compute_load_windows):
+
+    - buffer circular con la UA diaria de los últimos 28 días,
+    - sumas acumuladas de 7 y 28 días,
+    - acumuladores EWMA agudo y crónico.
+
+    Añadir carga al último día o a un día posterior es O(1) (avanzar el calendario
+    cuesta como mucho 28 pasos); un día anterior exige reconstruir desde el historial.
+    """
+
+    def __init__(self):
+        self.buffer = np.zeros(VENTANA_CRONICA)
+        self.pos = 0
+        self.primer_dia = None
+        self.ultimo_dia = None
+        self.dias = 0
+        self.suma_aguda = 0.0
+        self.suma_cronica = 0.0
+        self.ewma_aguda = 0.0
+        self.ewma_cronica = 0.0
+
+    def add(self, dia: pd.Timestamp, ua: float) -> bool:
+        """Suma 'ua' al día indicado. Devuelve False si el día es anterior al último registrado."""
+        if self.ultimo_dia is None:
+            self.primer_dia = self.ultimo_dia = dia
+            self.dias = 1
+        elif dia < self.ultimo_dia:
+            return False
+        elif dia > self.ultimo_dia:
+            self._advance(dia)
+
+        self.buffer[self.pos] += ua
+        self.suma_aguda += ua
+        self.suma_cronica += ua
+        # EWMA (adjust=False): el primer día arranca en x0; después cada UA pesa λ
+        self.ewma_aguda += ua if self.dias == 1 else LAMBDA_AGUDA * ua
+        self.ewma_cronica += ua if self.dias == 1 else LAMBDA_CRONICA * ua
+        return True
+
+    def _advance(self, dia: pd.Timestamp) -> None:
+        """Avanza el calendario hasta 'dia' con días de carga 0."""
+        gap = (dia - self.ultimo_dia).days
+        for _ in range(min(gap, VENTANA_CRONICA)):
+            self.pos = (self.pos + 1) % VENTANA_CRONICA
+            self.suma_aguda -= self.buffer[(self.pos - VENTANA_AGUDA) % VENTANA_CRONICA]
+            self.suma_cronica -= self.buffer[self.pos]
+            self.buffer[self.pos] = 0.0
+        self.ewma_aguda *= (1 - LAMBDA_AGUDA) ** gap
+        self.ewma_cronica *= (1 - LAMBDA_CRONICA) ** gap
+        self.dias += gap
+        self.ultimo_dia = dia
+
+    def at(self, dia: pd.Timestamp | None = None) -> dict:
+        """Métricas a fecha 'dia' (por defecto, el último día registrado) sin modificar el estado."""
+        estado = self
+        if dia is not None and dia > self.ultimo_dia:
+            estado = copy.copy(self)
+            estado.buffer = self.buffer.copy()
+            estado._advance(dia)
+
+        acute7 = estado.suma_aguda / min(estado.dias, VENTANA_AGUDA)
+        chronic28 = estado.suma_cronica / min(estado.dias, VENTANA_CRONICA)
+        suficiente = estado.dias >= MIN_DIAS_ACWR
+        return {
+            "ultimo_registro": self.ultimo_dia,
+            "dias": estado.dias,
+            "carga_aguda": estado.suma_aguda,
+            "acute7": acute7,
+            "chronic28": chronic28,
+            "acwr": acute7 / chronic28 if suficiente and chronic28 > 0 else np.nan,
+            "ewma_aguda": estado.ewma_aguda,
+            "ewma_cronica": estado.ewma_cronica,
+            "acwr_ewma": (
+                estado.ewma_aguda / estado.ewma_cronica if suficiente and estado.ewma_cronica > 0 else np.nan
+            ),
+        }
+
+def _daily_totals(df: pd.DataFrame) -> pd.Series:
+    """UA diaria (suma de turnos; 0 en registros sin UA) indexada por (id_jugadora, fecha_sesion)."""
+    if df is None or df.empty or not {"id_jugadora", "fecha_sesion"}.issubset(df.columns):
+        vacio = pd.MultiIndex.from_arrays([[], []], names=["id_jugadora", "fecha_sesion"])
+        return pd.Series(index=vacio, dtype="float64")
+    datos = pd.DataFrame({
+        "id_jugadora": df["id_jugadora"].astype(str),
+        "fecha_sesion": pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.normalize(),
+        "ua": pd.to_numeric(df.get("ua", np.nan), errors="coerce").astype("float64"),
+    }).dropna(subset=["fecha_sesion"])
+    return datos.groupby(["id_jugadora", "fecha_sesion"])["ua"].sum().sort_index()
+
+def _build_players(df: pd.DataFrame) -> dict[str, PlayerLoadState]:
+    players: dict[str, PlayerLoadState] = {}
+    for (id_jugadora, dia), ua in _daily_totals(df).items():
+        players.setdefault(id_jugadora, PlayerLoadState()).add(dia, float(ua))
+    return players
+
+class LoadStateStore:
+    """
+    Estado de carga de todas las jugadoras de un ámbito, sincronizado con la
+    versión de la caché de wellness (src.wellness_cache).
+
+    - Los guardados de la app lo actualizan en O(1) por jugadora (apply_write).
+    - Las ediciones de días pasados y los borrados reconstruyen solo a esa jugadora.
+    - Si la caché cambió por otra vía (sincronización con la BD), la siguiente
+      lectura lo reconstruye entero.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.players: dict[str, PlayerLoadState] = {}
+        self.version = None
+
+    def apply_write(self, antes: pd.DataFrame, despues: pd.DataFrame | None, version_previa: int,
+                    version_nueva: int, df_actual: pd.DataFrame, borrado: bool = False) -> None:
+        """
+        Aplica un guardado o borrado ya hecho en la caché.
+
+        antes / despues: filas afectadas antes y después de la escritura (despues=None al borrar).
+        df_actual: contenido de la caché tras la escritura, para las reconstrucciones.
+        """
+        with self.lock:
+            if self.version != version_previa:
+                # El estado ya no corresponde a la caché: se reconstruirá al leer
+                self.version = None
+                return
+
+            delta = _daily_totals(despues).sub(_daily_totals(antes), fill_value=0)
+            reconstruir = set(_daily_totals(antes).index.get_level_values(0)) if borrado else set()
+
+            for (id_jugadora, dia), ua in delta.items():
+                if id_jugadora in reconstruir:
+                    continue
+                estado = self.players.get(id_jugadora)
+                if estado is None:
+                    estado = self.players[id_jugadora] = PlayerLoadState()
+                if dia < (estado.ultimo_dia or dia):
+                    # Día pasado: solo cambia algo si varía la UA o adelanta el primer registro
+                    if ua != 0 or dia < estado.primer_dia:
+                        reconstruir.add(id_jugadora)
+                    continue
+                estado.add(dia, float(ua))
+
+            if reconstruir:
+                historial = df_actual[df_actual["id_jugadora"].astype(str).isin(reconstruir)] if not df_actual.empty else df_actual
+                nuevos = _build_players(historial)
+                for id_jugadora in reconstruir:
+                    if id_jugadora in nuevos:
+                        self.players[id_jugadora] = nuevos[id_jugadora]
+                    else:
+                        self.players.pop(id_jugadora, None)
+
+            self.version = version_nueva
+
+    def snapshot(self, cache, dia: datetime.date | None = None) -> pd.DataFrame:
+        """
+        ACWR actual de toda la plantilla a fecha 'dia' (por defecto hoy), una fila por jugadora.
+        Solo se recorre el historial si el estado quedó desfasado respecto a la caché.
+        """
+        with cache.lock:
+            df, version = cache.df, cache.version
+        dia = pd.Timestamp(dia or datetime.date.today())
+
+        with self.lock:
+            if self.version != version:
+                self.players = _build_players(df)
+                self.version = version
+            filas = [
+                {"id_jugadora": id_jugadora, **estado.at(max(dia, estado.ultimo_dia))}
+                for id_jugadora, estado in self.players.items()
+            ]
+        return pd.DataFrame(filas, columns=COLUMNAS_ESTADO)
+
+@st.cache_resource
+def get_load_state(scope: str = "general") -> LoadStateStore:
+    """Instancia única por proceso y ámbito de datos, paralela a get_wellness_cache(scope)."""
+    return LoadStateStore()
@@ -0,0 +1,65 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from src.i18n.i18n import t
+from src.db_records import load_jugadoras_db, load_competiciones_db, get_records_wellness_db
+
+@dataclass
+class PageData:
+    """Datos de referencia de una página cargados en paralelo, con el tiempo de cada consulta (ms)."""
+    jugadoras: pd.DataFrame | None = None
+    competiciones: pd.DataFrame | None = None
+    wellness: pd.DataFrame | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+
+def _timed(ctx, loader):
+    """Ejecuta un cargador en un hilo del pool con el contexto de Streamlit de la sesión."""
+    add_script_run_ctx(threading.current_thread(), ctx)
+    start = time.perf_counter()
+    result = loader()
+    return result, round(1000 * (time.perf_counter() - start), 1)
+
+def load_page_data(jugadoras: bool = True, competiciones: bool = True, wellness: bool = True) -> PageData:
+    """
+    Lanza a la vez las consultas de inicio de página (jugadoras, competiciones y
+    registros de wellness), cada una con su propia conexión del pool, y devuelve
+    un único PageData cuando terminan todas.
+
+    Los cargadores mantienen su comportamiento (caché, st.error / st.stop): el
+    hilo hereda el contexto de la sesión y las excepciones se relanzan aquí.
+    """
+    loaders = {}
+    if jugadoras:
+        loaders["jugadoras"] = load_jugadoras_db
+    if competiciones:
+        loaders["competiciones"] = load_competiciones_db
+    if wellness:
+        loaders["wellness"] = get_records_wellness_db
+
+    data = PageData()
+    if not loaders:
+        return data
+
+    ctx = get_script_run_ctx()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="page_data") as executor:
+        futures = {name: executor.submit(_timed, ctx, loader) for name, loader in loaders.items()}
+        for name, future in futures.items():
+            result, elapsed = future.result()
+            setattr(data, name, result)
+            data.timings[name] = elapsed
+    data.timings["total"] = round(1000 * (time.perf_counter() - start), 1)
+    return data
+
+def show_page_timings(data: PageData) -> None:
+    """Muestra los tiempos de carga por consulta (solo rol developer)."""
+    if st.session_state["auth"]["rol"].lower() != "developer":
+        return
+    detalle = " · ".join(f"{name}: {ms} ms" for name, ms in data.timings.items())
+    st.caption(f":material/timer: {t('Tiempos de carga')} — {detalle}")
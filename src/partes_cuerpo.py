@@ -0,0 +1,99 @@
+import json
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_PARTES = ["wellness_id", "id_jugadora", "fecha_sesion", "zona"]
+
+def decode_partes(valores: pd.Series) -> pd.Series:
+    """
+    Decodifica la columna JSON 'partes_cuerpo_dolor' completa de una sola vez.
+
+    Une todos los arrays en un único documento JSON ("[[...],[...],...]") y lo
+    parsea con una sola llamada a json.loads. Valores nulos, vacíos o que no sean
+    arrays se tratan como lista vacía. Si algún valor está corrupto, se recurre
+    a la decodificación fila a fila solo para ese caso.
+    """
+    if valores.empty:
+        return pd.Series([], index=valores.index, dtype=object)
+
+    texto = valores.astype("string").str.strip()
+    texto = texto.where(texto.str.startswith("[", na=False), "[]").fillna("[]")
+
+    try:
+        listas = json.loads("[" + ",".join(texto.tolist()) + "]")
+    except json.JSONDecodeError:
+        listas = [decode_parte(v) for v in texto.tolist()]
+
+    return pd.Series(listas, index=valores.index, dtype=object)
+
+def decode_parte(valor) -> list:
+    """Decodifica un único valor de 'partes_cuerpo_dolor' (lista vacía si no es válido)."""
+    if isinstance(valor, list):
+        return valor
+    if not isinstance(valor, str) or not valor.strip().startswith("["):
+        return []
+    try:
+        return json.loads(valor)
+    except json.JSONDecodeError:
+        return []
+
+def build_partes_long(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabla en formato largo con una fila por (registro, zona con dolor):
+    wellness_id, id_jugadora, fecha_sesion, zona (category).
+
+    Se construye con explode sobre la columna ya decodificada, sin bucles por fila.
+    """
+    if df is None or df.empty or "partes_cuerpo_dolor" not in df.columns:
+        return pd.DataFrame(columns=COLUMNAS_PARTES)
+
+    long_df = (
+        df[["id", "id_jugadora", "fecha_sesion", "partes_cuerpo_dolor"]]
+        .rename(columns={"id": "wellness_id", "partes_cuerpo_dolor": "zona"})
+        .explode("zona", ignore_index=True)
+        .dropna(subset=["zona"])
+    )
+    long_df["zona"] = long_df["zona"].astype(str).str.strip().astype("category")
+    return long_df[COLUMNAS_PARTES].reset_index(drop=True)
+
+def build_zona_index(long_df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Índice zona → ids de wellness (array ordenado) a partir de la tabla larga."""
+    if long_df is None or long_df.empty:
+        return {}
+    grupos = long_df.groupby("zona", observed=True)["wellness_id"]
+    return {zona: np.sort(ids.to_numpy()) for zona, ids in grupos}
+
+@dataclass(frozen=True)
+class ZonaIndex:
+    """
+    Tabla larga de zonas con dolor y su índice zona → ids de wellness, construidos una
+    vez por versión de datos (ver WellnessCache.zonas) y compartidos por todos los renders.
+    """
+    partes: pd.DataFrame           # build_partes_long
+    por_zona: dict[str, np.ndarray]  # build_zona_index
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "ZonaIndex":
+        partes = build_partes_long(df)
+        return cls(partes=partes, por_zona=build_zona_index(partes))
+
+    def restringir(self, ids) -> pd.DataFrame:
+        """Filas de la tabla larga de los registros 'ids' (p. ej. los del frame filtrado)."""
+        return self.partes[self.partes["wellness_id"].isin(ids)]
+
+    def ids_zona(self, zona: str) -> np.ndarray:
+        """Ids de wellness (ordenados) que reportan dolor en la zona."""
+        return self.por_zona.get(zona, np.array([], dtype=int))
+
+def resumen_por_zona(long_df: pd.DataFrame) -> pd.DataFrame:
+    """Número de reportes y de jugadoras distintas por zona, de mayor a menor."""
+    if long_df is None or long_df.empty:
+        return pd.DataFrame(columns=["zona", "reportes", "jugadoras"])
+    return (
+        long_df.groupby("zona", observed=True)
+        .agg(reportes=("wellness_id", "size"), jugadoras=("id_jugadora", "nunique"))
+        .reset_index()
+        .sort_values("reportes", ascending=False, ignore_index=True)
+    )
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.db_records import get_records_wellness_db, get_synced_data_version
+
+W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
+
+# Variables en las que un valor alto es peor (escala invertida, ver src.styles)
+W_INVERTIDAS = ["stress", "dolor"]
+
+# Línea base: 28 días naturales anteriores al día (sin incluirlo)
+VENTANA_BASE = "28D"
+# Registros mínimos en la ventana para considerar válida la línea base
+MIN_REGISTROS_BASE = 7
+# Cambio mínimo relevante (smallest worthwhile change) = 0.2 × SD de la línea base
+SWC_FACTOR = 0.2
+
+def compute_wellness_baselines(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Z-scores de bienestar respecto a la línea base personal de cada jugadora.
+
+    Devuelve una fila por jugadora y día con registro de wellness:
+        <var>: valor del día (media de turnos).
+        media_<var> / sd_<var>: media y SD de los 28 días anteriores (mín. MIN_REGISTROS_BASE registros).
+        z_<var>: (valor - media) / SD.
+        swc_<var>: True si el cambio supera el SWC (0.2 × SD) en la dirección desfavorable
+            (bajada en recuperación, energía y sueño; subida en estrés y dolor).
+        alertas_swc: número de variables con swc_<var> activo.
+
+    Se calcula en una sola pasada agrupada (groupby + rolling temporal) sobre todo el frame.
+    """
+    columnas = ["id_jugadora", "fecha_sesion"] + W_COLS
+    if df is None or df.empty or not set(columnas).issubset(df.columns):
+        return pd.DataFrame(columns=columnas)
+
+    datos = df[columnas].copy()
+    datos["id_jugadora"] = datos["id_jugadora"].astype(str)
+    datos["fecha_sesion"] = pd.to_datetime(datos["fecha_sesion"], errors="coerce").dt.normalize()
+    for c in W_COLS:
+        datos[c] = pd.to_numeric(datos[c], errors="coerce").astype("float64")
+    datos = datos.dropna(subset=["fecha_sesion"]).dropna(subset=W_COLS, how="all")
+    if datos.empty:
+        return pd.DataFrame(columns=columnas)
+
+    diario = datos.groupby(["id_jugadora", "fecha_sesion"])[W_COLS].mean().sort_index()
+
+    # Ventana temporal de 28 días por jugadora, excluyendo el día evaluado
+    ventana = (
+        diario.reset_index("id_jugadora")
+        .groupby("id_jugadora")[W_COLS]
+        .rolling(VENTANA_BASE, closed="left", min_periods=MIN_REGISTROS_BASE)
+    )
+    media = ventana.mean().reindex(diario.index)
+    sd = ventana.std().reindex(diario.index)
+
+    out = diario.copy()
+    desviacion = diario - media
+    signo = pd.Series(1.0, index=W_COLS)
+    signo[W_INVERTIDAS] = -1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = desviacion / sd.where(sd > 0)
+    # Cambio "desfavorable" en unidades de la escala: positivo = peor
+    empeora = desviacion.mul(-signo, axis=1)
+    swc = empeora.gt(SWC_FACTOR * sd) & sd.gt(0)
+
+    for c in W_COLS:
+        out[f"media_{c}"] = media[c]
+        out[f"sd_{c}"] = sd[c]
+        out[f"z_{c}"] = z[c]
+        out[f"swc_{c}"] = swc[c]
+    out["alertas_swc"] = swc.sum(axis=1).astype("int8")
+    return out.reset_index()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _baselines_cached(scope: str, data_version: int) -> pd.DataFrame:
+    return compute_wellness_baselines(get_records_wellness_db())
+
+def get_wellness_baselines() -> pd.DataFrame:
+    """
+    Líneas base y z-scores de todas las jugadoras del ámbito del rol, calculados
+    sobre el historial completo y cacheados por versión de datos (leída tras
+    sincronizar la caché, la misma que carga _baselines_cached).
+    """
+    scope, data_version = get_synced_data_version()
+    return _baselines_cached(scope, data_version)
+
+def ultimo_dia_baselines(baselines: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Última fila de cada jugadora dentro del rango [start, end] (ambos opcionales)."""
+    if baselines.empty:
+        return baselines
+    mask = pd.Series(True, index=baselines.index)
+    if start is not None:
+        mask &= baselines["fecha_sesion"] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= baselines["fecha_sesion"] <= pd.Timestamp(end)
+    return baselines[mask].sort_values("fecha_sesion").groupby("id_jugadora", as_index=False).tail(1)
@@ -0,0 +1,59 @@
+import pandas as pd
+
+COLUMNAS_CALENDARIO = ["anio", "semana", "inicio_semana", "fin_semana", "rango_semana", "mes", "md"]
+
+def build_calendar(fechas: pd.Series, periodizacion: pd.Series | None = None) -> pd.DataFrame:
+    """
+    Dimensión calendario: una fila por día distinto de 'fechas', indexada por el día (medianoche).
+
+    Columnas:
+        anio / semana: año y semana ISO (el año ISO mantiene juntas las semanas que cruzan enero).
+        inicio_semana / fin_semana: lunes y domingo de la semana.
+        rango_semana: etiqueta "dd Mmm–dd Mmm" de la semana.
+        mes: mes natural.
+        md: periodización táctica más frecuente del día (MD-n / MD+n), si se pasa 'periodizacion'.
+
+    Las columnas derivadas (incluido el strftime de la etiqueta) se calculan una vez por día,
+    no por registro.
+    """
+    fechas = pd.to_datetime(fechas, errors="coerce").dt.normalize()
+    dias = pd.DatetimeIndex(fechas.dropna().unique()).sort_values()
+    dias.name = "fecha_sesion"
+
+    iso = dias.isocalendar()
+    inicio = dias - pd.to_timedelta(dias.weekday, unit="d")
+    fin = inicio + pd.Timedelta(days=6)
+    calendario = pd.DataFrame({
+        "anio": iso["year"].to_numpy(),
+        "semana": iso["week"].to_numpy(),
+        "inicio_semana": inicio,
+        "fin_semana": fin,
+        "rango_semana": inicio.strftime("%d %b") + "–" + fin.strftime("%d %b"),
+        "mes": dias.month,
+        "md": pd.NA,
+    }, index=dias)
+
+    if periodizacion is not None:
+        md = pd.DataFrame({"fecha_sesion": fechas, "md": periodizacion.astype("string")})
+        md = md[md["md"].fillna("").str.strip() != ""].dropna(subset=["fecha_sesion"])
+        if not md.empty:
+            moda = md.groupby(["fecha_sesion", "md"], observed=True).size().sort_values(ascending=False)
+            moda = moda.reset_index().drop_duplicates("fecha_sesion").set_index("fecha_sesion")["md"]
+            calendario["md"] = moda.reindex(dias)
+
+    return calendario[COLUMNAS_CALENDARIO]
+
+def join_calendar(df: pd.DataFrame, calendario: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Añade las columnas de la dimensión calendario a 'df' por la clave fecha_sesion (una sola copia).
+    Si no se pasa 'calendario' se construye a partir del propio frame.
+    """
+    fechas = pd.to_datetime(df["fecha_sesion"], errors="coerce")
+    if calendario is None:
+        calendario = build_calendar(fechas, df["periodizacion_tactica"] if "periodizacion_tactica" in df.columns else None)
+    filas = calendario.reindex(fechas.dt.normalize())
+    return df.assign(fecha_sesion=fechas, **{c: filas[c].to_numpy() for c in COLUMNAS_CALENDARIO})
+
+def has_calendar(df: pd.DataFrame) -> bool:
+    """True si el frame ya trae las columnas de join_calendar."""
+    return set(COLUMNAS_CALENDARIO).issubset(df.columns)
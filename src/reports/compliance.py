@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+COLUMNAS_ROSTER = ["id_jugadora", "nombre_jugadora", "posicion", "plantel"]
+CLAVE_SESION = ["id_jugadora", "fecha_sesion", "turno"]
+
+# Estado de cada jugadora en cada sesión
+ESTADO_COMPLETO = "completo"          # check-in y check-out
+ESTADO_SIN_CHECKOUT = "sin_checkout"  # solo check-in
+ESTADO_SIN_REGISTRO = "sin_registro"  # ningún registro
+
+def _roster(df_jugadoras: pd.DataFrame) -> pd.DataFrame:
+    roster = df_jugadoras[[c for c in COLUMNAS_ROSTER if c in df_jugadoras.columns]].drop_duplicates("id_jugadora")
+    return roster.assign(id_jugadora=roster["id_jugadora"].astype(str)).reset_index(drop=True)
+
+def compute_compliance_matrix(df: pd.DataFrame, df_jugadoras: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Matriz de cumplimiento jugadora × día × turno entre 'start' y 'end' (ambos opcionales, incluidos).
+
+    Las sesiones son los pares (fecha_sesion, turno) con al menos un registro en el rango;
+    el plantel (df_jugadoras) se cruza con todas ellas y se une con los registros, de modo que
+    cada jugadora tiene una fila por sesión aunque no haya registrado nada.
+
+    Columnas: las del plantel (id_jugadora, nombre_jugadora, posicion, plantel), fecha_sesion,
+    turno, checkin, checkout y estado. Un check-out implica el check-in (el checkout
+    sobrescribe al checkin en el modelo actual).
+    """
+    roster = _roster(df_jugadoras)
+    columnas = list(roster.columns) + ["fecha_sesion", "turno", "checkin", "checkout", "estado"]
+    if df is None or df.empty or roster.empty or not {"id_jugadora", "fecha_sesion", "tipo"}.issubset(df.columns):
+        return pd.DataFrame(columns=columnas)
+
+    datos = pd.DataFrame({
+        "id_jugadora": df["id_jugadora"].astype(str),
+        "fecha_sesion": pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.normalize(),
+        "turno": df["turno"].astype(str) if "turno" in df.columns else "",
+        "tipo": df["tipo"].astype(str).str.lower(),
+    }).dropna(subset=["fecha_sesion"])
+    if start is not None:
+        datos = datos[datos["fecha_sesion"] >= pd.Timestamp(start)]
+    if end is not None:
+        datos = datos[datos["fecha_sesion"] <= pd.Timestamp(end)]
+    if datos.empty:
+        return pd.DataFrame(columns=columnas)
+
+    sesiones = datos[["fecha_sesion", "turno"]].drop_duplicates().sort_values(["fecha_sesion", "turno"])
+    registros = (
+        datos.assign(checkin=datos["tipo"] == "checkin", checkout=datos["tipo"] == "checkout")
+        .groupby(CLAVE_SESION, as_index=False, observed=True)[["checkin", "checkout"]].any()
+    )
+
+    matriz = roster.merge(sesiones, how="cross").merge(registros, on=CLAVE_SESION, how="left")
+    matriz["checkout"] = matriz["checkout"].fillna(False).astype(bool)
+    matriz["checkin"] = matriz["checkin"].fillna(False).astype(bool) | matriz["checkout"]
+    matriz["estado"] = np.select(
+        [matriz["checkout"], matriz["checkin"]],
+        [ESTADO_COMPLETO, ESTADO_SIN_CHECKOUT],
+        default=ESTADO_SIN_REGISTRO,
+    )
+    return matriz[columnas]
+
+def pendientes_desde_matriz(matriz: pd.DataFrame, df_jugadoras: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Jugadoras del plantel sin check-in y sin check-out en todo el rango de la matriz
+    (anti-join por conjuntos: una jugadora está pendiente si no tiene ninguna sesión con ese registro).
+    """
+    roster = _roster(df_jugadoras)
+    hechos = (
+        matriz.groupby("id_jugadora", observed=True)[["checkin", "checkout"]].any()
+        .reindex(roster["id_jugadora"], fill_value=False)
+    )
+    sin_checkin = roster[~hechos["checkin"].to_numpy()]
+    sin_checkout = roster[~hechos["checkout"].to_numpy()]
+    return sin_checkin, sin_checkout
+
+def adherencia_por_jugadora(matriz: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adherencia de cada jugadora sobre las sesiones de la matriz:
+    sesiones, check-ins, check-outs y porcentajes (0–100).
+    """
+    columnas = ["id_jugadora", "nombre_jugadora", "sesiones", "checkins", "checkouts", "pct_checkin", "pct_checkout"]
+    if matriz.empty:
+        return pd.DataFrame(columns=columnas)
+
+    claves = [c for c in ["id_jugadora", "nombre_jugadora"] if c in matriz.columns]
+    out = matriz.groupby(claves, as_index=False, observed=True).agg(
+        sesiones=("estado", "size"),
+        checkins=("checkin", "sum"),
+        checkouts=("checkout", "sum"),
+    )
+    out["pct_checkin"] = (100 * out["checkins"] / out["sesiones"]).round(1)
+    out["pct_checkout"] = (100 * out["checkouts"] / out["sesiones"]).round(1)
+    return out.sort_values(["pct_checkout", "pct_checkin"]).reset_index(drop=True)[[c for c in columnas if c in out.columns]]
+
+def adherencia_diaria(matriz: pd.DataFrame) -> pd.DataFrame:
+    """Porcentaje de la plantilla con check-in y con check-out en cada sesión (fecha_sesion, turno)."""
+    if matriz.empty:
+        return pd.DataFrame(columns=["fecha_sesion", "turno", "pct_checkin", "pct_checkout"])
+    out = matriz.groupby(["fecha_sesion", "turno"], as_index=False, observed=True)[["checkin", "checkout"]].mean()
+    out["pct_checkin"] = (100 * out.pop("checkin")).round(1)
+    out["pct_checkout"] = (100 * out.pop("checkout")).round(1)
+    return out
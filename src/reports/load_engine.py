@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+# Ventanas en días naturales
+VENTANA_AGUDA = 7
+VENTANA_CRONICA = 28
+
+# Días de historial mínimos para informar ACWR (equivalente al antiguo min_periods=7)
+MIN_DIAS_ACWR = 7
+
+# Constantes de decaimiento EWMA: λ = 2 / (N + 1)
+LAMBDA_AGUDA = 2 / (VENTANA_AGUDA + 1)
+LAMBDA_CRONICA = 2 / (VENTANA_CRONICA + 1)
+
+COLUMNAS_VENTANAS = [
+    "id_jugadora", "fecha_sesion", "ua", "sesiones", "dias",
+    "carga_aguda", "acute7", "chronic28", "acwr",
+    "ewma_aguda", "ewma_cronica", "acwr_ewma",
+    "monotonia", "strain",
+]
+
+def _daily_calendar(df: pd.DataFrame, end=None) -> pd.DataFrame:
+    """
+    UA diaria por jugadora sobre un calendario continuo: desde su primer registro
+    hasta 'end' (o el último día del frame), con 0 UA en los días sin sesión.
+    Varios turnos del mismo día se suman.
+    """
+    datos = df[["id_jugadora", "fecha_sesion", "ua"]].copy()
+    datos["fecha_sesion"] = pd.to_datetime(datos["fecha_sesion"], errors="coerce").dt.normalize()
+    datos["ua"] = pd.to_numeric(datos["ua"], errors="coerce").astype("float64")
+    datos = datos.dropna(subset=["fecha_sesion"])
+    if datos.empty:
+        return pd.DataFrame(columns=["id_jugadora", "fecha_sesion", "ua", "sesiones"])
+
+    diario = (
+        datos.groupby(["id_jugadora", "fecha_sesion"], observed=True)["ua"]
+        .agg(ua="sum", sesiones="count")
+    )
+    fin = pd.Timestamp(end).normalize() if end is not None else datos["fecha_sesion"].max()
+
+    inicios = diario.reset_index().groupby("id_jugadora", observed=True)["fecha_sesion"].min()
+    inicios = inicios[inicios <= fin]
+
+    # Calendario jugadora × día sin bucles: cada jugadora repetida tantos días como
+    # tiene su tramo y el día como inicio + desplazamiento dentro del tramo
+    dias = ((fin - inicios).dt.days + 1).to_numpy()
+    desplazamiento = np.arange(dias.sum()) - np.repeat(np.cumsum(dias) - dias, dias)
+    calendario = pd.MultiIndex.from_arrays(
+        [
+            np.repeat(inicios.index.to_numpy(), dias),
+            np.repeat(inicios.to_numpy(), dias) + desplazamiento.astype("timedelta64[D]"),
+        ],
+        names=["id_jugadora", "fecha_sesion"],
+    )
+    return diario.reindex(calendario, fill_value=0).reset_index()
+
+def _window_sum(cum: np.ndarray, pos: np.ndarray, inicio: np.ndarray, ventana: int) -> np.ndarray:
+    """Suma móvil de 'ventana' días con sumas acumuladas: cum[i + 1] - cum[max(i + 1 - ventana, inicio)]."""
+    return cum[pos + 1] - cum[np.maximum(pos + 1 - ventana, inicio)]
+
+def _ewma(valores: np.ndarray, grupo: np.ndarray, lam: float) -> np.ndarray:
+    """EWMA (adjust=False) que se reinicia con el primer día de cada jugadora."""
+    serie = pd.Series(valores)
+    return serie.groupby(grupo, sort=False).ewm(alpha=lam, adjust=False).mean().to_numpy()
+
+def compute_load_windows(df: pd.DataFrame, end=None) -> pd.DataFrame:
+    """
+    Motor de ventanas de carga compartido por los gráficos y el semáforo de riesgo.
+
+    Devuelve una fila por jugadora y día natural con:
+        ua / sesiones: carga diaria (suma de turnos) y número de sesiones.
+        dias: días transcurridos desde el primer registro de la jugadora.
+        carga_aguda: suma de UA de los últimos 7 días.
+        acute7 / chronic28: carga media diaria de los últimos 7 / 28 días
+            (con menos historial se divide por los días transcurridos).
+        acwr: acute7 / chronic28, desde MIN_DIAS_ACWR días de historial.
+        ewma_aguda / ewma_cronica / acwr_ewma: variante EWMA (λ = 2/(N+1)).
+        monotonia: media / desviación típica de la carga diaria en 7 días (Foster).
+        strain: carga_aguda × monotonía.
+
+    Las ventanas se calculan con sumas acumuladas (O(n)) sobre el calendario continuo,
+    de modo que los días sin sesión cuentan como 0 y dos turnos no ocupan dos "días".
+    """
+    if df is None or df.empty or "ua" not in df.columns:
+        return pd.DataFrame(columns=COLUMNAS_VENTANAS)
+
+    out = _daily_calendar(df, end)
+    if out.empty:
+        return pd.DataFrame(columns=COLUMNAS_VENTANAS)
+
+    ua = out["ua"].to_numpy(dtype="float64")
+    pos = np.arange(len(ua))
+    nuevo_grupo = np.r_[True, out["id_jugadora"].to_numpy()[1:] != out["id_jugadora"].to_numpy()[:-1]]
+    inicio = np.maximum.accumulate(np.where(nuevo_grupo, pos, 0))
+    dias = pos - inicio + 1
+
+    cum = np.r_[0.0, np.cumsum(ua)]
+    cum_sq = np.r_[0.0, np.cumsum(ua ** 2)]
+
+    carga_aguda = _window_sum(cum, pos, inicio, VENTANA_AGUDA)
+    carga_cronica = _window_sum(cum, pos, inicio, VENTANA_CRONICA)
+    n_aguda = np.minimum(dias, VENTANA_AGUDA)
+    acute7 = carga_aguda / n_aguda
+    chronic28 = carga_cronica / np.minimum(dias, VENTANA_CRONICA)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acwr = np.where((dias >= MIN_DIAS_ACWR) & (chronic28 > 0), acute7 / chronic28, np.nan)
+
+        # Varianza de 7 días: (n·Σx² - (Σx)²) / n², exacta con UA enteras
+        suma_sq = _window_sum(cum_sq, pos, inicio, VENTANA_AGUDA)
+        varianza = np.clip(n_aguda * suma_sq - carga_aguda ** 2, 0, None) / n_aguda ** 2
+        std = np.sqrt(varianza)
+        monotonia = np.where((dias >= VENTANA_AGUDA) & (std > 0), acute7 / std, np.nan)
+
+        grupo = np.cumsum(nuevo_grupo)
+        ewma_aguda = _ewma(ua, grupo, LAMBDA_AGUDA)
+        ewma_cronica = _ewma(ua, grupo, LAMBDA_CRONICA)
+        acwr_ewma = np.where((dias >= MIN_DIAS_ACWR) & (ewma_cronica > 0), ewma_aguda / ewma_cronica, np.nan)
+
+    out["dias"] = dias
+    out["carga_aguda"] = carga_aguda
+    out["acute7"] = acute7
+    out["chronic28"] = chronic28
+    out["acwr"] = acwr
+    out["ewma_aguda"] = ewma_aguda
+    out["ewma_cronica"] = ewma_cronica
+    out["acwr_ewma"] = acwr_ewma
+    out["monotonia"] = monotonia
+    out["strain"] = carga_aguda * monotonia
+    return out[COLUMNAS_VENTANAS]
+
+def ultimo_valor(ventanas: pd.DataFrame, columna: str = "acwr") -> float:
+    """Último valor disponible (no nulo) de una columna de compute_load_windows."""
+    if ventanas is None or ventanas.empty or columna not in ventanas.columns:
+        return np.nan
+    valores = ventanas[columna].dropna()
+    return float(valores.iloc[-1]) if not valores.empty else np.nan
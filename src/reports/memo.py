@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import streamlit as st
+
+# Entradas máximas del memo de métricas (jugadora × rango × turno × versión de datos)
+METRICS_MEMO_SIZE = 64
+# Instantáneas de periodo de la portada (ámbito × versión de datos × día)
+PERIOD_MEMO_SIZE = 8
+
+class LRUMemo:
+    """
+    Memo acotado con expulsión LRU y contadores de aciertos / fallos.
+
+    La clave debe incluir la versión de datos (src.wellness_cache.get_data_version):
+    tras un guardado las claves nuevas no coinciden y las antiguas acaban expulsadas.
+    Los valores se comparten entre sesiones y deben tratarse como de solo lectura.
+    """
+
+    def __init__(self, maxsize: int = METRICS_MEMO_SIZE):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # El cálculo se hace fuera del lock para no bloquear a otras sesiones
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+@st.cache_resource
+def get_metrics_memo() -> LRUMemo:
+    """Memo de métricas individuales, único por proceso y compartido entre sesiones."""
+    return LRUMemo(METRICS_MEMO_SIZE)
+
+@st.cache_resource
+def get_period_memo() -> LRUMemo:
+    """Memo de instantáneas de periodo de la portada, único por proceso."""
+    return LRUMemo(PERIOD_MEMO_SIZE)
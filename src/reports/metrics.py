@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date
 
 import numpy as np
 import pandas as pd
 from typing import Optional
 import streamlit as st
 
+from .load_engine import VENTANA_AGUDA, VENTANA_CRONICA, MIN_DIAS_ACWR
+
 @dataclass
 class RPEFilters:
     jugadores: Optional[list[str]] = None
@@ -15,6 +17,65 @@ class RPEFilters:
     start: Optional[date] = None
     end: Optional[date] = None
 
+class RPEIndex:
+    """
+    Wellness frame sorted by a (id_jugadora, fecha_sesion) MultiIndex, built once
+    (O(n log n)) and reused for many filtered selections.
+
+    Each player's date range is located with MultiIndex.slice_locs (binary search),
+    so a selection costs O(log n + k) instead of a full-frame boolean mask.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        keys = [
+            df["id_jugadora"].astype(str).rename("_jugadora"),
+            pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.normalize().rename("_fecha"),
+        ]
+        self.frame = df.set_index(keys).sort_index()
+        self.jugadoras = self.frame.index.get_level_values("_jugadora").unique()
+
+    def select(self, flt: RPEFilters) -> pd.DataFrame:
+        index = self.frame.index
+        jugadoras = [str(j) for j in flt.jugadores] if flt.jugadores else self.jugadoras
+        start = pd.Timestamp(flt.start) if flt.start else None
+        end = pd.Timestamp(flt.end) if flt.end else None
+
+        ranges = []
+        for jugadora in jugadoras:
+            lo, hi = index.slice_locs(
+                (jugadora,) if start is None else (jugadora, start),
+                (jugadora,) if end is None else (jugadora, end),
+            )
+            if hi > lo:
+                ranges.append((lo, hi))
+
+        if len(ranges) == 1:
+            out = self.frame.iloc[ranges[0][0]:ranges[0][1]]  # single contiguous range: plain slice, no take
+        elif ranges:
+            out = self.frame.iloc[np.concatenate([np.arange(lo, hi) for lo, hi in ranges])]
+        else:
+            out = self.frame.iloc[0:0]
+        if flt.turnos:
+            out = out[out["turno"].isin(flt.turnos)]
+        return out.reset_index(drop=True)
+
+def _apply_filters(data: pd.DataFrame | RPEIndex, flt: Optional[RPEFilters]) -> pd.DataFrame:
+    """
+    Filter stage for RPEFilters (players, turnos, start/end inclusive).
+    Pass an RPEIndex to reuse its sorted index across calls; a plain DataFrame is
+    indexed on the fly.
+    """
+    if isinstance(data, RPEIndex):
+        if flt is None or not (flt.jugadores or flt.turnos or flt.start or flt.end):
+            return data.frame.reset_index(drop=True)
+        return data.select(flt)
+
+    if data is None or data.empty or flt is None or not (flt.jugadores or flt.turnos or flt.start or flt.end):
+        return data
+    if not {"id_jugadora", "fecha_sesion"}.issubset(data.columns):
+        return data
+    return RPEIndex(data).select(flt)
+
 def _prepare_checkout_df(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame()
@@ -22,9 +83,9 @@ def _prepare_checkout_df(df: pd.DataFrame) -> pd.DataFrame:
     # Keep only checkOut with UA available
     if "tipo" in out.columns:
         out = out[out["tipo"] == "checkOut"]
-    # Ensure UA numeric
+    # Ensure UA numeric (float64: the nullable Int32 from the schema would yield pd.NA scalars)
     if "ua" in out.columns:
-        out["ua"] = pd.to_numeric(out["ua"], errors="coerce")
+        out["ua"] = pd.to_numeric(out["ua"], errors="coerce").astype("float64")
     else:
         out["ua"] = np.nan
     # Ensure fecha_dia exists
@@ -45,6 +106,7 @@ def _daily_loads(df: pd.DataFrame) -> pd.DataFrame:
         df["ua"] = 0
     if "minutos_sesion" not in df.columns:
         df["minutos_sesion"] = 0
+    df["minutos_sesion"] = pd.to_numeric(df["minutos_sesion"], errors="coerce").astype("float64")
 
     # --- agrupar ---
     grp = (
@@ -56,28 +118,16 @@ def _daily_loads(df: pd.DataFrame) -> pd.DataFrame:
 
     return grp
 
-def _current_week_range(end_day: date) -> tuple[date, date]:
-    # Monday to Sunday containing end_day
-    weekday = end_day.weekday()  # Monday=0
-    start = end_day - timedelta(days=weekday)
-    end = start + timedelta(days=6)
-    return start, end
-
-def _month_range(end_day: date) -> tuple[date, date]:
-    start = end_day.replace(day=1)
-    if start.month == 12:
-        next_month_start = start.replace(year=start.year + 1, month=1, day=1)
-    else:
-        next_month_start = start.replace(month=start.month + 1, day=1)
-    end = next_month_start - timedelta(days=1)
-    return start, end
+def compute_rpe_metrics(df_raw: pd.DataFrame | RPEIndex, flt: RPEFilters) -> dict:
+    """
+    Load metrics of the filtered selection on its reference day (flt.end, or the last
+    session). The selection is treated as a single series and evaluated with the same
+    engine as compute_rpe_metrics_history / compute_rpe_metrics_squad, so every page
+    reports the same values (and the same ACWR as src.reports.load_engine).
+    """
+    data = _apply_filters(df_raw, flt)
+    df = _prepare_checkout_df(data)
 
-def compute_rpe_metrics(df_raw: pd.DataFrame, flt: RPEFilters) -> dict:
-    df = _prepare_checkout_df(df_raw)
-    #st.dataframe(df)
-    
-    #df = _apply_filters(df, flt)
-    
     res: dict = {
         "ua_total_dia": None,
         "minutos_sesion": None,
@@ -98,57 +148,190 @@ def compute_rpe_metrics(df_raw: pd.DataFrame, flt: RPEFilters) -> dict:
         return res
 
     daily = _daily_loads(df)
-    
     res["daily_table"] = daily
 
-    # Determine reference end date
-    end_day = flt.end or daily["fecha_sesion"].max()
-
-    # Week metrics (use the week containing end_day)
-    week_start, week_end = _current_week_range(end_day)
-    daily_week = daily[(daily["fecha_sesion"] >= week_start) & (daily["fecha_sesion"] <= week_end)]
-    semana_sum = daily_week["ua_total"].sum() if not daily_week.empty else 0.0
-    semana_mean = daily_week["ua_total"].mean() if not daily_week.empty else 0.0
-    semana_std = daily_week["ua_total"].std(ddof=0) if len(daily_week) > 1 else 0.0
-    res["carga_semana"] = float(semana_sum)
-    res["carga_media_semana"] = float(semana_mean)
-    res["monotonia_semana"] = float(semana_mean / semana_std) if semana_std and semana_std > 0 else None
-    res["variabilidad_semana"] = float(semana_std) if semana_std is not None else None
-
-    # st.dataframe(daily)
-    # st.dataframe(daily_week)
-
-    # Day metric (exact end_day)
-    day_row = daily[daily["fecha_sesion"] == end_day]
-    #st.dataframe(day_row)
-    res["ua_total_dia"] = float(day_row["ua_total"].iloc[0]) if not day_row.empty else 0.0
-
-    # Month metrics (calendar month of end_day)
-    m_start, m_end = _month_range(end_day)
-    daily_month = daily[(daily["fecha_sesion"] >= m_start) & (daily["fecha_sesion"] <= m_end)]
-    mes_sum = daily_month["ua_total"].sum() if not daily_month.empty else 0.0
-    mes_mean = daily_month["ua_total"].mean() if not daily_month.empty else 0.0
-    res["carga_mes"] = float(mes_sum)
-    res["carga_media_mes"] = float(mes_mean)
-
-    # Acute/Chronic fatigue and derived indices
-    # Acute = sum last 7 days ending at end_day
-    last7_start = end_day - timedelta(days=6)
-    daily_last7 = daily[(daily["fecha_sesion"] >= last7_start) & (daily["fecha_sesion"] <= end_day)]
-    fatiga_aguda = daily_last7["ua_total"].sum() if not daily_last7.empty else 0.0
-    res["fatiga_aguda"] = float(fatiga_aguda)
-
-    # Chronic = average daily load over last 28 days
-    last28_start = end_day - timedelta(days=27)
-    daily_last28 = daily[(daily["fecha_sesion"] >= last28_start) & (daily["fecha_sesion"] <= end_day)]
-    fatiga_cronica = daily_last28["ua_total"].mean() if not daily_last28.empty else 0.0
-    res["fatiga_cronica"] = float(fatiga_cronica)
-
-    # Adaptation index (example): chronic - acute/7 (normalize acute per day)
-    res["adaptacion"] = float(fatiga_cronica - (fatiga_aguda / 7.0))
-
-    # ACWR (acute:chronic) using mean-per-day normalization
-    # Avoid divide-by-zero
-    res["acwr"] = float((fatiga_aguda / 7.0) / fatiga_cronica) if fatiga_cronica else None
-    res["minutos_sesion"] = float(day_row["minutos_total"].iloc[0]) if not day_row.empty else 0.0
+    # Determine reference end date (Timestamp, fecha_sesion is datetime64)
+    end_day = pd.Timestamp(flt.end or daily["fecha_sesion"].max()).normalize()
+
+    # The whole selection as one series, from its first record of any type
+    fechas = pd.to_datetime(data["fecha_sesion"], errors="coerce").dt.normalize()
+    first_day = pd.Series([fechas.min()], index=["_"])
+    serie = daily.set_index(pd.to_datetime(daily["fecha_sesion"]).dt.normalize())
+    metrics = _metric_matrices(serie[["ua_total"]].T.set_axis(["_"]), serie[["minutos_total"]].T.set_axis(["_"]),
+                               first_day, pd.DatetimeIndex([end_day]))
+    for name in SQUAD_METRIC_COLUMNS:
+        value = metrics[name][0, 0]
+        # Undefined ratios (no variability, not enough history) are reported as None
+        res[name] = float(value) if pd.notna(value) else None
     return res
+
+SQUAD_METRIC_COLUMNS = [
+    "ua_total_dia", "minutos_sesion", "carga_semana", "carga_mes",
+    "carga_media_semana", "carga_media_mes", "monotonia_semana",
+    "fatiga_aguda", "fatiga_cronica", "adaptacion", "acwr", "variabilidad_semana",
+]
+
+def _window_bounds(days: pd.DatetimeIndex) -> dict[str, tuple[pd.DatetimeIndex, pd.DatetimeIndex]]:
+    """
+    Start/end of every metric window for each reference day. All windows end on the
+    day itself (week- and month-to-date), so no value looks ahead.
+    """
+    week_start = days - pd.to_timedelta(days.weekday, unit="D")
+    month_start = days - pd.to_timedelta(days.day - 1, unit="D")
+    return {
+        "semana": (week_start, days),
+        "mes": (month_start, days),
+        "last7": (days - pd.Timedelta(days=VENTANA_AGUDA - 1), days),
+        "last28": (days - pd.Timedelta(days=VENTANA_CRONICA - 1), days),
+    }
+
+def _first_record_days(df_raw: pd.DataFrame) -> pd.Series:
+    """Each player's first record day of any type (as in load_engine._daily_calendar)."""
+    fechas = pd.to_datetime(df_raw["fecha_sesion"], errors="coerce").dt.normalize()
+    return fechas.groupby(df_raw["id_jugadora"], observed=True).min().dropna()
+
+def _daily_matrices(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Daily UA and minutes (sum of turnos) of a prepared checkout frame, players × session days."""
+    df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.normalize()
+    if "minutos_sesion" not in df.columns:
+        df["minutos_sesion"] = np.nan
+    df["minutos_sesion"] = pd.to_numeric(df["minutos_sesion"], errors="coerce").astype("float64")
+
+    daily = (
+        df.groupby(["id_jugadora", "fecha_sesion"], observed=True)[["ua", "minutos_sesion"]]
+        .sum(min_count=1)
+    )
+    return daily["ua"].unstack("fecha_sesion"), daily["minutos_sesion"].unstack("fecha_sesion")
+
+def _metric_matrices(ua: pd.DataFrame, minutos: pd.DataFrame, first_day: pd.Series,
+                     days: pd.DatetimeIndex) -> dict[str, np.ndarray]:
+    """
+    Metric matrices (players × days) from the daily loads (players × session days).
+
+    Daily loads are resampled onto a continuous calendar and every window is a
+    difference of two columns of the cumulative sums, so the whole range is
+    computed in a single pass.
+    """
+    bounds = _window_bounds(days)
+
+    # Calendar covering every window (all of them end on the reference day)
+    calendar = pd.date_range(min(b[0].min() for b in bounds.values()), days.max(), freq="D")
+    minutos = minutos.reindex(columns=calendar)
+    ua = ua.reindex(columns=calendar)
+
+    values = ua.to_numpy(dtype="float64")
+    has_session = ~np.isnan(values)
+    filled = np.nan_to_num(values, nan=0.0)
+    # Leading zero column: window [a, b] = cum[:, b + 1] - cum[:, a]
+    zeros = np.zeros((len(values), 1))
+    cum_ua = np.hstack([zeros, np.cumsum(filled, axis=1)])
+    cum_sq = np.hstack([zeros, np.cumsum(filled ** 2, axis=1)])
+    cum_n = np.hstack([zeros, np.cumsum(has_session, axis=1)])
+
+    # Calendar positions (the calendar is a continuous daily range)
+    origin = calendar[0].to_datetime64()
+
+    def _pos(dates):
+        return (dates.to_numpy() - origin) // np.timedelta64(1, "D")
+
+    positions = {name: (_pos(first), _pos(last) + 1) for name, (first, last) in bounds.items()}
+
+    def _window(cum, name):
+        first, last = positions[name]
+        return cum[:, last] - cum[:, first]
+
+    def _ratio(num, den):
+        return np.divide(num, den, out=np.full_like(num, np.nan), where=den != 0)
+
+    def _mean(total, count):
+        return np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+
+    # Calendar days elapsed since the first record (0 before it)
+    first = first_day.reindex(ua.index).to_numpy(dtype="datetime64[ns]")
+    elapsed = (days.to_numpy()[None, :] - first[:, None]) // np.timedelta64(1, "D") + 1
+    elapsed = np.clip(elapsed, 0, None).astype("float64")
+
+    carga_semana = _window(cum_ua, "semana")
+    n_semana = _window(cum_n, "semana")
+    carga_mes = _window(cum_ua, "mes")
+    fatiga_aguda = _window(cum_ua, "last7")
+    acute7 = _mean(fatiga_aguda, np.minimum(elapsed, VENTANA_AGUDA))
+    chronic28 = _mean(_window(cum_ua, "last28"), np.minimum(elapsed, VENTANA_CRONICA))
+    acwr = np.where((elapsed >= MIN_DIAS_ACWR) & (chronic28 > 0), _ratio(acute7, chronic28), np.nan)
+    media_semana = _mean(carga_semana, n_semana)
+
+    # Weekly std (ddof=0) over session days: (n·Σx² - (Σx)²) / n², 0 with fewer than two sessions
+    var_semana = _ratio(np.clip(n_semana * _window(cum_sq, "semana") - carga_semana ** 2, 0, None), n_semana ** 2)
+    std_semana = np.where(n_semana > 1, np.sqrt(np.nan_to_num(var_semana)), 0.0)
+
+    cols = _pos(days)
+    return {
+        "ua_total_dia": filled[:, cols],
+        "minutos_sesion": np.where(has_session[:, cols], minutos.to_numpy(dtype="float64")[:, cols], 0.0),
+        "carga_semana": carga_semana,
+        "carga_mes": carga_mes,
+        "carga_media_semana": media_semana,
+        "carga_media_mes": _mean(carga_mes, _window(cum_n, "mes")),
+        "monotonia_semana": _ratio(media_semana, std_semana),
+        "fatiga_aguda": fatiga_aguda,
+        # Calendar-day definition of src.reports.load_engine.compute_load_windows
+        "fatiga_cronica": chronic28,
+        "adaptacion": chronic28 - acute7,
+        "acwr": acwr,
+        "variabilidad_semana": std_semana,
+    }
+
+def compute_rpe_metrics_history(df_raw: pd.DataFrame, start: Optional[date] = None,
+                                end: Optional[date] = None) -> pd.DataFrame:
+    """
+    Daily history of the load metrics: one row per player and calendar day in
+    [start, end] (defaults: first and last session of the frame), i.e. the value
+    compute_rpe_metrics returns with that day as end_day.
+
+    Every window ends on the reference day:
+        carga_semana / carga_mes: week- and month-to-date load (means and the weekly
+            std are per session day).
+        fatiga_aguda: 7-day load.
+        fatiga_cronica / acwr / adaptacion: 7- and 28-day loads divided by
+            min(days since the first record, window), ACWR from MIN_DIAS_ACWR days,
+            exactly as compute_load_windows.
+    """
+    df = _prepare_checkout_df(df_raw)
+    id_cols = ["id_jugadora"] + (["nombre_jugadora"] if "nombre_jugadora" in df.columns else [])
+    columns = id_cols + ["fecha_sesion"] + SQUAD_METRIC_COLUMNS
+    if df.empty or "id_jugadora" not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    session_days = pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.normalize()
+    days = pd.date_range(pd.Timestamp(start or session_days.min()), pd.Timestamp(end or session_days.max()), freq="D")
+    if days.empty:
+        return pd.DataFrame(columns=columns)
+
+    ua, minutos = _daily_matrices(df)
+    metrics = _metric_matrices(ua, minutos, _first_record_days(df_raw), days)
+
+    players = ua.index
+    n_players, n_days = len(players), len(days)
+    out = pd.DataFrame({name: m.ravel() for name, m in metrics.items()})
+    out.insert(0, "fecha_sesion", np.tile(days.to_numpy(), n_players))
+    out.insert(0, "id_jugadora", np.repeat(players.to_numpy(), n_days))
+    if len(id_cols) > 1:
+        names = df.drop_duplicates("id_jugadora").set_index("id_jugadora")["nombre_jugadora"]
+        out.insert(1, "nombre_jugadora", out["id_jugadora"].map(names))
+    return out[columns]
+
+def compute_rpe_metrics_squad(df_raw: pd.DataFrame, end: Optional[date] = None) -> pd.DataFrame:
+    """
+    Squad variant of compute_rpe_metrics: one row per player (id_jugadora,
+    nombre_jugadora when available) with the same metrics, all computed in one pass.
+    Every player shares the same reference day (end, or the last session of the frame).
+    """
+    df = _prepare_checkout_df(df_raw)
+    if df.empty or "id_jugadora" not in df.columns:
+        id_cols = ["id_jugadora"] + (["nombre_jugadora"] if "nombre_jugadora" in df.columns else [])
+        return pd.DataFrame(columns=id_cols + SQUAD_METRIC_COLUMNS)
+
+    end_day = pd.Timestamp(end or pd.to_datetime(df["fecha_sesion"]).max()).normalize()
+    # Raw frame: the calendar starts at each player's first record of any type
+    history = compute_rpe_metrics_history(df_raw, start=end_day, end=end_day)
+    return history.drop(columns=["fecha_sesion"]).reset_index(drop=True)
@@ -4,27 +4,24 @@ import pandas as pd
 import plotly.express as px
 import src.styles as styles
 from src.i18n.i18n import t
+from src.partes_cuerpo import ZonaIndex, resumen_por_zona
+from src.reports.metrics import compute_rpe_metrics_squad, compute_rpe_metrics_history
+from src.reports.calendario import join_calendar, has_calendar
 
 # ============================================================
 # 🧭 Función auxiliar de fecha
 # ============================================================
 def _ensure_fecha(df: pd.DataFrame) -> pd.DataFrame:
-    """Asegura columna 'fecha_sesion' y añade 'semana', 'anio' y 'rango_semana'."""
-    df = df.copy()
+    """
+    Asegura columna 'fecha_sesion' y las columnas de calendario ('anio', 'semana', 'rango_semana'...).
+    Si el frame ya viene enriquecido (join_calendar en group_dashboard) se devuelve tal cual, sin copiarlo.
+    """
     if "fecha_sesion" not in df.columns:
         st.warning("El DataFrame no contiene la columna 'fecha_sesion'.")
         return df
-
-    df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce")
-    df["anio"] = df["fecha_sesion"].dt.year
-    df["semana"] = df["fecha_sesion"].dt.isocalendar().week
-
-    # Etiqueta más amigable: rango de lunes a domingo
-    df["inicio_semana"] = df["fecha_sesion"] - pd.to_timedelta(df["fecha_sesion"].dt.weekday, unit="d")
-    df["fin_semana"] = df["inicio_semana"] + pd.Timedelta(days=6)
-    df["rango_semana"] = df["inicio_semana"].dt.strftime("%d %b") + "–" + df["fin_semana"].dt.strftime("%d %b")
-
-    return df
+    if has_calendar(df):
+        return df
+    return join_calendar(df)
 
 
 # ============================================================
@@ -120,36 +117,40 @@ def plot_rpe_promedio(df: pd.DataFrame):
 # ============================================================
 # ⚙️ Monotonía y fatiga aguda
 # ============================================================
-def plot_monotonia_fatiga(df: pd.DataFrame):
-    """Calcula y muestra el índice de monotonía y fatiga aguda por microciclo."""
-    df = _ensure_fecha(df)
+def _media_plantilla(historial: pd.DataFrame, columnas: list[str]) -> pd.DataFrame:
+    """Media diaria de la plantilla de las columnas indicadas del historial de métricas."""
+    return historial.groupby("fecha_sesion", as_index=False)[columnas].mean()
+
+def plot_monotonia_fatiga(df: pd.DataFrame, historial: pd.DataFrame | None = None):
+    """Monotonía semanal y fatiga aguda (7 días) medias de la plantilla, día a día."""
     if "ua" not in df.columns:
         st.warning("No se encontró la columna UA.")
         return
 
-    weekly = (
-        df.groupby(["anio", "semana"], as_index=False)["ua"]
-        .agg(["sum", "std", "mean"])
-        .reset_index()
-        .rename(columns={"sum": "carga_total", "std": "desv_std", "mean": "media"})
-    )
-    weekly["monotonia"] = weekly["media"] / weekly["desv_std"].replace(0, pd.NA)
-    weekly["fatiga_aguda"] = weekly["carga_total"] * weekly["monotonia"]
+    if historial is None:
+        historial = compute_rpe_metrics_history(df)
+    if historial.empty:
+        st.info(t("No hay datos de carga disponibles."))
+        return
+
+    diario = _media_plantilla(historial, ["monotonia_semana", "fatiga_aguda"])
 
     fig = px.line(
-        weekly,
-        x="semana",
-        y=["monotonia", "fatiga_aguda"],
-        markers=True,
+        diario,
+        x="fecha_sesion",
+        y=["monotonia_semana", "fatiga_aguda"],
         title=t(":material/stacked_line_chart: Monotonía y Fatiga Aguda"),
         color_discrete_map={
-            "monotonia": styles.SEMAFORO["naranja"],
+            "monotonia_semana": styles.SEMAFORO["naranja"],
             "fatiga_aguda": styles.SEMAFORO["rojo"],
         },
     )
+    # Escalas distintas: la fatiga aguda (UA) va en el eje secundario
+    fig.update_traces(yaxis="y2", selector=dict(name="fatiga_aguda"))
     fig.update_layout(
-        xaxis_title=t("Semana"),
-        yaxis_title=t("Valor del índice"),
+        xaxis_title=t("Fecha"),
+        yaxis_title=t("Monotonía semana"),
+        yaxis2=dict(title=t("Fatiga aguda (7d)"), overlaying="y", side="right"),
         plot_bgcolor="white",
         font_color=styles.BRAND_TEXT,
     )
@@ -159,24 +160,23 @@ def plot_monotonia_fatiga(df: pd.DataFrame):
 # ============================================================
 # 📈 Relación Carga Aguda : Crónica (ACWR)
 # ============================================================
-def plot_acwr(df: pd.DataFrame):
-    """Calcula la relación ACWR y pinta zonas de referencia con colores del semáforo."""
-    df = _ensure_fecha(df)
+def plot_acwr(df: pd.DataFrame, historial: pd.DataFrame | None = None):
+    """ACWR medio de la plantilla día a día, con zonas de referencia del semáforo."""
     if "ua" not in df.columns:
         st.warning("No se encontró la columna UA.")
         return
 
-    weekly = df.groupby(["anio", "semana"], as_index=False)["ua"].sum()
-    weekly.rename(columns={"ua": "carga"}, inplace=True)
-
-    # Carga aguda (semana actual) vs carga crónica (media de 3 previas)
-    weekly["acwr"] = weekly["carga"] / weekly["carga"].rolling(4, min_periods=2).mean().shift(1)
+    if historial is None:
+        historial = compute_rpe_metrics_history(df)
+    diario = _media_plantilla(historial, ["acwr"]).dropna(subset=["acwr"]) if not historial.empty else historial
+    if diario.empty:
+        st.info(t("No hay suficientes datos para calcular ACWR."))
+        return
 
     fig = px.line(
-        weekly,
-        x="semana",
+        diario,
+        x="fecha_sesion",
         y="acwr",
-        markers=True,
         title=t(":material/analytics: Relación Carga Aguda : Crónica (ACWR)"),
         color_discrete_sequence=[styles.SEMAFORO["verde_oscuro"]],
     )
@@ -196,7 +196,7 @@ def plot_acwr(df: pd.DataFrame):
     )
 
     fig.update_layout(
-        xaxis_title=t("Semana"),
+        xaxis_title=t("Fecha"),
         yaxis_title=t("ACWR"),
         plot_bgcolor="white",
         font_color=styles.BRAND_TEXT,
@@ -232,4 +232,92 @@ def tabla_resumen(df_filtrado):
                 "sesiones": "Nº sesiones",
             }
         ),
-    )
\ No newline at end of file
+    )
+
+def tabla_metricas_carga(df_filtrado: pd.DataFrame, end=None, historial: pd.DataFrame | None = None):
+    """
+    Métricas de carga de cada jugadora (una fila por jugadora) calculadas en una sola pasada.
+    Con 'historial' (compute_rpe_metrics_history) se toma su último día en lugar de recalcular.
+    """
+    if historial is not None and not historial.empty:
+        metricas = historial[historial["fecha_sesion"] == historial["fecha_sesion"].max()].drop(columns=["fecha_sesion"])
+    else:
+        metricas = compute_rpe_metrics_squad(df_filtrado, end)
+    if metricas.empty:
+        st.info(t("No hay datos de carga disponibles."))
+        return
+
+    metricas = metricas.drop(columns=["id_jugadora"]).sort_values("acwr", ascending=False, na_position="last")
+    metricas.index = range(1, len(metricas) + 1)
+
+    st.dataframe(
+        metricas.round(2).rename(
+            columns={
+                "nombre_jugadora": t("Jugadora"),
+                "ua_total_dia": t("UA total último día"),
+                "minutos_sesion": t("Minutos último día"),
+                "carga_semana": t("Carga semana"),
+                "carga_mes": t("Carga mes"),
+                "carga_media_semana": t("Carga media semana"),
+                "carga_media_mes": t("Carga media mes"),
+                "monotonia_semana": t("Monotonía semana"),
+                "fatiga_aguda": t("Fatiga aguda (7d)"),
+                "fatiga_cronica": t("Fatiga crónica (28d)"),
+                "adaptacion": t("Adaptación"),
+                "acwr": t("ACWR"),
+                "variabilidad_semana": t("Variabilidad semanal"),
+            }
+        ),
+    )
+
+# ============================================================
+# 🩹 Dolor por zona corporal
+# ============================================================
+def plot_dolor_por_zona(df: pd.DataFrame, zonas: ZonaIndex | None = None):
+    """
+    Reportes de dolor por zona corporal y detalle de jugadoras por zona.
+    'zonas' es el índice del ámbito (get_zona_index_db), ya construido para la versión
+    de datos; se restringe a los registros de 'df'. Si no se pasa, se construye con 'df'.
+    """
+    if zonas is None:
+        zonas = ZonaIndex.from_df(df)
+    partes = zonas.restringir(df["id"])
+    if partes.empty:
+        st.info(t("No hay reportes de dolor por zona en el periodo seleccionado."))
+        return
+
+    resumen = resumen_por_zona(partes)
+
+    fig = px.bar(
+        resumen,
+        x="reportes",
+        y="zona",
+        orientation="h",
+        hover_data={"jugadoras": True},
+        title=t("Reportes de dolor por zona corporal"),
+        color_discrete_sequence=[styles.SEMAFORO["rojo"]],
+    )
+    fig.update_layout(
+        xaxis_title=t("Reportes"),
+        yaxis_title="",
+        yaxis=dict(categoryorder="total ascending"),
+        plot_bgcolor="white",
+        font_color=styles.BRAND_TEXT,
+    )
+    st.plotly_chart(fig)
+
+    zona = st.selectbox(t("Zona"), resumen["zona"].tolist(), index=0)
+    detalle = df.loc[df["id"].isin(zonas.ids_zona(zona)), ["fecha_sesion", "nombre_jugadora", "dolor"]]
+    detalle = detalle.sort_values("fecha_sesion", ascending=False)
+    detalle["fecha_sesion"] = detalle["fecha_sesion"].dt.date
+
+    st.dataframe(
+        detalle[["fecha_sesion", "nombre_jugadora", "dolor"]].rename(
+            columns={
+                "fecha_sesion": t("Fecha"),
+                "nombre_jugadora": t("Jugadora"),
+                "dolor": t("Dolor"),
+            }
+        ),
+        hide_index=True,
+    )
@@ -5,7 +5,10 @@ import plotly.express as px
 import plotly.graph_objects as go
 import altair as alt
 from src.i18n.i18n import t
-from src.styles import get_color_wellness, BRAND_PRIMARY, BRAND_TEXT
+from src.styles import css_wellness, css_por_tramos, CSS_VERDE, CSS_AMARILLO, CSS_ROJO, BRAND_PRIMARY, BRAND_TEXT
+from src.reports.load_engine import compute_load_windows
+from src.reports.metrics import compute_rpe_metrics_history
+from src.reports.baselines import get_wellness_baselines, W_COLS as BASELINE_COLS
 
 # 1️⃣ RPE y UA -------------------------------------------------------
 def grafico_rpe_ua(df: pd.DataFrame):
@@ -56,19 +59,17 @@ def grafico_duracion_rpe(df: pd.DataFrame):
 
 
 # 3️⃣ ACWR -----------------------------------------------------------
-def grafico_acwr(df: pd.DataFrame):
+def grafico_acwr(df: pd.DataFrame, ventanas: pd.DataFrame | None = None):
     #st.markdown("#### Evolución del índice ACWR (Relación Agudo:Crónico)")
 
     if "ua" not in df.columns:
         st.info(t("No hay datos de carga interna (UA) para calcular ACWR."))
         return
 
-    df = df.copy()
-    df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
-    df["acute7"] = df["ua"].rolling(7, min_periods=3).mean()
-    df["chronic28"] = df["ua"].rolling(28, min_periods=7).mean()
-    df["acwr"] = df["acute7"] / df["chronic28"]
-    df = df.dropna(subset=["acwr"])
+    # Ventanas de 7/28 días naturales (compute_load_windows), calculadas una vez por render
+    if ventanas is None:
+        ventanas = compute_load_windows(df)
+    df = ventanas.dropna(subset=["acwr"]).copy()
 
     if df.empty:
         st.info(t("No hay suficientes datos para calcular ACWR."))
@@ -123,6 +124,35 @@ def grafico_acwr(df: pd.DataFrame):
     st.altair_chart(chart)
 
 
+# 3️⃣b Fatiga aguda / crónica ---------------------------------------
+def grafico_fatiga(df: pd.DataFrame, historial: pd.DataFrame | None = None):
+    """
+    Evolución diaria de la fatiga aguda (media diaria de 7 días), la fatiga crónica
+    (28 días) y la adaptación, con las mismas definiciones que el resumen de carga.
+    """
+    if historial is None:
+        historial = compute_rpe_metrics_history(df)
+    if historial.empty:
+        st.info(t("No hay datos de carga disponibles."))
+        return
+
+    serie = historial[["fecha_sesion"]].copy()
+    serie[t("Fatiga aguda (7d)")] = historial["fatiga_aguda"] / 7.0
+    serie[t("Fatiga crónica (28d)")] = historial["fatiga_cronica"]
+    serie[t("Adaptación")] = historial["adaptacion"]
+
+    fig = px.line(
+        serie,
+        x="fecha_sesion",
+        y=[c for c in serie.columns if c != "fecha_sesion"],
+        labels={"value": "UA / día", "fecha_sesion": "Fecha", "variable": ""},
+        title=t("Evolución de la fatiga aguda y crónica"),
+        color_discrete_sequence=["#E53935", "#1976D2", "#43A047"],
+    )
+    fig.add_hline(y=0, line_dash="dot", line_color="#9E9E9E")
+    st.plotly_chart(fig)
+
+
 # 4️⃣ Wellness -------------------------------------------------------
 def grafico_wellness(df: pd.DataFrame):
     #st.markdown("**Evolución de los indicadores de bienestar (1-5)**")
@@ -138,8 +168,58 @@ def grafico_wellness(df: pd.DataFrame):
         st.info(t("No hay datos de bienestar para graficar."))
 
 
+# 4️⃣b Z-scores respecto a la línea base personal ---------------------
+def grafico_zscores_wellness(df: pd.DataFrame):
+    """
+    Z-scores diarios de las variables de bienestar frente a la línea base de 28 días
+    de la jugadora; los puntos marcados superan el cambio mínimo relevante (SWC).
+    """
+    if df.empty or "id_jugadora" not in df.columns:
+        return
+    baselines = get_wellness_baselines()
+    if baselines.empty:
+        st.info(t("Sin historial suficiente para calcular la línea base."))
+        return
+
+    jugadora = str(df["id_jugadora"].iloc[0])
+    fechas = pd.to_datetime(df["fecha_sesion"])
+    datos = baselines[
+        (baselines["id_jugadora"] == jugadora)
+        & baselines["fecha_sesion"].between(fechas.min().normalize(), fechas.max().normalize())
+    ]
+    if datos.empty or datos[[f"z_{c}" for c in BASELINE_COLS]].isna().all().all():
+        st.info(t("Sin historial suficiente para calcular la línea base."))
+        return
+
+    largo = pd.concat(
+        [
+            pd.DataFrame({
+                "fecha_sesion": datos["fecha_sesion"],
+                "variable": c,
+                "z": datos[f"z_{c}"],
+                "swc": datos[f"swc_{c}"],
+            })
+            for c in BASELINE_COLS
+        ],
+        ignore_index=True,
+    ).dropna(subset=["z"])
+
+    fig = px.line(
+        largo, x="fecha_sesion", y="z", color="variable", markers=True,
+        labels={"z": "z-score", "fecha_sesion": "Fecha", "variable": "Parámetro"},
+        title=t("Desviación respecto a la línea base personal (z-score, 28 días)"),
+    )
+    alertas = largo[largo["swc"]]
+    fig.add_trace(go.Scatter(
+        x=alertas["fecha_sesion"], y=alertas["z"], mode="markers", name="SWC",
+        marker=dict(symbol="circle-open", size=14, color="#E53935", line=dict(width=2)),
+    ))
+    fig.add_hrect(y0=-1, y1=1, fillcolor="#C8E6C9", opacity=0.25, line_width=0)
+    st.plotly_chart(fig)
+
+
 # 5️⃣ Riesgo de lesión -----------------------------------------------
-def grafico_riesgo_lesion(df: pd.DataFrame):
+def grafico_riesgo_lesion(df: pd.DataFrame, ventanas: pd.DataFrame | None = None):
     """
     Visualiza el riesgo de lesión combinando el índice ACWR (Agudo:Crónico)
     con la fatiga subjetiva, mostrando zonas de carga de fondo.
@@ -151,14 +231,15 @@ def grafico_riesgo_lesion(df: pd.DataFrame):
         st.info(t("No hay datos suficientes para calcular el riesgo."))
         return
 
-    df = df.copy()
-    df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
-    df["fatiga"] = pd.to_numeric(df.get("energia", np.nan), errors="coerce")
+    if ventanas is None:
+        ventanas = compute_load_windows(df)
 
-    # Calcular cargas aguda y crónica
-    df["acute7"] = df["ua"].rolling(7, min_periods=3).mean()
-    df["chronic28"] = df["ua"].rolling(28, min_periods=7).mean()
-    df["acwr"] = df["acute7"] / df["chronic28"]
+    # Fatiga subjetiva del día (media de turnos) sobre las ventanas de carga por día natural
+    fatiga = df[["id_jugadora", "fecha_sesion"]].copy()
+    fatiga["fecha_sesion"] = pd.to_datetime(fatiga["fecha_sesion"]).dt.normalize()
+    fatiga["fatiga"] = pd.to_numeric(df.get("energia", np.nan), errors="coerce").astype("float64")
+    fatiga = fatiga.groupby(["id_jugadora", "fecha_sesion"], observed=True, as_index=False)["fatiga"].mean()
+    df = ventanas.merge(fatiga, on=["id_jugadora", "fecha_sesion"], how="inner")
 
     # --- Clasificación del riesgo ---
     def riesgo_calc(row):
@@ -261,11 +342,12 @@ def tabla_wellness_individual(df: pd.DataFrame):
     t_df["fecha_sesion"] = t_df["fecha_sesion"].dt.date
 
     # Tipo de estímulo y readaptación
-    t_df["Tipo de estímulo"] = t_df.get("tipo_estimulo", "").fillna("").astype(str)
-    t_df["Tipo de readaptación"] = t_df.get("tipo_readaptacion", "").fillna("").astype(str)
+    # (categóricas: pasar a texto antes de rellenar vacíos)
+    t_df["Tipo de estímulo"] = t_df["tipo_estimulo"].astype("string").fillna("") if "tipo_estimulo" in t_df else ""
+    t_df["Tipo de readaptación"] = t_df["tipo_readaptacion"].astype("string").fillna("") if "tipo_readaptacion" in t_df else ""
 
-    # Calcular Promedio Wellness
-    t_df["Promedio Wellness"] = t_df[["recuperacion", "energia", "sueno", "stress", "dolor"]].mean(axis=1)
+    # Calcular Promedio Wellness (float64: Int8 con nulos daría pd.NA en las comparaciones del estilo)
+    t_df["Promedio Wellness"] = t_df[["recuperacion", "energia", "sueno", "stress", "dolor"]].astype("float64").mean(axis=1)
 
     # Selección y renombre de columnas
     t_show = t_df[[
@@ -282,28 +364,17 @@ def tabla_wellness_individual(df: pd.DataFrame):
         "dolor": "Dolor"
     })
 
-    # --- Aplicar colores desde styles.py ---
-    def style_func(col):
-        if col.name in ["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"]:
-            return [
-                f"background-color:{get_color_wellness(v, col.name)}; "
-                f"color:white; font-weight:bold; text-align:center;"
-                for v in col
-            ]
-        elif col.name == "Promedio Wellness":
-            return [
-                # Verde óptimo, amarillo moderado, rojo bajo
-                "background-color:#27AE60; color:white; font-weight:bold; text-align:center;" if v >= 4 else
-                "background-color:#F1C40F; color:black; text-align:center;" if 3 <= v < 4 else
-                "background-color:#E74C3C; color:white; font-weight:bold; text-align:center;"
-                for v in col
-            ]
-        return [""] * len(col)
+    # --- Aplicar colores desde styles.py (matriz CSS vectorizada, sin callback por celda) ---
+    css = pd.DataFrame("", index=t_show.index, columns=t_show.columns)
+    for c in ["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"]:
+        css[c] = css_wellness(t_show[c], invertida=c in ["Estrés", "Dolor"])
+    # Verde óptimo, amarillo moderado, rojo bajo
+    css["Promedio Wellness"] = css_por_tramos(t_show["Promedio Wellness"], [3, 4], [CSS_ROJO, CSS_AMARILLO, CSS_VERDE])
 
     # --- Aplicar estilo al DataFrame ---
     styled = (
         t_show.style
-        .apply(style_func, subset=["Recuperación", "Energía", "Sueño", "Estrés", "Dolor", "Promedio Wellness"])
+        .apply(lambda _: css, axis=None)
         .format(precision=2)
     )
 
@@ -2,27 +2,54 @@
 import streamlit as st
 import pandas as pd
 from src.i18n.i18n import t
-from src.reports.plots_grupales import (plot_carga_semanal, plot_rpe_promedio, tabla_resumen)
+from src.reports.plots_grupales import (plot_carga_semanal, plot_rpe_promedio, tabla_resumen, plot_dolor_por_zona,
+                                       tabla_metricas_carga, plot_acwr, plot_monotonia_fatiga)
+from src.reports.metrics import compute_rpe_metrics_history
+from src.reports.calendario import join_calendar
+from src.ui_components import lazy_tabs
+from src.db_records import get_zona_index_db
 
 
-def group_dashboard(df_filtrado: pd.DataFrame):
-    """Panel grupal con gráficos y tablas agregadas."""
+def group_dashboard(df_filtrado: pd.DataFrame, end=None):
+    """Panel grupal con gráficos y tablas agregadas (end: día de referencia de las métricas de carga)."""
 
     #st.subheader(":material/group: Resumen grupal de cargas", divider=True)
     if df_filtrado.empty:
         st.info(t("No hay datos disponibles para el periodo seleccionado."))
-        st.stop()
+        return
 
-    st.divider()
-    tabs = st.tabs([
-        t(":material/table_chart: Resumen tabular"),
-        t(":material/monitor_weight: Carga y esfuerzo"),
-        t(":material/trending_up: Índices de control"),
-    ])
+    # Dimensión calendario (semana ISO, etiquetas, mes, MD) unida una sola vez para todos los gráficos
+    df_filtrado = join_calendar(df_filtrado)
+
+    # Historial diario de métricas de carga (tabla por jugadora e índices de control);
+    # solo se calcula en la pestaña abierta que lo necesita
+    def historial():
+        return compute_rpe_metrics_history(df_filtrado, end=end)
 
-    with tabs[0]:
+    def panel_resumen():
         tabla_resumen(df_filtrado)
-    with tabs[1]: 
-        plot_carga_semanal(df_filtrado)
-    with tabs[2]: 
+        st.markdown(t("**Métricas de carga por jugadora**"))
+        tabla_metricas_carga(df_filtrado, end, historial())
+
+    def panel_indices():
+        hist = historial()
         plot_rpe_promedio(df_filtrado)
+        plot_acwr(df_filtrado, hist)
+        plot_monotonia_fatiga(df_filtrado, hist)
+
+    st.divider()
+    lazy_tabs(
+        [
+            t(":material/table_chart: Resumen tabular"),
+            t(":material/monitor_weight: Carga y esfuerzo"),
+            t(":material/trending_up: Índices de control"),
+            t(":material/healing: Dolor por zona"),
+        ],
+        [
+            panel_resumen,
+            lambda: plot_carga_semanal(df_filtrado),
+            panel_indices,
+            lambda: plot_dolor_por_zona(df_filtrado, get_zona_index_db()),
+        ],
+        key="tabs_group_dashboard",
+    )
@@ -1,15 +1,22 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from .metrics import compute_rpe_metrics, RPEFilters
+from dataclasses import dataclass
+from .metrics import compute_rpe_metrics, compute_rpe_metrics_history, RPEFilters
+from .load_engine import compute_load_windows, ultimo_valor
+from .memo import get_metrics_memo
+from src.db_records import get_synced_data_version
 from src.util import (get_photo, clean_image_url, calcular_edad)
 from src.i18n.i18n import t
+from src.ui_components import lazy_tabs
 
 from .plots_individuales import (
     grafico_rpe_ua,
     grafico_duracion_rpe,
     grafico_acwr,
+    grafico_fatiga,
     grafico_wellness,
+    grafico_zscores_wellness,
     grafico_riesgo_lesion,
     tabla_wellness_individual
 )
@@ -92,12 +99,56 @@ def player_block_dux(jugadora_seleccionada: dict, unavailable="N/A"):
     #st.divider()
 
 
-def metricas(df: pd.DataFrame, jug_sel, turno_sel, start, end) -> None:
+@dataclass(frozen=True)
+class IndividualMetrics:
+    """Resultados del motor de métricas para una jugadora y un rango (solo lectura)."""
+    metrics: dict
+    ventanas: pd.DataFrame
+    historial: pd.DataFrame
+
+def calcular_metricas_individuales(df: pd.DataFrame, id_jugadora, start, end, turno) -> IndividualMetrics:
+    """
+    Calcula (o recupera del memo LRU) las métricas de carga, las ventanas de ACWR y el
+    historial diario de una jugadora. La clave incluye la versión de datos del ámbito
+    leída tras sincronizar su caché (la misma que la consulta filtrada que produjo 'df'),
+    así que un rerun sin cambios en los datos (idioma, pestañas...) no recalcula nada.
+    """
+    scope, data_version = get_synced_data_version()
+    key = (scope, id_jugadora, start, end, turno, data_version)
+
+    def _compute() -> IndividualMetrics:
+        flt = RPEFilters(jugadores=[id_jugadora] if id_jugadora else None, turnos=[turno] if turno else None,
+                         start=start, end=end)
+        return IndividualMetrics(
+            metrics=compute_rpe_metrics(df, flt),
+            # Mismo día de referencia que las métricas: un único ACWR en la página
+            ventanas=compute_load_windows(df, end=end),
+            historial=compute_rpe_metrics_history(df, start, end),
+        )
+
+    return get_metrics_memo().get_or_compute(key, _compute)
+
+def show_memo_stats() -> None:
+    """Aciertos / fallos del memo de métricas (solo rol developer)."""
+    if st.session_state["auth"]["rol"].lower() != "developer":
+        return
+    stats = get_metrics_memo().stats()
+    st.caption(
+        f":material/memory: {t('Memo de métricas')} — hits: {stats['hits']} · misses: {stats['misses']} · "
+        f"{stats['size']}/{stats['maxsize']}"
+    )
+
+def metricas(df: pd.DataFrame, jug_sel, turno_sel, start, end, metrics: dict | None = None) -> None:
     """Página de análisis individual de cargas y RPE por jugadora."""
 
-    # --- Calcular métricas generales ---
-    flt = RPEFilters(jugadores=jug_sel or None, turnos=turno_sel or None, start=start, end=end)
-    metrics = compute_rpe_metrics(df, flt)
+    # --- Calcular métricas generales (si no vienen ya calculadas / memoizadas) ---
+    if metrics is None:
+        flt = RPEFilters(
+            jugadores=[jug_sel["id_jugadora"]] if jug_sel else None,
+            turnos=[turno_sel] if turno_sel else None,
+            start=start, end=end,
+        )
+        metrics = compute_rpe_metrics(df, flt)
 
     # --- Validar datos ---
     if df is None or df.empty:
@@ -215,10 +266,11 @@ def _get_resumen_tecnico_carga(metrics: dict) -> str:
     return resumen
 
 
-def calcular_semaforo_riesgo(df: pd.DataFrame) -> tuple[str, str, float, float]:
+def calcular_semaforo_riesgo(df: pd.DataFrame, ventanas: pd.DataFrame | None = None) -> tuple[str, str, float, float]:
     """
     Calcula el semáforo de riesgo basándose en ACWR (carga aguda/crónica)
-    y la percepción de fatiga (1–5).
+    y la percepción de fatiga (1–5). 'ventanas' es el resultado de
+    compute_load_windows(df); si no se pasa, se calcula aquí.
 
     Retorna:
         icono (str): 🟢🟠🔴⚪️
@@ -230,20 +282,12 @@ def calcular_semaforo_riesgo(df: pd.DataFrame) -> tuple[str, str, float, float]:
     if "ua" not in df.columns:
         return "⚪️", "Sin datos de carga (UA).", np.nan, np.nan
 
-    # Convertir UA a numérico
-    df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
-    df = df.dropna(subset=["ua"])
-
-    df = df.copy()
-    
-    # Calcular carga aguda (últimos 7 días) y crónica (últimos 28 días)
-    df["acute7"] = df["ua"].rolling(7, min_periods=3).mean()
-    df["chronic28"] = df["ua"].rolling(28, min_periods=7).mean()
-    df["acwr"] = df["acute7"] / df["chronic28"]
-    df = df.dropna(subset=["acwr"])
+    # Carga aguda (7 días) y crónica (28 días) por día natural
+    if ventanas is None:
+        ventanas = compute_load_windows(df)
 
     # Últimos valores
-    last_acwr = df["acwr"].iloc[-1] if not df.empty else np.nan
+    last_acwr = ultimo_valor(ventanas, "acwr")
     last_fatiga = df["fatiga"].iloc[-1] if "fatiga" in df.columns else np.nan
 
     # Lógica de riesgo
@@ -258,8 +302,13 @@ def calcular_semaforo_riesgo(df: pd.DataFrame) -> tuple[str, str, float, float]:
     else:
         return "⚪️", t("Carga muy baja; posible desadaptación o falta de estímulo."), last_acwr, last_fatiga
 
-def graficos_individuales(df: pd.DataFrame):
-    """Gráficos individuales para análisis de carga, bienestar y riesgo."""
+def graficos_individuales(df: pd.DataFrame, ventanas: pd.DataFrame | None = None,
+                          historial: pd.DataFrame | None = None):
+    """
+    Gráficos individuales para análisis de carga, bienestar y riesgo.
+    'ventanas' (compute_load_windows) e 'historial' (compute_rpe_metrics_history)
+    se calculan una vez por render en la página.
+    """
     if df is None or df.empty:
         st.info("No hay datos disponibles para graficar.")
         return
@@ -269,23 +318,32 @@ def graficos_individuales(df: pd.DataFrame):
     #st.divider()
     st.markdown(t("### **Gráficos individuales**"))
 
-    tabs = st.tabs([
-        t("Wellness (1-5)"),
-        t("Fatiga y ACWR"),
-        t("RPE y UA"),
-        t("Duración vs RPE"),
-        #"Riesgo de lesión"
-    ])
-
-    with tabs[0]: 
+    def panel_wellness():
         tabla_wellness_individual(df_player)
         st.divider()
         grafico_wellness(df_player)
-    with tabs[1]: 
-        grafico_acwr(df_player)
-    with tabs[2]: 
-        grafico_rpe_ua(df_player)
-    with tabs[3]: 
-        grafico_duracion_rpe(df_player)
+        grafico_zscores_wellness(df_player)
+
+    def panel_fatiga():
+        grafico_acwr(df_player, ventanas)
+        grafico_fatiga(df_player, historial)
+
+    # Solo se construyen las figuras de la pestaña abierta
+    lazy_tabs(
+        [
+            t("Wellness (1-5)"),
+            t("Fatiga y ACWR"),
+            t("RPE y UA"),
+            t("Duración vs RPE"),
+            #"Riesgo de lesión"
+        ],
+        [
+            panel_wellness,
+            panel_fatiga,
+            lambda: grafico_rpe_ua(df_player),
+            lambda: grafico_duracion_rpe(df_player),
+        ],
+        key="tabs_graficos_individuales",
+    )
     #with tabs[4]: 
-    #    grafico_riesgo_lesion(df_player)
+    #    grafico_riesgo_lesion(df_player, ventanas)
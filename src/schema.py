@@ -1,4 +1,6 @@
 import datetime
+import numpy as np
+import pandas as pd
 from src.i18n.i18n import t
 
 # Diccionario de equivalencias
@@ -20,6 +22,49 @@ DIAS_SEMANA = {
     "Sunday": "Domingo"
 }
 
+# === Tipos del DataFrame de wellness ===
+# Columnas de texto con pocos valores distintos → category
+WELLNESS_CATEGORIAS = ["plantel", "tipo", "turno", "usuario", "periodizacion_tactica", "tipo_estimulo", "tipo_readaptacion"]
+# Escalas 1-5 y RPE 1-10 → Int8; minutos → Int16; UA (RPE x minutos, puede pasar de 32767) → Int32
+WELLNESS_INT8 = ["recuperacion", "energia", "sueno", "stress", "dolor", "rpe"]
+WELLNESS_INT16 = ["minutos_sesion"]
+WELLNESS_INT32 = ["ua"]
+
+def apply_wellness_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica los tipos compactos al DataFrame de wellness (en bloque, sin bucles por fila):
+
+    - category: plantel, tipo, turno, usuario, periodizacion_tactica, tipo_estimulo, tipo_readaptacion
+    - Int8 / Int16 / Int32 (enteros con nulos): escalas wellness y RPE, minutos y UA;
+      un valor fuera del rango del tipo (dato corrupto) queda como nulo en lugar de fallar
+    - datetime64: fecha_sesion (a medianoche) y fecha_hora_registro
+    - boolean: en_periodo
+
+    Las columnas que no existan se ignoran. Devuelve el mismo DataFrame.
+    """
+    if df is None or df.empty:
+        return df
+
+    for col in WELLNESS_CATEGORIAS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    enteros = [(c, "Int8") for c in WELLNESS_INT8] + [(c, "Int16") for c in WELLNESS_INT16] + [(c, "Int32") for c in WELLNESS_INT32]
+    for col, dtype in enteros:
+        if col in df.columns:
+            rango = np.iinfo(dtype.lower())
+            valores = pd.to_numeric(df[col], errors="coerce").round()
+            df[col] = valores.where(valores.between(rango.min, rango.max)).astype(dtype)
+
+    if "fecha_sesion" in df.columns:
+        df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.normalize()
+    if "fecha_hora_registro" in df.columns:
+        df["fecha_hora_registro"] = pd.to_datetime(df["fecha_hora_registro"], errors="coerce")
+    if "en_periodo" in df.columns:
+        df["en_periodo"] = df["en_periodo"].astype("boolean")
+
+    return df
+
 OPCIONES_TURNO = {
     "Turno 1": t("Turno 1"),
     "Turno 2": t("Turno 2"),
@@ -2,6 +2,7 @@
 🎨 Estilos y paletas globales del proyecto CheckInOut.
 Incluye colores corporativos, escalas semafóricas y paletas de interpretación Wellness.
 """
+import numpy as np
 
 # --- Colores corporativos ---
 BRAND_PRIMARY = "#1565C0"
@@ -50,3 +51,41 @@ def get_color_wellness(valor: float | int | None, variable: str) -> str:
         v = 3
     cmap = WELLNESS_COLOR_INVERTIDO if variable in ["Estrés", "Dolor"] else WELLNESS_COLOR_NORMAL
     return cmap.get(v, WELLNESS_COLOR_NORMAL[3])
+
+# --- Estilos de celda para tablas (Styler) ---
+CSS_CELDA = "color:white; text-align:center; font-weight:bold;"
+CSS_VERDE = "background-color:#27AE60; color:white; text-align:center; font-weight:bold;"
+CSS_AMARILLO = "background-color:#F1C40F; color:black; text-align:center; font-weight:bold;"
+CSS_ROJO = "background-color:#E74C3C; color:white; text-align:center; font-weight:bold;"
+CSS_RIESGO = "background-color:#E53935; color:white; text-align:center; font-weight:bold;"
+
+# Tablas de consulta por valor redondeado (índice 0 = fuera de escala → neutro, como get_color_wellness)
+_CSS_WELLNESS_NORMAL = np.array(
+    [f"background-color:{WELLNESS_COLOR_NORMAL[3]}; {CSS_CELDA}"]
+    + [f"background-color:{WELLNESS_COLOR_NORMAL[v]}; {CSS_CELDA}" for v in range(1, 6)],
+    dtype=object,
+)
+_CSS_WELLNESS_INVERTIDO = np.array(
+    [f"background-color:{WELLNESS_COLOR_NORMAL[3]}; {CSS_CELDA}"]
+    + [f"background-color:{WELLNESS_COLOR_INVERTIDO[v]}; {CSS_CELDA}" for v in range(1, 6)],
+    dtype=object,
+)
+
+def css_wellness(valores, invertida: bool = False) -> np.ndarray:
+    """
+    Versión vectorizada de get_color_wellness: CSS de celda para una columna Wellness (1–5)
+    en una sola pasada (redondeo + tabla de consulta). Nulos y valores fuera de escala → neutro.
+    """
+    v = np.rint(np.asarray(valores, dtype="float64"))
+    idx = np.where((v >= 1) & (v <= 5), v, 0).astype(int)
+    return (_CSS_WELLNESS_INVERTIDO if invertida else _CSS_WELLNESS_NORMAL)[idx]
+
+def css_por_tramos(valores, cortes: list[float], estilos: list[str], vacio: str = "") -> np.ndarray:
+    """
+    CSS por tramos de valor: estilos[i] para los valores en [cortes[i-1], cortes[i])
+    (len(estilos) == len(cortes) + 1). Los nulos reciben 'vacio'.
+    """
+    v = np.asarray(valores, dtype="float64")
+    out = np.asarray(estilos, dtype=object)[np.digitize(v, cortes)]
+    out[np.isnan(v)] = vacio
+    return out
@@ -1,9 +1,17 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+from dataclasses import dataclass
 from datetime import date, timedelta
 
-from src.styles import WELLNESS_COLOR_NORMAL, WELLNESS_COLOR_INVERTIDO, get_color_wellness
+from src.styles import css_wellness, css_por_tramos, CSS_VERDE, CSS_AMARILLO, CSS_ROJO, CSS_RIESGO
 from src.util import ordenar_df
+from src.db_records import get_role_data_version
+from src.reports.memo import get_period_memo
+from src.reports.compliance import (
+    compute_compliance_matrix, pendientes_desde_matriz, adherencia_por_jugadora, adherencia_diaria,
+)
+from src.reports.baselines import W_COLS as BASELINE_COLS, ultimo_dia_baselines
 from src.i18n.i18n import t
 
 W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
@@ -16,7 +24,8 @@ def _coerce_numeric(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
     out = df.copy()
     for c in cols:
         if c in out.columns:
-            out[c] = pd.to_numeric(out[c], errors="coerce")
+            # float64 (NaN) en lugar de Int8/Int16/Int32 con pd.NA para los cálculos
+            out[c] = pd.to_numeric(out[c], errors="coerce").astype("float64")
     return out
 
 def compute_player_wellness_means(df_in_period_checkin: pd.DataFrame) -> pd.DataFrame:
@@ -45,43 +54,90 @@ def compute_player_wellness_means(df_in_period_checkin: pd.DataFrame) -> pd.Data
 # 📅 GESTIÓN DE PERIODOS
 # ============================================================
 
-def get_default_period(df: pd.DataFrame) -> str:
+PERIODOS = ["Hoy", "Último día", "Semana", "Mes"]
 
-    hoy = date.today()
-    dias_disponibles = df["fecha_dia"].unique()
-    if hoy in dias_disponibles:
+# Texto del periodo para las tarjetas (se traduce al mostrarlo)
+TEXTO_PERIODO = {
+    "Hoy": "el día de hoy",
+    "Último día": "el último día",
+    "Semana": "la última semana",
+    "Mes": "el último mes",
+}
+
+@dataclass(frozen=True)
+class DayIndex:
+    """
+    Índice día → rango de filas de un frame ordenado por fecha_sesion (ver src.util.data_format).
+    Las filas del día dias[k] son [inicios[k], inicios[k + 1]); cualquier rango de días
+    es un corte contiguo que se localiza con dos búsquedas binarias.
+    """
+    dias: np.ndarray     # días distintos (datetime64) en orden ascendente
+    inicios: np.ndarray  # fila donde empieza cada día, más el total de filas al final
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "DayIndex":
+        fechas = df["fecha_dia"].to_numpy()
+        cambios = np.flatnonzero(np.r_[True, fechas[1:] != fechas[:-1]]) if len(fechas) else np.array([], dtype=int)
+        return cls(dias=fechas[cambios], inicios=np.r_[cambios, len(fechas)])
+
+    @property
+    def ultimo_dia(self) -> pd.Timestamp | None:
+        return pd.Timestamp(self.dias[-1]) if len(self.dias) else None
+
+    def contiene(self, dia) -> bool:
+        k = self.dias.searchsorted(pd.Timestamp(dia).to_datetime64())
+        return k < len(self.dias) and self.dias[k] == pd.Timestamp(dia).to_datetime64()
+
+    def rango(self, desde, hasta=None) -> tuple[int, int]:
+        """Filas [inicio, fin) con fecha_dia entre 'desde' y 'hasta' (incluidos; None = hasta el final)."""
+        k = self.dias.searchsorted(pd.Timestamp(desde).to_datetime64(), "left")
+        m = len(self.dias) if hasta is None else self.dias.searchsorted(pd.Timestamp(hasta).to_datetime64(), "right")
+        return int(self.inicios[k]), int(self.inicios[max(k, m)])
+
+def _ordenado_por_fecha(df: pd.DataFrame) -> pd.DataFrame:
+    """El frame tal cual si ya viene ordenado por fecha_sesion (data_format); si no, una copia ordenada."""
+    if df["fecha_sesion"].is_monotonic_increasing:
+        return df
+    return df.dropna(subset=["fecha_sesion"]).sort_values("fecha_sesion", kind="stable").reset_index(drop=True)
+
+def _period_range(indice: DayIndex, periodo: str, hoy: pd.Timestamp) -> tuple[int, int]:
+    """Filas [inicio, fin) del periodo sobre el frame ordenado."""
+    fecha_max = indice.ultimo_dia
+    if fecha_max is None:
+        return 0, 0
+    if periodo == "Hoy":
+        return indice.rango(hoy, hoy)
+    if periodo == "Último día":
+        return indice.rango(fecha_max)
+    if periodo == "Semana":
+        return indice.rango(fecha_max - pd.Timedelta(days=7))
+    return indice.rango(fecha_max - pd.Timedelta(days=30))
+
+def _period_slice(df: pd.DataFrame, inicio: int, fin: int) -> pd.DataFrame:
+    """Corte del periodo, más reciente primero y sin la columna id."""
+    return df.iloc[inicio:fin].iloc[::-1].reset_index(drop=True).drop(columns=["id"], errors="ignore")
+
+def get_default_period(df: pd.DataFrame, indice: DayIndex | None = None) -> str:
+
+    hoy = pd.Timestamp(date.today())
+    if indice is None:
+        indice = DayIndex.from_df(_ordenado_por_fecha(df))
+    inicio_semana, fin_semana = indice.rango(hoy - timedelta(days=7), hoy - timedelta(days=2))
+    if indice.contiene(hoy):
         return "Hoy"
-    elif (hoy - timedelta(days=1)) in dias_disponibles:
+    elif indice.contiene(hoy - timedelta(days=1)):
         return "Último día"
-    elif any((hoy - timedelta(days=i)) in dias_disponibles for i in range(2, 8)):
+    elif fin_semana > inicio_semana:
         return "Semana"
     else:
         return "Mes"
 
-def filter_df_by_period(df: pd.DataFrame, periodo: str):
-    fecha_max = df["fecha_sesion"].max()
-
-    if periodo == "Hoy":
-        filtro = df["fecha_dia"] == date.today()
-        texto = t("el día de hoy")
-    elif periodo == "Último día":
-        filtro = df["fecha_dia"] == fecha_max
-        texto = t("el último día")
-    elif periodo == "Semana":
-        filtro = df["fecha_sesion"] >= (fecha_max - pd.Timedelta(days=7))
-        texto = t("la última semana")
-    else:
-        filtro = df["fecha_sesion"] >= (fecha_max - pd.Timedelta(days=30))
-        texto = t("el último mes")
-
-    # --- Aplicar filtro ---
-    df_filtrado = df[filtro].copy()
-
-    # --- Ordenar por fecha (más reciente primero) ---
-    df_filtrado = df_filtrado.sort_values(by="fecha_sesion", ascending=False).reset_index(drop=True)
-    df_filtrado.drop(columns=["id"], inplace=True)
-
-    return df_filtrado, texto
+def filter_df_by_period(df: pd.DataFrame, periodo: str, indice: DayIndex | None = None):
+    df = _ordenado_por_fecha(df)
+    if indice is None:
+        indice = DayIndex.from_df(df)
+    inicio, fin = _period_range(indice, periodo, pd.Timestamp(date.today()))
+    return _period_slice(df, inicio, fin), t(TEXTO_PERIODO[periodo])
 
 
 # ============================================================
@@ -95,16 +151,18 @@ def calc_delta(values):
 
 
 def calc_trend(df, by_col, target_col, agg="mean"):
+    valores = df[target_col].astype("float64")
     if agg == "sum":
-        g = df.groupby(by_col)[target_col].sum().reset_index(name="valor")
+        g = valores.groupby(df[by_col]).sum().reset_index(name="valor")
     else:
-        g = df.groupby(by_col)[target_col].mean().reset_index(name="valor")
+        g = valores.groupby(df[by_col]).mean().reset_index(name="valor")
     return g.sort_values(by_col)["valor"].tolist()
 
 
 def calc_metric_block(df, periodo, var, agg="mean"):
     if periodo in ["Hoy", "Último día"]:
-        valor = round(df[var].mean(), 1) if agg == "mean" else int(df[var].sum())
+        valores = df[var].astype("float64")
+        valor = round(valores.mean(), 1) if agg == "mean" else int(valores.sum())
         chart, delta = [valor], 0
     elif periodo == "Semana":
         vals = calc_trend(df, "semana", var, agg)
@@ -158,6 +216,65 @@ def calc_alertas(df_periodo: pd.DataFrame, df_completo: pd.DataFrame, periodo: s
 
     return alertas_count, total_jugadoras, alertas_pct, chart_alertas, delta_alertas
 
+# ============================================================
+# 🗂️ INSTANTÁNEAS DE PERIODO
+# ============================================================
+
+@dataclass(frozen=True)
+class PeriodSnapshot:
+    """
+    Cálculos de la portada para un periodo. Los valores se comparten entre sesiones
+    (memo por versión de datos) y deben tratarse como de solo lectura.
+    """
+    df: pd.DataFrame                # registros del periodo, más recientes primero (como filter_df_by_period)
+    texto: str                      # clave sin traducir de TEXTO_PERIODO
+    wellness: tuple                 # (valor, chart, delta) de calc_metric_block
+    rpe: tuple
+    ua: tuple
+    alertas: tuple                  # resultado de calc_alertas
+    resumen: pd.DataFrame | None    # resultado de calcular_resumen_periodo
+
+def build_period_snapshots(df: pd.DataFrame, hoy: date | None = None) -> dict[str, PeriodSnapshot]:
+    """
+    Calcula en una pasada las instantáneas de los cuatro periodos (Hoy, Último día,
+    Semana, Mes): cada periodo es un corte por posiciones del frame ordenado
+    (DayIndex), sin máscaras booleanas ni copias del frame completo.
+    """
+    hoy = pd.Timestamp(hoy or date.today())
+    ordenado = _ordenado_por_fecha(df)
+    indice = DayIndex.from_df(ordenado)
+    snapshots = {}
+    for periodo in PERIODOS:
+        df_periodo = _period_slice(ordenado, *_period_range(indice, periodo, hoy))
+        snapshots[periodo] = PeriodSnapshot(
+            df=df_periodo,
+            texto=TEXTO_PERIODO[periodo],
+            wellness=calc_metric_block(df_periodo, periodo, "wellness_score", "mean"),
+            rpe=calc_metric_block(df_periodo, periodo, "rpe", "mean"),
+            ua=calc_metric_block(df_periodo, periodo, "ua", "sum"),
+            alertas=calc_alertas(df_periodo, df, periodo),
+            resumen=calcular_resumen_periodo(df_periodo),
+        )
+    return snapshots
+
+def get_day_index(df: pd.DataFrame) -> DayIndex:
+    """Índice de días del frame de la portada, memorizado por (ámbito, versión de datos)."""
+    scope, data_version = get_role_data_version()
+    return get_period_memo().get_or_compute(
+        ("dias", scope, data_version), lambda: DayIndex.from_df(_ordenado_por_fecha(df))
+    )
+
+def get_period_snapshots(df: pd.DataFrame) -> dict[str, PeriodSnapshot]:
+    """
+    Instantáneas de periodo del ámbito del rol, memorizadas por (ámbito, versión de datos, día):
+    cambiar de periodo en la portada solo lee del memo.
+    """
+    scope, data_version = get_role_data_version()
+    hoy = date.today()
+    return get_period_memo().get_or_compute(
+        (scope, data_version, hoy), lambda: build_period_snapshots(df, hoy)
+    )
+
 # ============================================================
 # 💠 TARJETAS DE MÉTRICAS
 # ============================================================
@@ -354,18 +471,18 @@ def show_interpretation(wellness_prom, rpe_prom, ua_total, alertas_count, alerta
 # 📋 TABLA RESUMEN DEL PERIODO
 # ============================================================
 
-def generar_resumen_periodo(df: pd.DataFrame):
+def calcular_resumen_periodo(df: pd.DataFrame) -> pd.DataFrame | None:
     """
-    Tabla resumen del periodo (sin separar por tipo),
-    manteniendo cálculo de riesgo y colores de wellness.
+    Datos de la tabla resumen del periodo (sin separar por tipo) con el cálculo de riesgo.
+    Devuelve None si el periodo no tiene registros. No traduce ni aplica estilos
+    (ver render_resumen_periodo), de modo que el resultado se puede cachear.
     """
 
     # --- Asegurar tipos numéricos ---
     df_periodo = df.copy()
 
     if df_periodo.empty:
-        st.info("No hay registros disponibles en este periodo.")
-        return
+        return None
 
     # ======================================================
     # 🧱 Base y preprocesamiento
@@ -379,7 +496,7 @@ def generar_resumen_periodo(df: pd.DataFrame):
     # --- Asegurar tipos numéricos ---
     for c in cols_wellness + ["rpe", "ua"]:
         if c in df_periodo.columns:
-            df_periodo[c] = pd.to_numeric(df_periodo[c], errors="coerce")
+            df_periodo[c] = pd.to_numeric(df_periodo[c], errors="coerce").astype("float64")
 
     # --- Promedios generales por jugadora ---
     resumen = (
@@ -453,47 +570,37 @@ def generar_resumen_periodo(df: pd.DataFrame):
 
     resumen = resumen.fillna(0) 
     resumen.index = resumen.index + 1
+    return resumen
+
+def _css_resumen(resumen: pd.DataFrame) -> pd.DataFrame:
+    """
+    Matriz CSS (misma forma que la tabla) para Styler.apply(axis=None), calculada por columnas
+    con tablas de consulta y tramos vectorizados en lugar de un callback por celda.
+    """
+    css = pd.DataFrame("", index=resumen.index, columns=resumen.columns)
+    for c in ["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"]:
+        css[c] = css_wellness(resumen[c], invertida=c in ["Estrés", "Dolor"])
+    css["Promedio_Wellness"] = css_por_tramos(resumen["Promedio_Wellness"], [3, 4], [CSS_ROJO, CSS_AMARILLO, CSS_VERDE])
+    for c in ["RPE_promedio", "UA_total"]:
+        css[c] = css_por_tramos(resumen[c], [5, 7], [CSS_VERDE, CSS_AMARILLO, CSS_ROJO])
+    css["En_riesgo"] = np.where(resumen["En_riesgo"] == "Sí", CSS_RIESGO, "")
+    return css
+
+def render_resumen_periodo(resumen: pd.DataFrame | None):
+    """Muestra la tabla de calcular_resumen_periodo con los colores de wellness, RPE y riesgo."""
+    if resumen is None:
+        st.info(t("No hay registros disponibles en este periodo."))
+        return
+
     # ======================================================
-    # 🎨 Colores y estilos
+    # 🎨 Colores y estilos (matriz CSS calculada en bloque)
     # ======================================================
-    def color_por_variable(col):
-        if col.name not in ["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"]:
-            return [""] * len(col)
-        cmap = WELLNESS_COLOR_INVERTIDO if col.name in ["Estrés", "Dolor"] else WELLNESS_COLOR_NORMAL
-        return [
-            f"background-color:{get_color_wellness(v, col.name)}; color:white; text-align:center; font-weight:bold;"
-            if pd.notna(v) else ""
-            for v in col
-        ]
-
-    def color_promedios(col):
-        return [
-            "background-color:#27AE60; color:white; text-align:center; font-weight:bold;" if pd.notna(v) and v >= 4 else
-            "background-color:#F1C40F; color:black; text-align:center; font-weight:bold;" if pd.notna(v) and 3 <= v < 4 else
-            "background-color:#E74C3C; color:white; text-align:center; font-weight:bold;" if pd.notna(v) and v < 3 else
-            ""
-            for v in col
-        ]
-
-    def color_rpe_ua(col):
-        return [
-            "background-color:#27AE60; color:white; text-align:center; font-weight:bold;" if pd.notna(v) and v < 5 else
-            "background-color:#F1C40F; color:black; text-align:center; font-weight:bold;" if pd.notna(v) and 5 <= v < 7 else
-            "background-color:#E74C3C; color:white; text-align:center; font-weight:bold;" if pd.notna(v) and v >= 7 else
-            ""
-            for v in col
-        ]
-
-    def color_riesgo(col):
-        return [
-            "background-color:#E53935; color:white; text-align:center; font-weight:bold;" if v == "Sí" else ""
-            for v in col
-        ]
+    css = _css_resumen(resumen)
 
     # ======================================================
     # Mostrar tabla final
     # ======================================================
-    resumen = resumen.rename(columns={
+    columnas = {
         "nombre_jugadora": t("Jugadora"),
         "Registros/Días": t("Registros/Días"),
         "Recuperación": t("Recuperación"),
@@ -505,15 +612,13 @@ def generar_resumen_periodo(df: pd.DataFrame):
         "RPE_promedio": t("RPE promedio"),
         "UA_total": t("UA total"),
         "En_riesgo": t("En riesgo")
-    })
+    }
+    resumen = resumen.rename(columns=columnas)
+    css = css.rename(columns=columnas)
 
     styled = (
         resumen.style
-        .apply(color_por_variable, subset=[t("Recuperación"), t("Energía"), t("Sueño"), t("Estrés"), t("Dolor")])
-        .apply(color_promedios, subset=[t("Promedio Wellness")])
-        .apply(color_rpe_ua, subset=[t("RPE promedio")])
-        .apply(color_rpe_ua, subset=[t("UA total")])
-        .apply(color_riesgo, subset=[t("En riesgo")])
+        .apply(lambda _: css, axis=None)
         .format(precision=2, na_rep="")
     )
 
@@ -528,75 +633,155 @@ def generar_resumen_periodo(df: pd.DataFrame):
 
     st.caption(t(":material/info: **Criterio de riesgo en la tabla:** una jugadora se considera *en riesgo* si el **promedio de bienestar (1-5x5) < 15 puntos** o si la variable **Dolor > 3**. Este criterio combina el **riesgo global** (fatiga / bienestar bajo) y el **riesgo localizado** (molestias o dolor elevado)."))
 
-
-def _filtrar_pendientes(df_periodo: pd.DataFrame, df_jugadoras: pd.DataFrame, tipo: str) -> pd.DataFrame:
+def generar_resumen_periodo(df: pd.DataFrame):
     """
-    Devuelve las jugadoras que no han realizado un tipo de registro específico
-    (checkin o checkout) en el periodo seleccionado.
-
-    Lógica:
-        - Si una jugadora tiene checkout → se asume que también hizo checkin.
-        - Si tiene checkin pero no checkout → pendiente de checkout.
-        - Si no tiene ninguno → pendiente en ambos lados.
+    Tabla resumen del periodo (sin separar por tipo),
+    manteniendo cálculo de riesgo y colores de wellness.
+    """
+    render_resumen_periodo(calcular_resumen_periodo(df))
 
-    Parámetros:
-        df_periodo (pd.DataFrame): DataFrame de registros.
-        df_jugadoras (pd.DataFrame): Lista completa de jugadoras.
-        tipo (str): 'checkin' o 'checkout'.
 
-    Retorna:
-        pd.DataFrame: Jugadoras pendientes, con columnas filtradas y ordenadas.
+def get_pendientes_check(df_periodo: pd.DataFrame, df_jugadoras: pd.DataFrame):
     """
-    tipo = tipo.lower().strip()
+    Devuelve dos DataFrames:
+    - Jugadoras sin check-in
+    - Jugadoras sin check-out
 
-    # --- Normalizar columna tipo ---
-    df_periodo = df_periodo.copy()
-    df_periodo["tipo"] = df_periodo["tipo"].astype(str).str.lower()
+    Se obtienen de la matriz de cumplimiento del periodo (src.reports.compliance):
+    si una jugadora tiene checkout se asume que también hizo checkin.
+    """
+    if "id_jugadora" not in df_periodo.columns or "id_jugadora" not in df_jugadoras.columns:
+        return pd.DataFrame(), pd.DataFrame()
 
-    # --- IDs según tipo ---
-    ids_checkin = df_periodo[df_periodo["tipo"] == "checkin"]["id_jugadora"].unique()
-    ids_checkout = df_periodo[df_periodo["tipo"] == "checkout"]["id_jugadora"].unique()
+    matriz = compute_compliance_matrix(df_periodo, df_jugadoras)
+    pendientes_in, pendientes_out = pendientes_desde_matriz(matriz, df_jugadoras)
+    return ordenar_df(pendientes_in, "nombre_jugadora"), ordenar_df(pendientes_out, "nombre_jugadora")
 
-    # --- Lógica principal ---
-    if tipo == "checkin":
-        # Pendiente de checkin → jugadoras sin ningún registro
-        pendientes_ids = [jid for jid in df_jugadoras["id_jugadora"].unique()
-                          if jid not in ids_checkin and jid not in ids_checkout]
-    else:  # tipo == "checkout"
-        # Pendiente de checkout → jugadoras con checkin pero sin checkout
-        pendientes_ids = [jid for jid in df_jugadoras["id_jugadora"].unique()
-                          if jid in ids_checkin and jid not in ids_checkout
-                          or (jid not in ids_checkin and jid not in ids_checkout)]
+def render_adherencia(df: pd.DataFrame, df_jugadoras: pd.DataFrame):
+    """
+    Informe de adherencia al registro (check-in / check-out) por jugadora y por sesión
+    en un rango de fechas, por defecto todo el historial disponible.
+    """
+    if df.empty or df_jugadoras.empty:
+        st.info(t("No hay registros disponibles en este periodo."))
+        return
 
-    # --- Filtrar jugadoras ---
-    pendientes = df_jugadoras[df_jugadoras["id_jugadora"].isin(pendientes_ids)].copy()
+    fecha_min, fecha_max = df["fecha_sesion"].min().date(), df["fecha_sesion"].max().date()
+    rango = st.date_input(
+        t("Rango de fechas"), value=(fecha_min, fecha_max),
+        min_value=fecha_min, max_value=fecha_max, key="adherencia_rango",
+    )
+    if not isinstance(rango, (list, tuple)) or len(rango) != 2:
+        st.info(t("Selecciona la fecha de inicio y de fin."))
+        return
 
-    # --- Ordenar ---
-    pendientes = ordenar_df(pendientes, "nombre_jugadora")
+    matriz = compute_compliance_matrix(df, df_jugadoras, *rango)
+    if matriz.empty:
+        st.info(t("No hay registros disponibles en este periodo."))
+        return
 
-    # --- Seleccionar columnas finales ---
-    columnas_finales = ["id_jugadora", "nombre_jugadora", "posicion", "plantel"]
-    pendientes = pendientes[[c for c in columnas_finales if c in pendientes.columns]]
+    por_jugadora = adherencia_por_jugadora(matriz)
+    por_sesion = adherencia_diaria(matriz)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric(t("Sesiones"), int(por_sesion.shape[0]))
+    col2.metric(t("Adherencia check-in"), f"{matriz['checkin'].mean() * 100:.1f}%")
+    col3.metric(t("Adherencia check-out"), f"{matriz['checkout'].mean() * 100:.1f}%")
+
+    porcentaje = {"format": "%.1f%%", "min_value": 0, "max_value": 100}
+    st.dataframe(
+        por_jugadora[["nombre_jugadora", "sesiones", "checkins", "checkouts", "pct_checkin", "pct_checkout"]],
+        hide_index=True,
+        column_config={
+            "nombre_jugadora": t("Jugadora"),
+            "sesiones": t("Sesiones"),
+            "checkins": t("Check-ins"),
+            "checkouts": t("Check-outs"),
+            "pct_checkin": st.column_config.ProgressColumn(t("Adherencia check-in"), **porcentaje),
+            "pct_checkout": st.column_config.ProgressColumn(t("Adherencia check-out"), **porcentaje),
+        },
+    )
 
-    return pendientes
+    st.markdown(t("**Adherencia por sesión**"))
+    st.line_chart(
+        por_sesion.groupby("fecha_sesion")[["pct_checkin", "pct_checkout"]].mean().rename(
+            columns={"pct_checkin": t("Check-in"), "pct_checkout": t("Check-out")}
+        ),
+        y_label="%",
+    )
 
-def get_pendientes_check(df_periodo: pd.DataFrame, df_jugadoras: pd.DataFrame):
+def render_acwr_plantilla(df_estado: pd.DataFrame, df_jugadoras: pd.DataFrame):
     """
-    Devuelve dos DataFrames:
-    - Jugadoras sin check-in
-    - Jugadoras sin check-out
+    Tabla con el ACWR actual (móvil y EWMA) de cada jugadora de la plantilla,
+    leído del estado de carga incremental (ver src.load_state).
     """
-    if "id_jugadora" not in df_periodo.columns or "id_jugadora" not in df_jugadoras.columns:
-        return pd.DataFrame(), pd.DataFrame()
+    if df_estado is None or df_estado.empty:
+        st.info(t("No hay datos de carga disponibles."))
+        return
 
-    #st.dataframe(df_periodo)
+    estado = df_jugadoras[["id_jugadora", "nombre_jugadora"]].astype({"id_jugadora": str}).merge(
+        df_estado, on="id_jugadora", how="inner"
+    )
+    if estado.empty:
+        st.info(t("No hay datos de carga disponibles."))
+        return
 
-    df_periodo = df_periodo.copy()
-    # --- Normalizar columna tipo ---
-    df_periodo["tipo"] = df_periodo["tipo"].astype(str).str.lower()
+    acwr = estado["acwr"].astype("float64")
+    estado["riesgo"] = np.select(
+        [acwr > 1.5, acwr >= 1.3, acwr >= 0.8],
+        ["🔴", "🟠", "🟢"],
+        default="⚪️",
+    )
+    estado["ultimo_registro"] = estado["ultimo_registro"].dt.date
+    estado = estado.sort_values("acwr", ascending=False, na_position="last")
+
+    st.dataframe(
+        estado[["riesgo", "nombre_jugadora", "acwr", "acwr_ewma", "acute7", "chronic28", "ultimo_registro"]].rename(
+            columns={
+                "riesgo": "",
+                "nombre_jugadora": t("Jugadora"),
+                "acwr": t("ACWR"),
+                "acwr_ewma": t("ACWR (EWMA)"),
+                "acute7": t("Carga aguda (7d)"),
+                "chronic28": t("Carga crónica (28d)"),
+                "ultimo_registro": t("Último registro"),
+            }
+        ).round(2),
+        hide_index=True,
+    )
 
-    # --- Obtener pendientes con la función auxiliar ---
-    pendientes_in = _filtrar_pendientes(df_periodo, df_jugadoras, "checkin")
-    pendientes_out = _filtrar_pendientes(df_periodo, df_jugadoras, "checkout")
+def render_desviaciones_baseline(baselines: pd.DataFrame, df_periodo: pd.DataFrame, df_jugadoras: pd.DataFrame):
+    """
+    Último registro de cada jugadora en el periodo comparado con su línea base personal
+    (z-scores de 28 días) y número de variables que empeoran más que el SWC.
+    """
+    if baselines is None or baselines.empty or df_periodo.empty:
+        st.info(t("Sin historial suficiente para calcular la línea base."))
+        return
 
-    return pendientes_in, pendientes_out
+    ultimos = ultimo_dia_baselines(baselines, df_periodo["fecha_sesion"].min(), df_periodo["fecha_sesion"].max())
+    ultimos = df_jugadoras[["id_jugadora", "nombre_jugadora"]].astype({"id_jugadora": str}).merge(
+        ultimos, on="id_jugadora", how="inner"
+    )
+    z_cols = [f"z_{c}" for c in BASELINE_COLS]
+    ultimos = ultimos.dropna(subset=z_cols, how="all")
+    if ultimos.empty:
+        st.info(t("Sin historial suficiente para calcular la línea base."))
+        return
+
+    ultimos = ultimos.sort_values(["alertas_swc", "nombre_jugadora"], ascending=[False, True])
+    ultimos["fecha_sesion"] = ultimos["fecha_sesion"].dt.date
+    tabla = ultimos[["nombre_jugadora", "fecha_sesion", "alertas_swc"] + z_cols].rename(
+        columns={
+            "nombre_jugadora": t("Jugadora"),
+            "fecha_sesion": t("Fecha"),
+            "alertas_swc": t("Alertas SWC"),
+            "z_recuperacion": t("Recuperación") + " (z)",
+            "z_energia": t("Energía") + " (z)",
+            "z_sueno": t("Sueño") + " (z)",
+            "z_stress": t("Estrés") + " (z)",
+            "z_dolor": t("Dolor") + " (z)",
+        }
+    )
+    st.caption(t("Z-score frente a los 28 días anteriores de cada jugadora; SWC = cambio desfavorable mayor que 0.2 × SD."))
+    st.dataframe(tabla.round(2), hide_index=True)
@@ -1,14 +1,19 @@
 import pandas as pd
 import streamlit as st
 import datetime
+from typing import Callable
 from src.util import get_date_range_input
 from src.i18n.i18n import t
 from src.schema import OPCIONES_TURNO
+from src.db_records import get_records_wellness_filtered_db
 
 def selection_header(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd.DataFrame = None, modo: str = "registro") -> pd.DataFrame:
     """
     Muestra los filtros principales (Competición, Jugadora, Turno, Tipo/Fechas)
     y retorna el DataFrame de registros filtrado según las selecciones.
+
+    Si records_df es None (modos de reporte), los registros se consultan ya
+    filtrados en la BD por plantel, jugadora, turno y rango de fechas.
     """
 
     col1, col2, col3, col4 = st.columns([3, 2, 1.5, 2])
@@ -84,6 +89,16 @@ def selection_header(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd
 
     if modo == "registro":
         return jugadora_opt, tipo, turno
+
+    if records_df is None:
+        df_filtrado = get_records_wellness_filtered_db(
+            plantel=competicion["codigo"],
+            start=start,
+            end=end,
+            id_jugadora=jugadora_opt["id_jugadora"] if jugadora_opt else None,
+            turno=turno,
+        )
+        return df_filtrado, jugadora_opt, tipo, turno, start, end
     
     # ==================================================
     # 🧮 FILTRADO DEL DATAFRAME
@@ -106,15 +121,9 @@ def selection_header(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd
         if modo == "registros" and tipo:
             df_filtrado = df_filtrado[df_filtrado["tipo"].str.lower() == tipo.lower()]
         elif modo == "reporte" and start and end:
-            # Asegurar que fecha_sesion y start/end sean del mismo tipo (date)
-            if pd.api.types.is_datetime64_any_dtype(df_filtrado["fecha_sesion"]):
-                df_filtrado["fecha_sesion"] = df_filtrado["fecha_sesion"].dt.date
-            if hasattr(start, "to_pydatetime"):
-                start = start.date()
-            if hasattr(end, "to_pydatetime"):
-                end = end.date()
+            # fecha_sesion es datetime64 (src.schema): comparar contra Timestamps
             df_filtrado = df_filtrado[
-                (df_filtrado["fecha_sesion"] >= start) & (df_filtrado["fecha_sesion"] <= end)
+                df_filtrado["fecha_sesion"].between(pd.Timestamp(start), pd.Timestamp(end))
             ]
     
         # print(df_filtrado["fecha_sesion"].head())
@@ -123,7 +132,13 @@ def selection_header(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd
 
     return df_filtrado, jugadora_opt, tipo, turno, start, end
 
-def selection_header_registro(jug_df: pd.DataFrame,comp_df: pd.DataFrame,records_df: pd.DataFrame = None):
+def selection_header_registro(jug_df: pd.DataFrame,comp_df: pd.DataFrame,records_df: pd.DataFrame = None, lote: bool = False):
+    """
+    Filtros del registro (Tipo, Turno, Plantel, Jugadora).
+
+    Con lote=True no se selecciona jugadora: se devuelve el DataFrame con todas
+    las jugadoras del plantel para la entrada por lote.
+    """
 
     col_tipo, col_turno, col_plantel, col_jugadora = st.columns([1.6, 1, 2, 2])
 
@@ -148,6 +163,9 @@ def selection_header_registro(jug_df: pd.DataFrame,comp_df: pd.DataFrame,records
         )
         codigo_comp = comp_select["codigo"]
 
+    if lote:
+        return jug_df[jug_df["plantel"] == codigo_comp].copy(), tipo, turno
+
     with col_jugadora:
         jug_df_filtrado = jug_df[jug_df["plantel"] == codigo_comp].copy()
 
@@ -195,3 +213,22 @@ def preview_record(record: dict) -> None:
         import json
 
         st.code(json.dumps(record, ensure_ascii=False, indent=2), language="json")
+
+def lazy_tabs(etiquetas: list[str], paneles: list[Callable[[], None]], key: str) -> None:
+    """
+    Pestañas con ejecución diferida: solo se calcula y se envía al navegador el panel abierto.
+
+    La pestaña seleccionada se guarda en session_state[key] (st.tabs con on_change="rerun")
+    y todo el bloque es un st.fragment, de modo que cambiar de pestaña vuelve a ejecutar
+    solo este fragmento con los datos de la última ejecución completa, no la página entera.
+    'paneles' son funciones sin argumentos, una por etiqueta.
+    """
+    @st.fragment
+    def _render():
+        tabs = st.tabs(etiquetas, key=key, on_change="rerun")
+        for tab, panel in zip(tabs, paneles):
+            if tab.open:
+                with tab:
+                    panel()
+
+    _render()
@@ -32,12 +32,19 @@ def centered_text(text : str):
         st.markdown(f"<h3 style='text-align: center;'>{text}</span></h3>",unsafe_allow_html=True)
 
 def data_format(df: pd.DataFrame):
-    df = df[df["plantel"] == "1FF"]
-    df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce")
-    df["fecha_dia"] = df["fecha_sesion"].dt.date
+    """
+    Filtra el primer equipo y añade columnas de periodo. Espera los tipos de
+    src.schema.apply_wellness_schema (fecha_sesion en datetime64).
+    Devuelve el frame ordenado por fecha_sesion para los cortes por periodo (src.ui_app.DayIndex).
+    """
+    df = (
+        df[(df["plantel"] == "1FF") & df["fecha_sesion"].notna()]
+        .sort_values("fecha_sesion", kind="stable")
+        .reset_index(drop=True)
+    )
+    df["fecha_dia"] = df["fecha_sesion"].dt.normalize()
     df["semana"] = df["fecha_sesion"].dt.isocalendar().week
     df["mes"] = df["fecha_sesion"].dt.month
-    df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.date
     df["wellness_score"] = df[["recuperacion", "energia", "sueno", "stress", "dolor"]].sum(axis=1)
     return df 
 
@@ -53,6 +60,10 @@ def clean_df(records):
     # --- eliminar columnas si existen ---
     df_traducido = records.drop(columns=[col for col in columnas_excluir if col in records.columns])
 
+    # Mostrar la fecha de sesión sin hora
+    if "fecha_sesion" in df_traducido.columns and pd.api.types.is_datetime64_any_dtype(df_traducido["fecha_sesion"]):
+        df_traducido["fecha_sesion"] = df_traducido["fecha_sesion"].dt.date
+
     #cols = list(df_filtrado.columns)
 
     # # 2️⃣ Crear un diccionario de renombre limpio → traducido
@@ -0,0 +1,140 @@
+import threading
+import time
+import zlib
+import pandas as pd
+import streamlit as st
+
+from src.schema import apply_wellness_schema
+from src.partes_cuerpo import ZonaIndex
+
+# Segundos entre sincronizaciones con la BD. Las escrituras hechas desde la app
+# se aplican al momento (write-through); este intervalo solo afecta a cambios
+# hechos desde fuera del proceso.
+SYNC_INTERVAL_SECONDS = 30
+
+class WellnessCache:
+    """
+    Copia en memoria de la tabla 'wellness' compartida por todas las sesiones del proceso.
+
+    Guarda el DataFrame ya procesado, la marca de agua (máximo 'fecha_hora_registro')
+    para que cada recarga solo pida a la BD las filas nuevas o modificadas, y un
+    número de versión que se incrementa con cada cambio real del contenido.
+    Los lectores usan esa versión como clave de sus cachés.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.df = pd.DataFrame()
+        self.watermark = None
+        self.loaded = False
+        self.version = 0
+        self.last_sync = None
+        self._zonas: tuple[int, ZonaIndex] | None = None
+
+    def replace(self, df: pd.DataFrame) -> None:
+        """Sustituye el contenido completo (carga inicial o recarga forzada)."""
+        self.df = _sort_recent_first(df)
+        self.watermark = _max_registro(self.df)
+        self.loaded = True
+        self.version += 1
+
+    def upsert(self, delta: pd.DataFrame, force: bool = False) -> bool:
+        """
+        Inserta o reemplaza por 'id' las filas recibidas.
+
+        Sin force, solo se aplica (y se versiona) si alguna fila es nueva o cambió;
+        la consulta incremental devuelve de nuevo las filas de la marca de agua.
+        """
+        if delta is None or delta.empty:
+            return False
+        if not force and not self._has_changes(delta):
+            return False
+        if self.df.empty:
+            merged = delta
+        else:
+            # concat de categóricas con categorías distintas da object: se reaplica el esquema
+            merged = apply_wellness_schema(
+                pd.concat([self.df[~self.df["id"].isin(delta["id"])], delta], ignore_index=True)
+            )
+        self.df = _sort_recent_first(merged)
+        self.watermark = _max_registro(self.df)
+        self.version += 1
+        return True
+
+    def drop(self, ids) -> bool:
+        """Elimina del frame las filas cuyos 'id' ya no existen en la BD."""
+        if self.df.empty or not len(ids):
+            return False
+        mask = self.df["id"].isin(list(ids))
+        if not mask.any():
+            return False
+        self.df = self.df[~mask].reset_index(drop=True)
+        self.version += 1
+        return True
+
+    def ids(self) -> set:
+        return set() if self.df.empty else set(self.df["id"].tolist())
+
+    def checksum(self) -> tuple[int, int]:
+        """(número de filas, suma de CRC32 de los ids): mismo cálculo que COUNT(*), SUM(CRC32(id)) en MySQL."""
+        return len(self.df), sum(zlib.crc32(str(i).encode()) for i in self.ids())
+
+    def zonas(self) -> ZonaIndex:
+        """Índice de zonas con dolor del frame actual, reconstruido solo si cambió la versión."""
+        with self.lock:
+            if self._zonas is None or self._zonas[0] != self.version:
+                self._zonas = (self.version, ZonaIndex.from_df(self.df))
+            return self._zonas[1]
+
+    def needs_sync(self) -> bool:
+        return self.last_sync is None or (time.monotonic() - self.last_sync) >= SYNC_INTERVAL_SECONDS
+
+    def mark_synced(self) -> None:
+        self.last_sync = time.monotonic()
+
+    def mark_stale(self) -> None:
+        """Fuerza una sincronización en la próxima lectura (p. ej. si falla el write-through)."""
+        self.last_sync = None
+
+    def invalidate(self) -> None:
+        """
+        Cambio en la BD que no se pudo aplicar al frame (caché sin cargar o write-through
+        fallido): nueva versión, para que las cachés derivadas por versión no sirvan datos
+        viejos, y sincronización en la próxima lectura.
+        """
+        self.version += 1
+        self.mark_stale()
+
+    def _has_changes(self, delta: pd.DataFrame) -> bool:
+        if self.df.empty:
+            return True
+        old = self.df[self.df["id"].isin(delta["id"])]
+        if len(old) != len(delta):
+            return True
+        cols = [c for c in delta.columns if c in old.columns]
+        old = old[cols].set_index("id").sort_index().astype(str)
+        new = delta[cols].set_index("id").sort_index().astype(str)
+        return not old.equals(new)
+
+def _sort_recent_first(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty or "fecha_hora_registro" not in df.columns:
+        return df.reset_index(drop=True)
+    return df.sort_values(by="fecha_hora_registro", ascending=False).reset_index(drop=True)
+
+def _max_registro(df: pd.DataFrame):
+    if df.empty or "fecha_hora_registro" not in df.columns:
+        return None
+    watermark = df["fecha_hora_registro"].max()
+    return None if pd.isna(watermark) else watermark.to_pydatetime()
+
+@st.cache_resource
+def get_wellness_cache(scope: str = "general") -> WellnessCache:
+    """
+    Instancia única por proceso y ámbito de datos ('developer' / 'general'):
+    sobrevive a los reruns y se comparte entre las sesiones del mismo ámbito.
+    """
+    return WellnessCache()
+
+def get_data_version(scope: str = "general") -> int:
+    """Versión actual de los datos de wellness del ámbito; cambia con cada alta, edición o borrado."""
+    return get_wellness_cache(scope).version
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.reports.load_engine import compute_load_windows
+from src.reports.metrics import (SQUAD_METRIC_COLUMNS, RPEFilters, compute_rpe_metrics,
+                                 compute_rpe_metrics_squad)
+
+def _registros(seed: int = 7, jugadoras: int = 5, dias: int = 70) -> pd.DataFrame:
+    """Check-in/check-out sintéticos: algunos días sin sesión, algunos con doble turno."""
+    rng = np.random.default_rng(seed)
+    inicio = pd.Timestamp("2025-01-06")
+    filas = []
+    for j in range(jugadoras):
+        primer_dia = int(rng.integers(0, 10))
+        for d in range(primer_dia, dias):
+            if rng.random() < 0.3:
+                continue
+            fecha = inicio + pd.Timedelta(days=d)
+            for turno in (["Turno 1", "Turno 2"] if rng.random() < 0.2 else ["Turno 1"]):
+                base = {"id_jugadora": f"J{j}", "nombre_jugadora": f"Jugadora {j}",
+                        "fecha_sesion": fecha, "turno": turno}
+                filas.append({**base, "tipo": "checkIn", "ua": np.nan, "minutos_sesion": np.nan})
+                minutos = float(rng.integers(30, 120))
+                filas.append({**base, "tipo": "checkOut", "minutos_sesion": minutos,
+                              "ua": minutos * float(rng.integers(1, 11))})
+    return pd.DataFrame(filas)
+
+def _semanal(sesiones=(0, 2, 4), semanas: int = 8, ua: float = 300.0) -> pd.DataFrame:
+    """Una jugadora con la misma carga todas las semanas (lunes, miércoles y viernes)."""
+    inicio = pd.Timestamp("2025-03-03")
+    fechas = [inicio + pd.Timedelta(days=7 * s + d) for s in range(semanas) for d in sesiones]
+    return pd.DataFrame({"id_jugadora": "J0", "fecha_sesion": fechas, "turno": "Turno 1",
+                         "tipo": "checkOut", "ua": ua, "minutos_sesion": 60.0})
+
+@pytest.mark.parametrize("end", ["2025-01-20", "2025-02-03", "2025-02-28", "2025-03-16"])
+def test_squad_coincide_con_metricas_por_jugadora(end):
+    df = _registros()
+    end = pd.Timestamp(end)
+    squad = compute_rpe_metrics_squad(df, end).set_index("id_jugadora")
+
+    for jugadora in df["id_jugadora"].unique():
+        individual = compute_rpe_metrics(df, RPEFilters(jugadores=[jugadora], end=end))
+        for columna in SQUAD_METRIC_COLUMNS:
+            esperado = squad.loc[jugadora, columna]
+            obtenido = individual[columna]
+            if pd.isna(esperado):
+                assert obtenido is None, (jugadora, columna)
+            else:
+                assert obtenido == pytest.approx(esperado), (jugadora, columna)
+
+def test_acwr_coincide_con_load_engine():
+    df = _registros()
+    end = pd.Timestamp("2025-03-10")
+    ventanas = compute_load_windows(df, end=end)
+    ventanas = ventanas[ventanas["fecha_sesion"] == end].set_index("id_jugadora")
+    squad = compute_rpe_metrics_squad(df, end).set_index("id_jugadora")
+
+    pd.testing.assert_series_equal(squad["acwr"], ventanas["acwr"].reindex(squad.index), check_names=False)
+
+def test_acwr_carga_estable_es_uno():
+    df = _semanal()
+    end = df["fecha_sesion"].max()
+    metricas = compute_rpe_metrics(df, RPEFilters(end=end))
+    # Viernes: la semana en curso ya tiene sus tres sesiones; carga crónica por día natural
+    assert metricas["acwr"] == pytest.approx(1.0)
+    assert metricas["fatiga_cronica"] == pytest.approx(3 * 300.0 / 7)
+
+def test_ventanas_no_miran_hacia_adelante():
+    df = _semanal()
+    lunes = pd.Timestamp("2025-03-03")
+    metricas = compute_rpe_metrics(df, RPEFilters(end=lunes))
+    assert metricas["carga_semana"] == pytest.approx(300.0)
+    assert metricas["carga_mes"] == pytest.approx(300.0)
+
+def test_squad_cuenta_desde_el_primer_checkin():
+    """Un check-in anterior al primer check-out alarga el historial en todos los caminos."""
+    checkouts = pd.date_range("2025-03-06", "2025-03-15", freq="D")
+    df = pd.DataFrame({
+        "id_jugadora": "J0",
+        "fecha_sesion": [pd.Timestamp("2025-03-01"), *checkouts],
+        "turno": "Turno 1",
+        "tipo": ["checkIn"] + ["checkOut"] * len(checkouts),
+        "ua": [np.nan] + [300.0] * len(checkouts),
+        "minutos_sesion": [np.nan] + [60.0] * len(checkouts),
+    })
+    end = pd.Timestamp("2025-03-15")
+
+    squad = compute_rpe_metrics_squad(df, end).set_index("id_jugadora").loc["J0"]
+    individual = compute_rpe_metrics(df, RPEFilters(jugadores=["J0"], end=end))
+    ventanas = compute_load_windows(df, end=end).set_index("fecha_sesion").loc[end]
+
+    assert individual["fatiga_cronica"] == pytest.approx(200.0)
+    assert individual["acwr"] == pytest.approx(1.5)
+    assert squad["fatiga_cronica"] == pytest.approx(individual["fatiga_cronica"])
+    assert squad["acwr"] == pytest.approx(individual["acwr"])
+    assert ventanas["acwr"] == pytest.approx(individual["acwr"])